@@ -0,0 +1,89 @@
+import argparse
+import multiprocessing
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from lib.Tokenizador import Tokenizador
+from lib.IndexadorBSBI import IndexadorBSBI
+from lib.IndexingMetrics import IndexingMetrics
+from lib.IRSystemBSBI import open_index
+
+
+def primera_consulta(path_index: str, modo: str, query: str) -> dict:
+    """
+    Abre el índice y ejecuta una consulta. Corre en un proceso nuevo para medir el arranque en
+    frío. En modo "completo" se cargan todas las estructuras al abrir (preload), como hacía
+    IRSystemBSBI antes de la apertura perezosa.
+    """
+    rss_before = IndexingMetrics.peak_rss_bytes() or 0
+    irsys = open_index(path_index)
+    if modo == "completo":
+        irsys.preload()
+    irsys.taat_query(query)
+    stats = irsys.open_stats()
+    stats["rss_bytes"] = (IndexingMetrics.peak_rss_bytes() or 0) - rss_before
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mide el tiempo hasta la primera consulta abriendo el índice de forma perezosa vs. cargando todo."
+    )
+    parser.add_argument(
+        "--corpus-path",
+        type=str,
+        required=True,
+        help="Directorio raíz que contiene los documentos a indexar.",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=int,
+        default=1000,
+        help="Cantidad de documentos por bloque.",
+    )
+    parser.add_argument(
+        "--repeticiones",
+        type=int,
+        default=3,
+        help="Aperturas por modo (se informa la mediana).",
+    )
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_apertura_")
+    try:
+        indexador = IndexadorBSBI(
+            Tokenizador(), memory_limit=args.memory_limit, path_index=tmp_dir
+        )
+        indexador.index_collection(args.corpus_path)
+        vocabulary = indexador.get_vocabulary()
+        query = max(vocabulary, key=lambda t: vocabulary[t]["df"])
+        results: dict[str, list[dict]] = {"perezosa": [], "completo": []}
+        for _ in range(args.repeticiones):
+            for modo in results:
+                # Un proceso nuevo por apertura para no reutilizar nada ya cargado
+                with ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context("spawn")
+                ) as executor:
+                    results[modo].append(
+                        executor.submit(primera_consulta, tmp_dir, modo, query).result()
+                    )
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print(f"\nConsulta: '{query}' (término de mayor df)")
+    print(
+        f"{'Apertura':<10} {'Abrir (ms)':>11} {'1ª consulta (ms)':>17} {'RSS (MB)':>9}  Cargado"
+    )
+    print("-" * 80)
+    for modo, runs in results.items():
+        runs.sort(key=lambda stats: stats["time_to_first_query"])
+        stats = runs[len(runs) // 2]
+        print(
+            f"{modo:<10} {stats['open_seconds'] * 1000:>11.2f} "
+            f"{stats['time_to_first_query'] * 1000:>17.2f} "
+            f"{stats['rss_bytes'] / 2**20:>9.2f}  {', '.join(stats['loaded'])}"
+        )
+
+
+if __name__ == "__main__":
+    main()
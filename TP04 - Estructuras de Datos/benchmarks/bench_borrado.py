@@ -0,0 +1,88 @@
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from lib.Tokenizador import Tokenizador
+from lib.IndexadorBSBI import IndexadorBSBI
+from lib.IRSystemBSBI import IRSystemBSBI
+
+
+def tiempo_consultas(irsys: IRSystemBSBI, terms: list[str]) -> float:
+    """
+    Tiempo total de consultas TAAT, AND con skips y DAAT sobre ternas de términos frecuentes.
+    """
+    t_start = time.time()
+    for i in range(0, len(terms) - 2, 3):
+        a, b, c = terms[i : i + 3]
+        irsys.taat_query(f"({a} AND {b}) OR {c}")
+        irsys.taat_query_with_skips(f"{a} AND {b} AND {c}")
+        irsys.daat_query(f"{a} {b} {c}", top_k=10)
+    return time.time() - t_start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mide el costo de filtrar documentos borrados (tombstones) en las consultas y el de compactar el índice."
+    )
+    parser.add_argument(
+        "--corpus-path",
+        type=str,
+        required=True,
+        help="Directorio raíz que contiene los documentos a indexar.",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=int,
+        default=1000,
+        help="Cantidad de documentos por bloque.",
+    )
+    parser.add_argument(
+        "--fraccion",
+        type=float,
+        default=0.3,
+        help="Fracción de documentos a borrar.",
+    )
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_borrado_")
+    try:
+        indexador = IndexadorBSBI(
+            Tokenizador(), memory_limit=args.memory_limit, path_index=tmp_dir
+        )
+        indexador.index_collection(args.corpus_path)
+        irsys = IRSystemBSBI(indexador)
+        vocabulary = indexador.get_vocabulary()
+        terms = sorted(vocabulary, key=lambda t: -vocabulary[t]["df"])[:60]
+        postings_path = os.path.join(tmp_dir, IndexadorBSBI.POSTINGS_FILENAME)
+
+        t_sin = tiempo_consultas(irsys, terms)
+        size_sin = os.path.getsize(postings_path)
+
+        doc_ids = list(irsys.doc_id_map)
+        random.seed(0)
+        borrados = random.sample(doc_ids, int(len(doc_ids) * args.fraccion))
+        irsys.delete_documents(borrados, compact_threshold=None)
+        t_con = tiempo_consultas(irsys, terms)
+
+        t_start = time.time()
+        indexador.compact(threshold=0.0)
+        t_compact = time.time() - t_start
+        irsys = IRSystemBSBI(indexador)
+        t_compactado = tiempo_consultas(irsys, terms)
+        size_compactado = os.path.getsize(postings_path)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print(f"\nDocumentos borrados: {len(borrados)} de {len(doc_ids)}")
+    print(f"{'Estado':<22} {'Consultas (s)':>14} {'Postings (MB)':>14}")
+    print("-" * 52)
+    print(f"{'Sin borrados':<22} {t_sin:>14.3f} {size_sin / 2**20:>14.2f}")
+    print(f"{'Con tombstones':<22} {t_con:>14.3f} {size_sin / 2**20:>14.2f}")
+    print(f"{'Compactado':<22} {t_compactado:>14.3f} {size_compactado / 2**20:>14.2f}")
+    print(f"\nTiempo de compactación: {t_compact:.2f} segundos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import os
+import time
+from lib.TextExtractor import EXTRACTORS, get_text_extractor
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara los extractores de texto HTML: documentos/segundo (la paridad de tokens se chequea con benchmarks.check_extractores)."
+    )
+    parser.add_argument(
+        "--corpus-path",
+        type=str,
+        required=True,
+        help="Directorio raíz que contiene los documentos .html.",
+    )
+    parser.add_argument(
+        "--max-docs",
+        type=int,
+        default=None,
+        help="Cantidad máxima de documentos a procesar.",
+    )
+    args = parser.parse_args()
+
+    docs: list[str] = []
+    for root, _, files in os.walk(args.corpus_path):
+        for fname in files:
+            if fname.endswith(".html"):
+                with open(
+                    os.path.join(root, fname), encoding="utf8", errors="ignore"
+                ) as f:
+                    docs.append(f.read())
+    if args.max_docs is not None:
+        docs = docs[: args.max_docs]
+    if not docs:
+        print("No hay documentos .html en el corpus.")
+        return
+
+    print(f"{'Extractor':<12} {'Docs/s':>10} {'Tiempo (s)':>11} {'Speedup':>9}")
+    print("-" * 45)
+    base = None
+    # bs4 primero: es la referencia del speedup
+    for name in sorted(EXTRACTORS, key=lambda n: n != "bs4"):
+        try:
+            extractor = get_text_extractor(name)
+        except ImportError as e:
+            print(f"{name:<12} {'(no disponible: ' + str(e) + ')'}")
+            continue
+        t_start = time.time()
+        for doc in docs:
+            extractor.extract(doc)
+        elapsed = time.time() - t_start
+        if base is None:
+            base = elapsed
+        print(
+            f"{name:<12} {len(docs) / elapsed:>10.1f} {elapsed:>11.2f} "
+            f"{base / elapsed:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
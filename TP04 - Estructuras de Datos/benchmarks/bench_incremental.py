@@ -0,0 +1,101 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from lib.Tokenizador import Tokenizador
+from lib.IndexadorBSBI import IndexadorBSBI
+
+
+def copiar(corpus_path: str, destino: str, docs: list[str]) -> None:
+    for doc in docs:
+        path = os.path.join(destino, doc)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.copy(os.path.join(corpus_path, doc), path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Indexa una parte del corpus y agrega el resto en lotes como segmentos incrementales, comparando cada lote contra reindexar todo."
+    )
+    parser.add_argument(
+        "--corpus-path",
+        type=str,
+        required=True,
+        help="Directorio raíz que contiene los documentos a indexar.",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=int,
+        default=1000,
+        help="Cantidad de documentos por bloque.",
+    )
+    parser.add_argument(
+        "--base",
+        type=float,
+        default=0.5,
+        help="Fracción del corpus que se indexa en el índice base.",
+    )
+    parser.add_argument(
+        "--delta",
+        type=int,
+        default=100,
+        help="Documentos por lote incremental.",
+    )
+    args = parser.parse_args()
+
+    docs = sorted(
+        os.path.relpath(os.path.join(root, fname), args.corpus_path)
+        for root, _, files in os.walk(args.corpus_path)
+        for fname in files
+        if fname.endswith((".html", ".txt"))
+    )
+    n_base = int(len(docs) * args.base)
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_incremental_")
+    filas = []
+    try:
+        coleccion = os.path.join(tmp_dir, "coleccion")
+        copiar(args.corpus_path, coleccion, docs[:n_base])
+        indexador = IndexadorBSBI(
+            Tokenizador(),
+            memory_limit=args.memory_limit,
+            path_index=os.path.join(tmp_dir, "index"),
+        )
+        t_start = time.time()
+        indexador.index_collection(coleccion)
+        filas.append(("base", n_base, time.time() - t_start, 0))
+
+        for i in range(n_base, len(docs), args.delta):
+            copiar(args.corpus_path, coleccion, docs[i : i + args.delta])
+            t_start = time.time()
+            n_docs = indexador.add_documents(coleccion)
+            filas.append(
+                (
+                    f"+{n_docs}",
+                    i + n_docs,
+                    time.time() - t_start,
+                    len(indexador.get_segments()),
+                )
+            )
+
+        completo = IndexadorBSBI(
+            Tokenizador(),
+            memory_limit=args.memory_limit,
+            path_index=os.path.join(tmp_dir, "completo"),
+        )
+        t_start = time.time()
+        completo.index_collection(coleccion)
+        t_completo = time.time() - t_start
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print(f"\n{'Lote':<8} {'Docs totales':>13} {'Tiempo (s)':>11} {'Segmentos':>10}")
+    print("-" * 45)
+    for lote, total, elapsed, n_segments in filas:
+        print(f"{lote:<8} {total:>13} {elapsed:>11.2f} {n_segments:>10}")
+    print(f"\nReindexado completo ({len(docs)} docs): {t_completo:.2f} segundos")
+
+
+if __name__ == "__main__":
+    main()
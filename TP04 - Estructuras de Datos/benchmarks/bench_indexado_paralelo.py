@@ -0,0 +1,76 @@
+import argparse
+import filecmp
+import os
+import shutil
+import tempfile
+from lib.Tokenizador import Tokenizador
+from lib.IndexadorBSBI import IndexadorBSBI
+
+
+def indexar(corpus_path: str, path_index: str, memory_limit: int, max_workers: int):
+    indexador = IndexadorBSBI(
+        Tokenizador(),
+        memory_limit=memory_limit,
+        path_index=path_index,
+        max_workers=max_workers,
+    )
+    indexador.index_collection(corpus_path)
+    return indexador
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara el indexado BSBI en serie contra el modo paralelo (pool de procesos) sobre el mismo corpus."
+    )
+    parser.add_argument(
+        "--corpus-path",
+        type=str,
+        required=True,
+        help="Directorio raíz que contiene los documentos a indexar.",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=int,
+        default=1000,
+        help="Cantidad de documentos por bloque (memory_limit de IndexadorBSBI).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 2,
+        help="Cantidad de procesos del modo paralelo.",
+    )
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_bsbi_")
+    try:
+        serie = indexar(
+            args.corpus_path, os.path.join(tmp_dir, "serie"), args.memory_limit, 1
+        )
+        paralelo = indexar(
+            args.corpus_path,
+            os.path.join(tmp_dir, "paralelo"),
+            args.memory_limit,
+            args.workers,
+        )
+        iguales = filecmp.cmp(
+            os.path.join(serie.path_index, IndexadorBSBI.POSTINGS_FILENAME),
+            os.path.join(paralelo.path_index, IndexadorBSBI.POSTINGS_FILENAME),
+            shallow=False,
+        )
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print(f"\n{'Modo':<25} {'Indexado (s)':>14} {'Merge (s)':>12}")
+    print("-" * 53)
+    print(f"{'Serie':<25} {serie.index_time:14.2f} {serie.merge_time:12.2f}")
+    print(
+        f"{f'Paralelo ({args.workers} procesos)':<25} {paralelo.index_time:14.2f} {paralelo.merge_time:12.2f}"
+    )
+    speedup = serie.index_time / paralelo.index_time if paralelo.index_time else 0
+    print(f"\nSpeedup del indexado: {speedup:.2f}x")
+    print(f"¿final_index.bin idéntico al modo serie? {'SI' if iguales else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
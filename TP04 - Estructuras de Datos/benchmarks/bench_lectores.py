@@ -0,0 +1,59 @@
+import argparse
+import shutil
+import tarfile
+import tempfile
+import time
+from lib.CorpusReader import DirectoryCorpusReader, TarCorpusReader
+
+
+def recorrer(reader) -> tuple[int, int]:
+    """
+    Lee todos los documentos del lector y devuelve (documentos, caracteres).
+    """
+    n_docs = n_chars = 0
+    for _, text in reader:
+        n_docs += 1
+        n_chars += len(text)
+    return n_docs, n_chars
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara leer una colección .tar.gz en streaming contra extraerla a disco y recorrer el directorio."
+    )
+    parser.add_argument(
+        "--tar-path",
+        type=str,
+        required=True,
+        help="Colección comprimida (.tar, .tar.gz, .tgz, ...).",
+    )
+    args = parser.parse_args()
+
+    t_start = time.time()
+    n_docs, n_chars = recorrer(TarCorpusReader(args.tar_path))
+    t_stream = time.time() - t_start
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_lectores_")
+    try:
+        t_start = time.time()
+        with tarfile.open(args.tar_path) as tar:
+            tar.extractall(tmp_dir)
+        t_extract = time.time() - t_start
+        t_start = time.time()
+        recorrer(DirectoryCorpusReader(tmp_dir))
+        t_dir = time.time() - t_start
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print(f"\nDocumentos: {n_docs} ({n_chars / 2**20:.1f} M caracteres)")
+    print(f"{'Modo':<30} {'Tiempo (s)':>11} {'Docs/s':>10}")
+    print("-" * 53)
+    print(f"{'Tar en streaming':<30} {t_stream:>11.2f} {n_docs / t_stream:>10.1f}")
+    t_total = t_extract + t_dir
+    print(
+        f"{'Extraer + recorrer directorio':<30} {t_total:>11.2f} {n_docs / t_total:>10.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
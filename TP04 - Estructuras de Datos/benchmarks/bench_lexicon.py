@@ -0,0 +1,114 @@
+import argparse
+import multiprocessing
+import os
+import pickle
+import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from lib.Tokenizador import Tokenizador
+from lib.IndexadorBSBI import IndexadorBSBI
+from lib.IndexingMetrics import IndexingMetrics
+from lib.Lexicon import Lexicon
+
+
+def medir_apertura(
+    path_index: str, formato: str, terms: list[str]
+) -> tuple[float, float, int]:
+    """
+    Abre el vocabulario en el formato pedido y busca terms. Corre en un proceso nuevo para
+    medir el arranque en frío: devuelve (segundos de apertura, segundos de búsquedas, bytes
+    que creció el pico de RSS).
+    """
+    rss_before = IndexingMetrics.peak_rss_bytes() or 0
+    t_start = time.time()
+    if formato == "pickle":
+        path = os.path.join(path_index, IndexadorBSBI.LEGACY_VOCABULARY_FILENAME)
+        with open(path, "rb") as f:
+            vocabulary = pickle.load(f)
+    else:
+        vocabulary = Lexicon(os.path.join(path_index, IndexadorBSBI.VOCABULARY_FILENAME))
+    t_open = time.time() - t_start
+    t_start = time.time()
+    for term in terms:
+        vocabulary.get(term)
+    t_lookup = time.time() - t_start
+    rss_after = IndexingMetrics.peak_rss_bytes() or 0
+    return t_open, t_lookup, rss_after - rss_before
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara el arranque en frío y la memoria del vocabulario pickleado contra el lexicon binario."
+    )
+    parser.add_argument(
+        "--corpus-path",
+        type=str,
+        required=True,
+        help="Directorio raíz que contiene los documentos a indexar.",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=int,
+        default=1000,
+        help="Cantidad de documentos por bloque.",
+    )
+    parser.add_argument(
+        "--busquedas",
+        type=int,
+        default=10000,
+        help="Cantidad de términos a buscar después de abrir el vocabulario.",
+    )
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_lexicon_")
+    try:
+        indexador = IndexadorBSBI(
+            Tokenizador(), memory_limit=args.memory_limit, path_index=tmp_dir
+        )
+        indexador.index_collection(args.corpus_path)
+        lexicon = indexador.get_vocabulary()
+        # El formato anterior: el mismo vocabulario como dict pickleado
+        with open(
+            os.path.join(tmp_dir, IndexadorBSBI.LEGACY_VOCABULARY_FILENAME), "wb"
+        ) as f:
+            pickle.dump(dict(lexicon.items()), f)
+        terms = list(lexicon)
+        n_terms = len(terms)
+        random.seed(0)
+        terms = [random.choice(terms) for _ in range(args.busquedas)]
+        sizes = {
+            "pickle": IndexadorBSBI.LEGACY_VOCABULARY_FILENAME,
+            "lexicon": IndexadorBSBI.VOCABULARY_FILENAME,
+        }
+        results = {}
+        for formato in sizes:
+            # Un proceso nuevo por medición para no reutilizar cachés ni memoria
+            with ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                results[formato] = executor.submit(
+                    medir_apertura, tmp_dir, formato, terms
+                ).result()
+        sizes = {
+            formato: os.path.getsize(os.path.join(tmp_dir, filename))
+            for formato, filename in sizes.items()
+        }
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print(f"\nTérminos: {n_terms}, búsquedas: {len(terms)}")
+    print(
+        f"{'Formato':<10} {'Disco (MB)':>11} {'Apertura (s)':>13} {'Búsquedas (s)':>14} {'RSS (MB)':>10}"
+    )
+    print("-" * 62)
+    for formato, (t_open, t_lookup, rss) in results.items():
+        print(
+            f"{formato:<10} {sizes[formato] / 2**20:>11.2f} {t_open:>13.4f} "
+            f"{t_lookup:>14.4f} {rss / 2**20:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
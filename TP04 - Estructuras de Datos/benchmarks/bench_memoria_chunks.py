@@ -0,0 +1,57 @@
+import argparse
+import shutil
+import tempfile
+from lib.Tokenizador import Tokenizador
+from lib.IndexadorBSBI import IndexadorBSBI
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Indexa con un presupuesto de memoria en MB y reporta, por chunk, la memoria estimada vs. la medida (tracemalloc)."
+    )
+    parser.add_argument(
+        "--corpus-path",
+        type=str,
+        required=True,
+        help="Directorio raíz que contiene los documentos a indexar.",
+    )
+    parser.add_argument(
+        "--memory-limit-mb",
+        type=float,
+        default=64,
+        help="Presupuesto de memoria (MB) para postings del bloque + diccionario de términos.",
+    )
+    parser.add_argument(
+        "--array-buffer",
+        action="store_true",
+        help="Usar PartialPostingBuffer (columnas array('I')) en vez de listas de PartialPosting.",
+    )
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_bsbi_")
+    try:
+        indexador = IndexadorBSBI(
+            Tokenizador(),
+            path_index=tmp_dir,
+            memory_limit_mb=args.memory_limit_mb,
+            measure_memory=True,
+            array_buffer=args.array_buffer,
+        )
+        indexador.index_collection(args.corpus_path)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print(
+        f"\n{'Chunk':>6} {'Docs':>8} {'Postings':>10} {'Estimado (MB)':>15} {'Medido (MB)':>13} {'Medido/Est.':>12}"
+    )
+    print("-" * 69)
+    for i, stats in enumerate(indexador.chunk_stats):
+        ratio = stats["measured_bytes"] / stats["estimated_bytes"]
+        print(
+            f"{i:>6} {stats['docs']:>8} {stats['postings']:>10} "
+            f"{stats['estimated_bytes'] / 2**20:>15.2f} {stats['measured_bytes'] / 2**20:>13.2f} {ratio:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
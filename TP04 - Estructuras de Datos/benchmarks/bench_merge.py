@@ -0,0 +1,103 @@
+import argparse
+import hashlib
+import os
+import shutil
+import tempfile
+from lib.Tokenizador import Tokenizador
+from lib.IndexadorBSBI import IndexadorBSBI
+
+
+def md5_archivo(path: str) -> str:
+    h = hashlib.md5()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara los modos de merge de IndexadorBSBI sobre los mismos chunks."
+    )
+    parser.add_argument(
+        "--corpus-path",
+        type=str,
+        required=True,
+        help="Directorio raíz que contiene los documentos a indexar.",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=int,
+        default=1000,
+        help="Cantidad de documentos por bloque (memory_limit de IndexadorBSBI).",
+    )
+    parser.add_argument(
+        "--repeticiones",
+        type=int,
+        default=3,
+        help="Cantidad de corridas por modo (se reporta la mejor).",
+    )
+    parser.add_argument(
+        "--max-fan-in",
+        type=int,
+        default=None,
+        help="Fan-in máximo del merge jerárquico (por defecto se abren todos los chunks).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 2,
+        help="Procesos del merge particionado y de los niveles del merge jerárquico.",
+    )
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_bsbi_")
+    try:
+        indexador = IndexadorBSBI(
+            Tokenizador(),
+            memory_limit=args.memory_limit,
+            path_index=tmp_dir,
+            max_fan_in=args.max_fan_in,
+            delete_chunks=False,  # cada modo vuelve a mergear los mismos chunks
+        )
+        indexador.index_collection(args.corpus_path)
+        # El indexado se hace en serie; los procesos solo se usan en el merge
+        indexador.max_workers = args.workers
+        postings_path = os.path.join(tmp_dir, IndexadorBSBI.POSTINGS_FILENAME)
+        referencia = md5_archivo(postings_path)
+        n_postings = os.path.getsize(postings_path) // IndexadorBSBI.POSTING_SIZE
+
+        resultados = []
+        for modo in IndexadorBSBI.MERGE_MODES:
+            indexador.merge_mode = modo
+            tiempos = []
+            for _ in range(args.repeticiones):
+                indexador.merge_chunks()
+                tiempos.append(indexador.merge_time)
+            resultados.append(
+                (
+                    modo,
+                    min(tiempos),
+                    md5_archivo(postings_path) == referencia,
+                    indexador.peak_disk_bytes,
+                )
+            )
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    base = resultados[0][1]
+    print(f"\n{len(indexador.chunks)} chunks, {n_postings} postings")
+    print(
+        f"{'Modo':<12} {'Merge (s)':>10} {'Postings/s':>14} {'Speedup':>9} {'Idéntico':>9} {'Pico disco (MB)':>16}"
+    )
+    print("-" * 75)
+    for modo, t, igual, pico in resultados:
+        rate = n_postings / t if t else 0
+        speedup = base / t if t else 0
+        print(
+            f"{modo:<12} {t:>10.3f} {rate:>14.0f} {speedup:>8.2f}x {'SI' if igual else 'NO':>9} {pico / 2**20:>16.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from lib.Tokenizador import Tokenizador
+from lib.IndexadorBSBI import IndexadorBSBI
+from lib.IRSystemBSBI import IRSystemBSBI
+from lib.Posting import Posting
+
+
+def leer_con_archivo(indexador: IndexadorBSBI, term: str) -> list[Posting]:
+    """
+    Lectura original de get_term_from_posting_list: abre final_index.bin y hace un f.read de
+    8 bytes y un Posting por posting.
+    """
+    entry = indexador.get_vocabulary()[term]
+    postings_path = os.path.join(indexador.path_index, indexador.POSTINGS_FILENAME)
+    postings: list[Posting] = []
+    with open(postings_path, "rb") as f:
+        f.seek(entry["puntero"])
+        for _ in range(entry["df"]):
+            postings.append(Posting.from_bytes(f.read(indexador.POSTING_SIZE)))
+    return postings
+
+
+def medir(fn, terms: list[str], repeticiones: int) -> float:
+    t_start = time.time()
+    for _ in range(repeticiones):
+        for term in terms:
+            fn(term)
+    return time.time() - t_start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara la lectura de posting lists con f.read por posting contra el final_index.bin mapeado en memoria."
+    )
+    parser.add_argument(
+        "--corpus-path",
+        type=str,
+        required=True,
+        help="Directorio raíz que contiene los documentos a indexar.",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=int,
+        default=1000,
+        help="Cantidad de documentos por bloque.",
+    )
+    parser.add_argument(
+        "--terminos",
+        type=int,
+        default=50,
+        help="Cantidad de términos de mayor df a leer.",
+    )
+    parser.add_argument(
+        "--repeticiones",
+        type=int,
+        default=10,
+        help="Veces que se lee cada posting list.",
+    )
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_postings_mmap_")
+    try:
+        indexador = IndexadorBSBI(
+            Tokenizador(), memory_limit=args.memory_limit, path_index=tmp_dir
+        )
+        indexador.index_collection(args.corpus_path)
+        irsys = IRSystemBSBI(indexador)
+        vocabulary = indexador.get_vocabulary()
+        terms = sorted(vocabulary, key=lambda t: -vocabulary[t]["df"])[: args.terminos]
+        n_postings = sum(vocabulary[t]["df"] for t in terms) * args.repeticiones
+
+        t_archivo = medir(
+            lambda t: leer_con_archivo(indexador, t), terms, args.repeticiones
+        )
+        t_postings = medir(irsys.get_term_from_posting_list, terms, args.repeticiones)
+        t_arrays = medir(irsys.get_posting_arrays, terms, args.repeticiones)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print(f"\nPostings leídos: {n_postings} ({len(terms)} términos de mayor df)")
+    print(f"{'Lectura':<32} {'Tiempo (s)':>11} {'Postings/s':>14}")
+    print("-" * 59)
+    for nombre, elapsed in (
+        ("f.read por posting (original)", t_archivo),
+        ("mmap -> list[Posting]", t_postings),
+        ("mmap -> arrays (sin copia)", t_arrays),
+    ):
+        print(f"{nombre:<32} {elapsed:>11.4f} {n_postings / elapsed:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from lib.Tokenizador import Tokenizador
+from lib.IndexadorBSBI import IndexadorBSBI
+from lib.IndexadorSPIMI import IndexadorSPIMI
+
+
+def indexar(indexador: IndexadorBSBI, corpus_path: str) -> tuple[float, int]:
+    """
+    Indexa la colección y devuelve (tiempo total en segundos, pico de memoria de tracemalloc).
+    """
+    tracemalloc.start()
+    t_start = time.time()
+    indexador.index_collection(corpus_path)
+    elapsed = time.time() - t_start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def posting_lists(indexador: IndexadorBSBI) -> dict[str, bytes]:
+    """
+    Lee de final_index.bin los bytes de la posting list de cada término del vocabulario.
+    """
+    postings_path = os.path.join(indexador.path_index, indexador.POSTINGS_FILENAME)
+    with open(postings_path, "rb") as f:
+        data = f.read()
+    return {
+        term: data[e["puntero"] : e["puntero"] + e["df"] * indexador.POSTING_SIZE]
+        for term, e in indexador.get_vocabulary().items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara tiempo y memoria del indexado BSBI contra SPIMI sobre el mismo corpus."
+    )
+    parser.add_argument(
+        "--corpus-path",
+        type=str,
+        required=True,
+        help="Directorio raíz que contiene los documentos a indexar.",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=int,
+        default=1000,
+        help="Cantidad de documentos por bloque.",
+    )
+    parser.add_argument(
+        "--memory-limit-mb",
+        type=float,
+        default=None,
+        help="Presupuesto de memoria (MB) por bloque; si se indica, reemplaza a --memory-limit.",
+    )
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_spimi_")
+    resultados = []
+    try:
+        for nombre, clase in (("BSBI", IndexadorBSBI), ("SPIMI", IndexadorSPIMI)):
+            indexador = clase(
+                Tokenizador(),
+                memory_limit=args.memory_limit,
+                memory_limit_mb=args.memory_limit_mb,
+                path_index=os.path.join(tmp_dir, nombre.lower()),
+            )
+            elapsed, peak = indexar(indexador, args.corpus_path)
+            sizes = indexador.index_size_on_disk()
+            resultados.append((nombre, indexador, elapsed, peak, sizes))
+        bsbi, spimi = resultados[0][1], resultados[1][1]
+        iguales = posting_lists(bsbi) == posting_lists(spimi)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print(
+        f"\n{'Método':<8} {'Bloques':>8} {'Indexado (s)':>13} {'Merge (s)':>10} {'Total (s)':>10} "
+        f"{'Pico mem. (MB)':>15} {'Postings (MB)':>14} {'Vocab. (MB)':>12}"
+    )
+    print("-" * 97)
+    for nombre, indexador, elapsed, peak, sizes in resultados:
+        print(
+            f"{nombre:<8} {len(indexador.chunk_stats):>8} {indexador.index_time:>13.2f} "
+            f"{indexador.merge_time:>10.2f} {elapsed:>10.2f} {peak / 2**20:>15.2f} "
+            f"{sizes['size_postings'] / 2**20:>14.2f} {sizes['size_vocab'] / 2**20:>12.2f}"
+        )
+    print(f"\n¿Posting lists idénticas en ambos índices? {'SI' if iguales else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
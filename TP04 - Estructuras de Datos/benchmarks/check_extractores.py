@@ -0,0 +1,76 @@
+import argparse
+import os
+from lib.Tokenizador import Tokenizador
+from lib.TextExtractor import EXTRACTORS, get_text_extractor
+
+# HTML chico que cubre lo que los extractores tienen que resolver igual: texto en bloques e
+# inline, entidades, <script>/<style> (descartados), comentarios, atributos, tablas y
+# documentos sin ningún elemento. CDATA queda afuera: bs4 lo conserva y los demás no.
+FIXTURE_DOCS = [
+    "<html><head><title>Índice invertido</title></head>"
+    "<body><p>Hola <b>mundo</b>, esto es <i>un</i> documento.</p></body></html>",
+    "<p>Tom &amp; Jerry &lt;3 caf&eacute; &#225;rbol&nbsp;verde</p>",
+    "<div>antes<script>var x = 'no indexar';</script>después"
+    "<style>p { color: red; }</style>fin</div>",
+    "<ul><li>uno</li><li>dos</li></ul><!-- comentario --><p>tres</p>",
+    '<a href="https://ejemplo.com" title="no es texto">enlace</a> suelto',
+    "<table><tr><td>celda1</td><td>celda2</td></tr></table>texto<br>salto",
+    "",
+    "<!DOCTYPE html>",
+    "<!-- solo un comentario -->",
+    '<?xml version="1.0" encoding="utf-8"?>',
+    "Texto plano sin etiquetas",
+]
+
+
+def check_parity(docs: list[str], tokenizer: Tokenizador) -> list[str]:
+    """
+    Compara, documento por documento, la secuencia de tokens de cada extractor disponible
+    con la de bs4 (la referencia). Devuelve los extractores que se chequearon y falla con
+    AssertionError en el primer documento que difiere.
+    """
+    reference = get_text_extractor("bs4")
+    expected = [tokenizer.tokenizar(reference.extract(doc)) for doc in docs]
+    checked: list[str] = []
+    for name in EXTRACTORS:
+        try:
+            extractor = get_text_extractor(name)
+        except ImportError:
+            continue
+        for i, (doc, tokens) in enumerate(zip(docs, expected)):
+            got = tokenizer.tokenizar(extractor.extract(doc))
+            assert got == tokens, (
+                f"{name} difiere de bs4 en el documento {i}: "
+                f"{got[:20]} != {tokens[:20]}"
+            )
+        checked.append(name)
+    return checked
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Chequea que los extractores de texto HTML den los mismos tokens que BeautifulSoup; termina con error si alguno difiere."
+    )
+    parser.add_argument(
+        "--corpus-path",
+        type=str,
+        default=None,
+        help="Directorio con documentos .html para chequear además del HTML de prueba.",
+    )
+    args = parser.parse_args()
+
+    docs = list(FIXTURE_DOCS)
+    if args.corpus_path is not None:
+        for root, _, files in os.walk(args.corpus_path):
+            for fname in files:
+                if fname.endswith(".html"):
+                    with open(
+                        os.path.join(root, fname), encoding="utf8", errors="ignore"
+                    ) as f:
+                        docs.append(f.read())
+    checked = check_parity(docs, Tokenizador())
+    print(f"Paridad OK con bs4 en {len(docs)} documentos: {', '.join(checked)}")
+
+
+if __name__ == "__main__":
+    main()
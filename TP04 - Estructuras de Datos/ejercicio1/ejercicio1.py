@@ -1,6 +1,6 @@
 import argparse
 from lib.Tokenizador import Tokenizador
-from lib.Posting import Posting
+from lib.PostingList import PostingList
 from lib.IRSystemBSBI import IRSystemBSBI
 from lib.IndexadorBSBI import IndexadorBSBI
 
@@ -30,13 +30,17 @@ def main():
     irsys = IRSystemBSBI(indexador)
     irsys.index_collection(args.corpus_path)
 
-    posting_list: list[Posting] = irsys.get_term_from_posting_list(args.termino)
+    posting_list: PostingList = irsys.get_posting_list(args.termino)
     if not posting_list:
         print(f"El término '{args.termino}' no está en el vocabulario.")
         return
     print(f"Postings para el término '{args.termino}':")
-    for posting in posting_list:
-        print(f"{posting.doc_name}:{posting.doc_id}:{posting.freq}")
+    for doc_name, doc_id, freq in zip(
+        posting_list.doc_names(),
+        posting_list.doc_ids.tolist(),
+        posting_list.freqs.tolist(),
+    ):
+        print(f"{doc_name}:{doc_id}:{freq}")
 
 
 if __name__ == "__main__":
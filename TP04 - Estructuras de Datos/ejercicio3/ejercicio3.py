@@ -28,6 +28,18 @@ def main():
         default=None,
         help="Archivo de stopwords (opcional, por defecto usa ../ejercicio3/stopwords.txt)",
     )
+    parser.add_argument(
+        "--cache-mb",
+        type=float,
+        default=None,
+        help="Tamaño en MB de la caché LRU de posting lists (por defecto sin caché).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Ejecutar las queries en lotes de este tamaño con batch_query, leyendo una vez las posting lists de cada lote (por defecto, de a una).",
+    )
     args = parser.parse_args()
 
     # Determinar ruta de stopwords (solo si se pasa el argumento)
@@ -40,7 +52,8 @@ def main():
     # Pasar la ruta al tokenizador (None si no se usa stopwords)
     tokenizer = Tokenizador(stopwords_path=stopwords_path)
     indexador = IndexadorBSBI(tokenizer)
-    irsys = IRSystemBSBI(indexador)
+    cache_bytes = int(args.cache_mb * 2**20) if args.cache_mb else None
+    irsys = IRSystemBSBI(indexador, cache_bytes=cache_bytes)
     irsys.index_collection(args.corpus_path)
     vocabulary = set(indexador.get_vocabulary().keys())
 
@@ -59,28 +72,41 @@ def main():
     results_2 = []
     results_3 = []
 
+    # (query booleana, lista de resultados a la que va) de cada variante
+    variants = []
     for q in queries:
         terms = tokenizer.tokenizar(q)
         if len(terms) == 2 and all(t in vocabulary for t in terms):
-            for pat in patterns_2:
-                query_str = pat.format(*terms)
-                try:
-                    t0 = time.time()
-                    res = irsys.taat_query(query_str)
-                    t1 = time.time()
-                    results_2.append((query_str, len(res), t1 - t0))
-                except Exception as e:
-                    print(f"Query inválida o no parseable: '{query_str}' ({e})")
+            variants.extend((pat.format(*terms), results_2) for pat in patterns_2)
         elif len(terms) == 3 and all(t in vocabulary for t in terms):
-            for pat in patterns_3:
-                query_str = pat.format(*terms)
-                try:
-                    t0 = time.time()
-                    res = irsys.taat_query(query_str)
-                    t1 = time.time()
-                    results_3.append((query_str, len(res), t1 - t0))
-                except Exception as e:
-                    print(f"Query inválida o no parseable: '{query_str}' ({e})")
+            variants.extend((pat.format(*terms), results_3) for pat in patterns_3)
+
+    if args.batch_size:
+        # Cada lote lee una vez las posting lists de todos sus términos; el tiempo de cada
+        # query es el de su evaluación y la lectura compartida se informa aparte
+        fetch_seconds = 0.0
+        for start in range(0, len(variants), args.batch_size):
+            batch = variants[start : start + args.batch_size]
+            batch_results = irsys.batch_query([query_str for query_str, _ in batch])
+            fetch_seconds += irsys.batch_stats()["fetch_seconds"]
+            for (query_str, results), (res, t) in zip(batch, batch_results):
+                if res is None:
+                    print(f"Query inválida o no parseable: '{query_str}'")
+                else:
+                    results.append((query_str, len(res), t))
+        print(
+            f"[INFO] Lectura compartida de posting lists en lotes de {args.batch_size}: "
+            f"{fetch_seconds:.4f} s"
+        )
+    else:
+        for query_str, results in variants:
+            try:
+                t0 = time.time()
+                res = irsys.taat_query(query_str)
+                t1 = time.time()
+                results.append((query_str, len(res), t1 - t0))
+            except Exception as e:
+                print(f"Query inválida o no parseable: '{query_str}' ({e})")
 
     def print_summary(results, title):
         if not results:
@@ -113,7 +139,7 @@ def main():
     for q, nres, t in all_results:
         terms = tokenizer.tokenizar(q)
         # Suma de tamaños de las listas de postings de la query
-        sizes = [len(irsys.get_term_from_posting_list(term)) for term in terms]
+        sizes = [len(irsys.get_posting_list(term)) for term in terms]
         postings_sizes.append(sum(sizes))
         tiempos.append(t)
     if postings_sizes and tiempos:
@@ -146,6 +172,14 @@ def main():
                 f"[{left:>7}, {right:>7}]: {len(bin_times[i]):>6} queries, tiempo promedio={avg:.6f}s"
             )
 
+    if irsys.posting_cache is not None:
+        stats = irsys.cache_stats()
+        print(
+            f"\nCaché de postings: {stats['hits']} aciertos, {stats['misses']} fallos "
+            f"({stats['hit_rate']:.1%}), {stats['evictions']} desalojos, "
+            f"{stats['bytes_served'] / 2**20:.2f} MB servidos"
+        )
+
 
 if __name__ == "__main__":
     main()
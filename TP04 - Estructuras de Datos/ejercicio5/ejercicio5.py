@@ -22,11 +22,18 @@ def main():
         "--corpus-path", required=True, help="Directorio raíz de los documentos."
     )
     parser.add_argument("--queries-file", required=True, help="Archivo de queries.")
+    parser.add_argument(
+        "--cache-mb",
+        type=float,
+        default=None,
+        help="Tamaño en MB de la caché LRU de posting lists (por defecto sin caché).",
+    )
     args = parser.parse_args()
 
     tokenizer = Tokenizador()
     indexador = IndexadorBSBI(tokenizer)
-    irsys = IRSystemBSBI(indexador)
+    cache_bytes = int(args.cache_mb * 2**20) if args.cache_mb else None
+    irsys = IRSystemBSBI(indexador, cache_bytes=cache_bytes)
     irsys.index_collection(args.corpus_path)
     vocabulary = set(indexador.get_vocabulary().keys())
 
@@ -120,6 +127,14 @@ def main():
         prom, med, std = resumen_tiempos(res)
         print(f"{nombre:<35} {prom:12.6f} {med:12.6f} {std:12.6f}")
 
+    if irsys.posting_cache is not None:
+        stats = irsys.cache_stats()
+        print(
+            f"\nCaché de postings: {stats['hits']} aciertos, {stats['misses']} fallos "
+            f"({stats['hit_rate']:.1%}), {stats['evictions']} desalojos, "
+            f"{stats['bytes_served'] / 2**20:.2f} MB servidos"
+        )
+
 
 if __name__ == "__main__":
     main()
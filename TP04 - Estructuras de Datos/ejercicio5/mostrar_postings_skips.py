@@ -1,7 +1,5 @@
 import argparse
-from lib.Tokenizador import Tokenizador
-from lib.IndexadorBSBI import IndexadorBSBI
-from lib.IRSystemBSBI import IRSystemBSBI
+from lib.IRSystemBSBI import open_index
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -12,10 +10,8 @@ if __name__ == "__main__":
     )
     args = parser.parse_args()
 
-    tokenizer = Tokenizador()
-    indexador = IndexadorBSBI(tokenizer, path_index=args.index_path)
-    irsys = IRSystemBSBI(indexador)
-    vocab = indexador.get_vocabulary()
+    irsys = open_index(args.index_path)
+    vocab = irsys.analyzer.get_vocabulary()
 
     # Buscar un término con posting list entre 50 y 100 items (50 <= df <= 100)
     min_term = None
@@ -30,12 +26,19 @@ if __name__ == "__main__":
         exit(1)
 
     print(f"Término con posting list más corta: '{min_term}' (df={min_df})\n")
-    postings = irsys.get_term_from_posting_list(min_term)
+    postings = irsys.get_posting_list(min_term)
     print("Posting list:")
-    for p in postings:
-        print(f"  doc_id={p.doc_id}, freq={p.freq}")
+    for doc_id, freq in zip(postings.doc_ids.tolist(), postings.freqs.tolist()):
+        print(f"  doc_id={doc_id}, freq={freq}")
 
     skips = irsys.get_skip_list_from_term(min_term)
     print("\nSkip list:")
     for docid, offset in skips:
         print(f"  doc_id={docid}, offset_byte={offset}")
+
+    stats = irsys.open_stats()
+    print(
+        f"\nApertura del índice: {stats['open_seconds'] * 1000:.1f} ms, primera consulta a "
+        f"los {stats['time_to_first_query'] * 1000:.1f} ms "
+        f"(cargado: {', '.join(stats['loaded'])})"
+    )
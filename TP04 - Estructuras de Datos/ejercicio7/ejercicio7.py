@@ -43,9 +43,9 @@ def comprimir_postings(corpus_path, index_compressed_dir=None):
         freqs_total = 0
         t0 = time.time()
         for termino, info in vocab.items():
-            postings = irsys.get_term_from_posting_list(termino)
-            docids = [p.doc_id for p in postings]
-            freqs = [p.freq for p in postings]
+            postings = irsys.get_posting_list(termino)
+            docids = postings.doc_ids.tolist()
+            freqs = postings.freqs.tolist()
             # Chequeo previo: mostrar si hay desajuste antes de comprimir
             if len(docids) != len(freqs):
                 print(
@@ -1,9 +1,7 @@
 import argparse
 import os
 from bitarray import bitarray
-from lib.IRSystemBSBI import IRSystemBSBI
-from lib.IndexadorBSBI import IndexadorBSBI
-from lib.Tokenizador import Tokenizador
+from lib.IRSystemBSBI import open_index
 from lib.codecs_compresion import (
     vbyte_decode_list,
     elias_gamma_decode_list,
@@ -13,14 +11,20 @@ import struct
 
 
 def mostrar_posting_comprimida(index_dir, termino, use_dgaps):
-    tokenizer = Tokenizador()
-    indexador = IndexadorBSBI(tokenizer, path_index=index_dir)
-    irsys = IRSystemBSBI(indexador)
+    irsys = open_index(index_dir)
     # Posting original
-    postings = irsys.get_term_from_posting_list(termino)
+    postings = irsys.get_posting_list(termino)
+    original_docids = postings.doc_ids.tolist()
+    original_freqs = postings.freqs.tolist()
     print(f"Postings originales para '{termino}':")
-    for p in postings:
-        print(f"  {p.doc_id}:{p.freq}")
+    for d, f in zip(original_docids, original_freqs):
+        print(f"  {d}:{f}")
+    stats = irsys.open_stats()
+    print(
+        f"Apertura del índice: {stats['open_seconds'] * 1000:.1f} ms, primera consulta a "
+        f"los {stats['time_to_first_query'] * 1000:.1f} ms "
+        f"(cargado: {', '.join(stats['loaded'])})"
+    )
     # Buscar la versión comprimida (en index_compressed/nodgaps o dgaps)
     modo = "dgaps" if use_dgaps else "nodgaps"
     comp_dir = os.path.abspath(os.path.join(index_dir, "..", "index_compressed", modo))
@@ -49,19 +53,21 @@ def mostrar_posting_comprimida(index_dir, termino, use_dgaps):
     print(
         f"[DEBUG] Primeros 10 valores decodificados crudos de Elias-gamma: {freqs_decoded_full[:10]}"
     )
-    print(f"[DEBUG] Primeros 10 valores originales: {[p.freq for p in postings[:10]]}")
+    print(f"[DEBUG] Primeros 10 valores originales: {original_freqs[:10]}")
     print(f"\nPostings comprimidas (decodificadas) para '{termino}':")
     for d, f in zip(docids, freqs):
         print(f"  {d}:{f}")
     # Comparación detallada
     print("\nDiferencias (índice, docID, freq_original, freq_decodificada):")
     iguales = True
-    for i, (p, d, f) in enumerate(zip(postings, docids, freqs)):
-        if p.doc_id != d or p.freq != f:
-            print(f"  {i}: {p.doc_id} vs {d}, {p.freq} vs {f}  <-- DIFERENTE")
+    for i, (doc_id, freq, d, f) in enumerate(
+        zip(original_docids, original_freqs, docids, freqs)
+    ):
+        if doc_id != d or freq != f:
+            print(f"  {i}: {doc_id} vs {d}, {freq} vs {f}  <-- DIFERENTE")
             iguales = False
         # else:  # Si quieres ver todos, descomenta
-        #     print(f"  {i}: {p.doc_id} vs {d}, {p.freq} vs {f}")
+        #     print(f"  {i}: {doc_id} vs {d}, {freq} vs {f}")
     if iguales:
         print("\n¿La posting comprimida-descomprimida coincide con la original? SI")
     else:
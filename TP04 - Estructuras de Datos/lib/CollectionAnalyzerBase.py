@@ -15,7 +15,8 @@ class CollectionAnalyzerBase(ABC):
     @abstractmethod
     def index_collection(self, docs_path: str) -> None:
         """
-        Indexa la colección de documentos en el directorio docs_path.
+        Indexa la colección de documentos en docs_path (un directorio o, en los analizadores
+        que lo soportan, cualquier fuente de lib.CorpusReader).
         """
         pass
 
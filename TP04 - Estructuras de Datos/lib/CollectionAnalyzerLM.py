@@ -1,8 +1,8 @@
-import os
 from collections import Counter
 from .CollectionAnalyzerBase import CollectionAnalyzerBase
+from .CorpusReader import CorpusReader, open_corpus
 from .Tokenizador import Tokenizador
-from typing import Dict, Counter as CounterType
+from typing import Dict, Union, Counter as CounterType
 
 
 class CollectionAnalyzerLM(CollectionAnalyzerBase):
@@ -24,20 +24,13 @@ class CollectionAnalyzerLM(CollectionAnalyzerBase):
         self.N: int = 0  # cantidad de documentos
         self.collection_len: int = 0  # tokens en la colección
 
-    def index_collection(self, docs_path: str) -> None:
-        for root, _, files in os.walk(docs_path):
-            for fname in files:
-                if fname.endswith((".txt", ".html")):
-                    docid = os.path.relpath(os.path.join(root, fname), docs_path)
-                    with open(
-                        os.path.join(root, fname), encoding="utf8", errors="ignore"
-                    ) as f:
-                        text = f.read()
-                    tokens = self.tokenizer.tokenizar(text)
-                    self.docs_terms[docid] = Counter(tokens)
-                    self.doc_len[docid] = len(tokens)
-                    self.term_freq.update(tokens)
-                    self.collection_len += len(tokens)
+    def index_collection(self, docs_path: Union[str, CorpusReader]) -> None:
+        for docid, text in open_corpus(docs_path):
+            tokens = self.tokenizer.tokenizar(text)
+            self.docs_terms[docid] = Counter(tokens)
+            self.doc_len[docid] = len(tokens)
+            self.term_freq.update(tokens)
+            self.collection_len += len(tokens)
         self.N = len(self.docs_terms)
 
     def total_tokens(self) -> int:
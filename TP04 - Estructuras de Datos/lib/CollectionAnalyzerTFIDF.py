@@ -1,10 +1,10 @@
-import os
 import math
 from collections import Counter
-from bs4 import BeautifulSoup
 from .CollectionAnalyzerBase import CollectionAnalyzerBase
+from .CorpusReader import CorpusReader, open_corpus
+from .TextExtractor import TextExtractor, get_text_extractor
 from .Tokenizador import Tokenizador
-from typing import Dict, Counter as CounterType
+from typing import Dict, Optional, Union, Counter as CounterType
 
 
 class CollectionAnalyzerTFIDF(CollectionAnalyzerBase):
@@ -23,35 +23,26 @@ class CollectionAnalyzerTFIDF(CollectionAnalyzerBase):
     term_index: Dict[str, int]
     N: int
 
-    def __init__(self, tokenizer: Tokenizador):
+    def __init__(
+        self, tokenizer: Tokenizador, text_extractor: Optional[TextExtractor] = None
+    ):
         super().__init__(tokenizer)
+        self.text_extractor: TextExtractor = text_extractor or get_text_extractor()
         self.docs_terms: Dict[str, CounterType[str]] = {}  # docid -> numero de tokens
         self.df: CounterType[str] = Counter()  # término -> doc frequency
         self.idf: Dict[str, float] = {}  # término -> inverse doc freq
         self.term_index: Dict[str, int] = {}  # término -> índice en vector
         self.N: int = 0  # total de documentos
 
-    def index_collection(self, docs_path: str) -> None:
-        # Recorre recursivamente el directorio
-        for root, _, files in os.walk(docs_path):
-            for fname in files:
-                if fname.endswith((".html", ".txt")):
-                    docid = os.path.relpath(os.path.join(root, fname), docs_path)
-                    with open(
-                        os.path.join(root, fname), encoding="utf8", errors="ignore"
-                    ) as f:
-                        text = f.read()
-                        if fname.endswith(".html"):
-                            text = BeautifulSoup(text, "html.parser").get_text(
-                                separator=" "
-                            )
-                            """
-                            ACÁ SE PODRÍA HACER UN PARSEO MÁS COMPLEJO DEL HTML (usando BeautifulSoup)
-                            """
-                    tokens = self.tokenizer.tokenizar(text)
-                    self.docs_terms[docid] = Counter(
-                        tokens
-                    )  # Por cada docid, crea un dict que almacena la frecuencia de cada término
+    def index_collection(self, docs_path: Union[str, CorpusReader]) -> None:
+        # Recorre la colección (directorio, tar o TREC) documento a documento
+        for docid, text in open_corpus(docs_path):
+            if docid.endswith(".html"):
+                text = self.text_extractor.extract(text)
+            tokens = self.tokenizer.tokenizar(text)
+            self.docs_terms[docid] = Counter(
+                tokens
+            )  # Por cada docid, crea un dict que almacena la frecuencia de cada término
         self.N = len(self.docs_terms)  # Complejidad O(1)
 
         # Calcular DF e IDF
@@ -0,0 +1,167 @@
+from abc import ABC, abstractmethod
+import gzip
+import io
+import os
+import re
+import tarfile
+from typing import Iterable, Iterator, TextIO, Union
+
+
+class CorpusReader(ABC):
+    """
+    Fuente de documentos de una colección: devuelve (doc_name, texto) de a un documento, sin
+    cargar la colección entera en memoria. El texto de los .html se devuelve sin parsear
+    (la extracción la hace el indexador según la extensión de doc_name).
+    """
+
+    @abstractmethod
+    def docs(self, exclude: Iterable[str] = ()) -> Iterator[tuple[str, str]]:
+        """
+        Genera (doc_name, texto) en orden. Los documentos cuyo nombre está en exclude se
+        saltean sin leerlos, cuando el formato lo permite.
+        """
+        pass
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        return self.docs()
+
+
+class DirectoryCorpusReader(CorpusReader):
+    """
+    Archivos .html/.txt de un directorio, recorrido con os.walk. doc_name es el path relativo
+    al directorio (el mismo que usaban los indexadores).
+    """
+
+    EXTENSIONS = (".html", ".txt")
+
+    def __init__(self, path: str, extensions: tuple[str, ...] = EXTENSIONS):
+        self.path: str = path
+        self.extensions: tuple[str, ...] = extensions
+
+    def docs(self, exclude: Iterable[str] = ()) -> Iterator[tuple[str, str]]:
+        exclude = set(exclude)
+        for root, _, files in os.walk(self.path):
+            for fname in files:
+                if not fname.endswith(self.extensions):
+                    continue
+                doc_name = os.path.relpath(os.path.join(root, fname), self.path)
+                if doc_name in exclude:
+                    continue
+                with open(
+                    os.path.join(root, fname), encoding="utf8", errors="ignore"
+                ) as f:
+                    yield doc_name, f.read()
+
+
+def _parse_trec(lines: Iterable[str], source: str) -> Iterator[tuple[str, str]]:
+    """
+    Parsea documentos TREC (<DOC> <DOCNO>id</DOCNO> ... </DOC>) línea a línea, con el mismo
+    criterio que Tokenizador.analizar_coleccion_trec del TP01. Los documentos sin DOCNO se
+    nombran source#n.
+    """
+    doc_name = None
+    parts: list[str] = []
+    n_docs = 0
+    for line in lines:
+        if line.startswith("<DOC>"):
+            doc_name = None
+            parts = []
+        elif line.startswith("</DOC>"):
+            n_docs += 1
+            yield doc_name or f"{source}#{n_docs}", "".join(parts)
+            doc_name = None
+            parts = []
+        elif line.startswith("<DOCNO>"):
+            match = re.search(r"<DOCNO>(.*?)</DOCNO>", line)
+            if match:
+                doc_name = match.group(1).strip()
+        else:
+            parts.append(line)
+
+
+def _open_text(path: str) -> TextIO:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf8", errors="ignore")
+    return open(path, encoding="utf8", errors="ignore")
+
+
+class TrecCorpusReader(CorpusReader):
+    """
+    Colección TREC: uno o varios archivos con múltiples <DOC> cada uno, opcionalmente
+    comprimidos con gzip. path puede ser un archivo o un directorio de archivos TREC.
+    """
+
+    def __init__(self, path: str):
+        self.path: str = path
+
+    def _files(self) -> list[str]:
+        if os.path.isdir(self.path):
+            return [
+                os.path.join(root, fname)
+                for root, _, files in os.walk(self.path)
+                for fname in sorted(files)
+            ]
+        return [self.path]
+
+    def docs(self, exclude: Iterable[str] = ()) -> Iterator[tuple[str, str]]:
+        exclude = set(exclude)
+        for path in self._files():
+            with _open_text(path) as f:
+                for doc_name, text in _parse_trec(f, os.path.basename(path)):
+                    if doc_name not in exclude:
+                        yield doc_name, text
+
+
+class TarCorpusReader(CorpusReader):
+    """
+    Colección dentro de un .tar (.tar.gz, .tgz, .tar.bz2, .tar.xz) leída en streaming, sin
+    extraerla a disco. Cada archivo .html/.txt del tar es un documento (doc_name = su path
+    dentro del tar); con trec=True cada archivo se parsea como colección TREC.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        extensions: tuple[str, ...] = DirectoryCorpusReader.EXTENSIONS,
+        trec: bool = False,
+    ):
+        self.path: str = path
+        self.extensions: tuple[str, ...] = extensions
+        self.trec: bool = trec
+
+    def docs(self, exclude: Iterable[str] = ()) -> Iterator[tuple[str, str]]:
+        exclude = set(exclude)
+        # "r|*": lectura secuencial del stream (detecta la compresión), sin seeks
+        with tarfile.open(self.path, "r|*") as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                name = member.name[2:] if member.name.startswith("./") else member.name
+                if self.trec:
+                    f = tar.extractfile(member)
+                    if name.endswith(".gz"):
+                        f = gzip.GzipFile(fileobj=f)
+                    lines = io.TextIOWrapper(f, encoding="utf8", errors="ignore")
+                    for doc_name, text in _parse_trec(lines, os.path.basename(name)):
+                        if doc_name not in exclude:
+                            yield doc_name, text
+                elif name.endswith(self.extensions) and name not in exclude:
+                    data = tar.extractfile(member).read()
+                    yield name, data.decode("utf8", errors="ignore")
+
+
+TAR_EXTENSIONS = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+
+def open_corpus(source: Union[str, CorpusReader]) -> CorpusReader:
+    """
+    Devuelve el lector adecuado para source: un directorio, un archivo tar (comprimido o no) o
+    un archivo/directorio TREC. Si source ya es un CorpusReader lo devuelve tal cual.
+    """
+    if isinstance(source, CorpusReader):
+        return source
+    if os.path.isdir(source):
+        return DirectoryCorpusReader(source)
+    if source.endswith(TAR_EXTENSIONS):
+        return TarCorpusReader(source)
+    return TrecCorpusReader(source)
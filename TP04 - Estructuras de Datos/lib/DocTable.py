@@ -0,0 +1,195 @@
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from typing import Iterator, Optional
+
+import numpy as np
+
+
+class DocTable(Mapping):
+    """
+    Tabla de documentos binaria de solo lectura: los nombres de documento en un pool de
+    strings UTF-8 y un arreglo de offsets uint64 indexado por doc_id, más columnas opcionales
+    con un valor por documento (cantidad de tokens, tamaño en bytes y norma del vector de
+    frecuencias). El archivo se mapea en memoria, así que abrirla no deserializa nada y el
+    mapeo se comparte entre procesos. Se usa como el dict doc_id -> nombre que reemplaza.
+    Formato de doc_table.bin:
+        header: magic, flags de columnas, primer doc_id, cantidad de slots (último doc_id -
+        primero + 1) y cantidad de documentos (HEADER_FORMAT)
+        offsets: uint64[n_slots + 1] - inicio del nombre de cada slot en el pool; un slot sin
+        nombre (offsets iguales) es un doc_id que no está en la tabla (p. ej. compactado)
+        columnas: n_slots valores de cada columna presente en flags, en el orden de COLUMNS
+        pool: nombres UTF-8 concatenados
+    """
+
+    MAGIC = b"DOC1"
+    HEADER_FORMAT = "=4sIQQQ"  # magic, flags, first_doc_id, n_slots, n_docs
+    HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+    BOUNDS = struct.Struct("=QQ")  # offsets de un slot y del siguiente (inicio y fin)
+    # Columna -> dtype; el bit de cada columna en flags es su posición. Las de 8 bytes van
+    # primero para que todas queden alineadas
+    COLUMNS = {
+        "bytes": np.dtype("=u8"),
+        "norm": np.dtype("=f8"),
+        "tokens": np.dtype("=u4"),
+    }
+
+    def __init__(self, path: str):
+        self.path: str = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = struct.unpack_from(self.HEADER_FORMAT, self._mm, 0)
+        magic, flags, self.first_doc_id, self.n_slots, self.n_docs = header
+        if magic != self.MAGIC:
+            raise ValueError(f"{path} no es una tabla de documentos válida.")
+        offset = self.HEADER_SIZE
+        self._offsets_start: int = offset
+        self.offsets: np.ndarray = np.frombuffer(
+            self._mm, dtype="=u8", count=self.n_slots + 1, offset=offset
+        )
+        offset += self.offsets.nbytes
+        self.columns: dict[str, np.ndarray] = {}
+        for bit, (name, dtype) in enumerate(self.COLUMNS.items()):
+            if flags & (1 << bit):
+                self.columns[name] = np.frombuffer(
+                    self._mm, dtype=dtype, count=self.n_slots, offset=offset
+                )
+                offset += self.columns[name].nbytes
+        self._pool_start: int = offset
+
+    @classmethod
+    def write(
+        cls,
+        path: str,
+        doc_id_map: Mapping,
+        columns: Optional[dict[str, np.ndarray]] = None,
+    ) -> None:
+        """
+        Escribe doc_id_map (doc_id -> nombre) como tabla. columns tiene, por nombre de
+        columna, un array con el valor de cada doc_id desde el menor de doc_id_map hasta el
+        mayor (slot_range). Se escribe a un temporal y se reemplaza, así una DocTable abierta
+        sobre el archivo anterior sigue siendo válida.
+        """
+        columns = columns or {}
+        first_doc_id, n_slots = cls.slot_range(doc_id_map)
+        lengths = np.zeros(n_slots, dtype="=u8")
+        names: list[bytes] = []
+        for doc_id in sorted(doc_id_map):
+            encoded = doc_id_map[doc_id].encode("utf8")
+            lengths[doc_id - first_doc_id] = len(encoded)
+            names.append(encoded)
+        offsets = np.zeros(n_slots + 1, dtype="=u8")
+        np.cumsum(lengths, out=offsets[1:])
+        flags = 0
+        for bit, name in enumerate(cls.COLUMNS):
+            if name in columns:
+                flags |= 1 << bit
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(
+                struct.pack(
+                    cls.HEADER_FORMAT,
+                    cls.MAGIC,
+                    flags,
+                    first_doc_id,
+                    n_slots,
+                    len(doc_id_map),
+                )
+            )
+            f.write(offsets.tobytes())
+            for name, dtype in cls.COLUMNS.items():
+                if name in columns:
+                    f.write(np.asarray(columns[name], dtype=dtype).tobytes())
+            f.write(b"".join(names))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def slot_range(doc_id_map: Mapping) -> tuple[int, int]:
+        """
+        (primer doc_id, cantidad de slots) que ocupa doc_id_map en la tabla.
+        """
+        if isinstance(doc_id_map, DocTable):
+            return doc_id_map.first_doc_id, doc_id_map.n_slots
+        if not doc_id_map:
+            return 0, 0
+        first_doc_id = min(doc_id_map)
+        return first_doc_id, max(doc_id_map) - first_doc_id + 1
+
+    def close(self) -> None:
+        self.offsets = None
+        self.columns = {}
+        self._mm.close()
+
+    # --- Acceso ---
+
+    def _bounds(self, doc_id) -> tuple[int, int]:
+        """
+        (inicio, fin) del nombre de doc_id en el pool; (0, 0) si no está en la tabla. Lee los
+        offsets con struct, más rápido que indexar el array de a un elemento.
+        """
+        if type(doc_id) is not int:
+            if not isinstance(doc_id, (int, np.integer)):
+                return 0, 0
+            doc_id = int(doc_id)
+        i = doc_id - self.first_doc_id
+        if i < 0 or i >= self.n_slots:
+            return 0, 0
+        return self.BOUNDS.unpack_from(self._mm, self._offsets_start + 8 * i)
+
+    def get(self, doc_id: int, default=None):
+        start, end = self._bounds(doc_id)
+        if start == end:
+            return default
+        pool = self._pool_start
+        return self._mm[pool + start : pool + end].decode("utf8")
+
+    def __getitem__(self, doc_id: int) -> str:
+        start, end = self._bounds(doc_id)
+        if start == end:
+            raise KeyError(doc_id)
+        pool = self._pool_start
+        return self._mm[pool + start : pool + end].decode("utf8")
+
+    def __contains__(self, doc_id) -> bool:
+        start, end = self._bounds(doc_id)
+        return start != end
+
+    def __len__(self) -> int:
+        return self.n_docs
+
+    def doc_ids(self) -> np.ndarray:
+        """
+        doc_ids de la tabla, crecientes.
+        """
+        return np.flatnonzero(np.diff(self.offsets)) + self.first_doc_id
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.doc_ids().tolist())
+
+    def items(self) -> Iterator[tuple[int, str]]:
+        """
+        Recorre (doc_id, nombre) en orden de doc_id.
+        """
+        for doc_id in self:
+            yield doc_id, self[doc_id]
+
+    def values(self) -> Iterator[str]:
+        for _, name in self.items():
+            yield name
+
+    def column(self, name: str) -> Optional[np.ndarray]:
+        """
+        Valores de la columna por slot (el de doc_id está en doc_id - first_doc_id), o None si
+        la tabla no la tiene.
+        """
+        return self.columns.get(name)
+
+    def get_value(self, name: str, doc_id: int):
+        """
+        Valor de la columna name para doc_id (None si no hay columna o documento).
+        """
+        column = self.columns.get(name)
+        if column is None or doc_id not in self:
+            return None
+        return column[int(doc_id) - self.first_doc_id].item()
@@ -1,13 +1,51 @@
+from bisect import bisect_right
+import functools
 import heapq
+import json
+import mmap
 import os
-from collections import Counter
+import re
+import time
+from collections import ChainMap, Counter
+from typing import Mapping, Optional
 
 import boolean
 import numpy as np
+from bitarray import bitarray
 from lib.IRSystem import IRSystem
 from lib.Posting import Posting
+from lib.PostingCache import PostingCache
+from lib.PostingList import PostingList
 from lib.IndexadorBSBI import IndexadorBSBI
+from lib.IndexadorSPIMI import IndexadorSPIMI
+from lib.PostingChunkReader import PostingChunkReader
 from lib.SkipList import SkipList
+from lib.Tokenizador import Tokenizador
+
+
+def _first_query(method):
+    """
+    Registra en time_to_first_query los segundos desde la apertura del índice hasta que
+    termina la primera consulta.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: "IRSystemBSBI", *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        if self.time_to_first_query is None:
+            self.time_to_first_query = time.perf_counter() - self._opened_at
+        return result
+
+    return wrapper
+
+
+def _union_doc_ids(arrays: list[np.ndarray]) -> np.ndarray:
+    """
+    Unión de arrays de doc_ids: creciente y sin repetir (np.unique ordena).
+    """
+    if not arrays:
+        return np.zeros(0, dtype=np.uint32)
+    return np.unique(np.concatenate(arrays))
 
 
 class IRSystemBSBI(IRSystem):
@@ -16,31 +54,217 @@ class IRSystemBSBI(IRSystem):
     Permite cargar el vocabulario y recuperar posting lists de manera sencilla.
     """
 
+    MAX_EXPANSIONS = 1000  # términos por comodín como máximo (ver expand_term)
+    # Tokens de una consulta booleana con comodín: comput*, *ción, a*ción
+    WILDCARD_TOKEN = re.compile(r"[\w*]+")
+    BATCH_MODES = ("boolean", "ranked")  # ver batch_query
+
     # analyzer: IndexadorBSBI
-    def __init__(self, analyzer: IndexadorBSBI):
+    def __init__(
+        self,
+        analyzer: IndexadorBSBI,
+        cache_bytes: Optional[int] = None,
+        max_expansions: int = MAX_EXPANSIONS,
+    ):
+        """
+        cache_bytes: si se define, las posting lists leídas se guardan en una caché LRU de
+        ese tamaño en bytes (ver PostingCache y cache_stats).
+        max_expansions: cantidad máxima de términos en que se expande un comodín.
+        """
         super().__init__(analyzer)
+        self._opened_at: float = time.perf_counter()
         self.analyzer: IndexadorBSBI = analyzer  # type: ignore
         self.index_dir = analyzer.path_index
-        # Setear el doc_id_map global en Posting para que cada Posting pueda resolver su doc_name
-        Posting.set_doc_id_map(analyzer.get_doc_id_map())
 
         # Para el modelo vectorial:
-        self.term_index: dict[str, int] = {}
         self.doc_vectors: dict[str, np.ndarray] = {}
         self.doc_norms: dict[str, float] = {}
 
-        if self.analyzer.get_vocabulary() is not None:
-            self._make_term_index()
+        self.posting_cache: Optional[PostingCache] = (
+            PostingCache(cache_bytes) if cache_bytes else None
+        )
+        self.max_expansions: int = max_expansions
+        self._batch_stats: dict = {}  # ver batch_stats
+        # Apertura perezosa: cada estructura del índice se carga en su primer uso (ver
+        # _load_segments); loaded registra cuáles se cargaron y en cuántos segundos
+        self.loaded: dict[str, float] = {}
+        self.time_to_first_query: Optional[float] = None
+        self._load_segments()
+        self.open_seconds: float = time.perf_counter() - self._opened_at
+
+    def _load_segments(self) -> None:
+        """
+        Descarta las estructuras cargadas del índice: segmentos, doc_id_map global, mapeo de
+        términos, tombstones y postings mapeados se vuelven a cargar en su primer uso (ver las
+        propiedades de cada una). Se llama de nuevo después de indexar documentos nuevos.
+        """
+        self._segments: Optional[list[IndexadorBSBI]] = None
+        self._doc_id_map: Optional[Mapping[int, str]] = None
+        self._segment_starts: Optional[list[int]] = None  # primer doc_id de cada segmento
+        self._term_index: Optional[dict[str, int]] = None
+        self._tombstones: Optional[tuple] = None  # (tombstones, máscara por doc_id)
+        self._postings: Optional[list[np.ndarray]] = None
+        # Las posting lists cacheadas pueden haber cambiado (segmentos nuevos, borrados)
+        if self.posting_cache is not None:
+            self.posting_cache.clear()
+
+    def _timed_load(self, name: str, load):
+        """
+        Ejecuta load() registrando en loaded los segundos que tardó.
+        """
+        t_start = time.perf_counter()
+        value = load()
+        self.loaded[name] = self.loaded.get(name, 0.0) + time.perf_counter() - t_start
+        return value
+
+    @property
+    def segments(self) -> list[IndexadorBSBI]:
+        """
+        Segmentos del índice (el índice base + los incrementales), en orden de doc_id.
+        """
+        if self._segments is None:
+            self._segments = self._timed_load(
+                "segments", lambda: [self.analyzer] + self.analyzer.get_segments()
+            )
+        return self._segments
+
+    @property
+    def doc_id_map(self) -> Mapping[int, str]:
+        """
+        doc_id -> nombre de documento de todos los segmentos.
+        """
+        if self._doc_id_map is None:
+            self._doc_id_map = self._timed_load("doc_id_map", self._load_doc_id_map)
+        return self._doc_id_map
+
+    def _load_doc_id_map(self) -> Mapping[int, str]:
+        """
+        Vista sobre las tablas de documentos de los segmentos, sin copiarlas a un dict: la
+        del índice base si es la única o un ChainMap (los rangos de doc_id no se solapan; en
+        orden inverso para que la iteración siga el orden de doc_id).
+        """
+        doc_id_maps = [segment.get_doc_id_map() for segment in self.segments]
+        if len(doc_id_maps) == 1:
+            doc_id_map: Mapping[int, str] = doc_id_maps[0]
+        else:
+            doc_id_map = ChainMap(*reversed(doc_id_maps))
+        # Setear el doc_id_map global en Posting para que cada Posting pueda resolver su doc_name
+        Posting.set_doc_id_map(doc_id_map)
+        return doc_id_map
+
+    @property
+    def tombstones(self) -> Optional[bitarray]:
+        """
+        Documentos borrados (None si no hay, para no filtrar de más).
+        """
+        if self._tombstones is None:
+            self._tombstones = self._timed_load("tombstones", self._load_tombstones)
+        return self._tombstones[0]
+
+    @property
+    def _deleted(self) -> Optional[np.ndarray]:
+        """
+        Los mismos borrados como máscara por doc_id, para filtrar arrays de postings.
+        """
+        if self._tombstones is None:
+            self._tombstones = self._timed_load("tombstones", self._load_tombstones)
+        return self._tombstones[1]
+
+    def _load_tombstones(self) -> tuple:
+        tombstones = self.analyzer.get_tombstones()
+        if not tombstones.any() or not self.doc_id_map:
+            return None, None
+        return tombstones, self.analyzer._deleted_mask(max(self.doc_id_map))
+
+    @property
+    def postings(self) -> list[np.ndarray]:
+        """
+        final_index.bin de cada segmento mapeado en memoria como array (doc_id, freq).
+        """
+        if self._postings is None:
+            self._postings = self._timed_load(
+                "postings",
+                lambda: [self._map_postings(segment) for segment in self.segments],
+            )
+        return self._postings
+
+    @staticmethod
+    def _map_postings(segment: IndexadorBSBI) -> np.ndarray:
+        """
+        Mapea en memoria el final_index.bin del segmento (una vez, al cargar los segmentos) y
+        lo devuelve como array estructurado (doc_id, freq) sobre el mmap, sin copiarlo.
+        """
+        postings_path = os.path.join(segment.path_index, segment.POSTINGS_FILENAME)
+        if not os.path.exists(postings_path) or os.path.getsize(postings_path) == 0:
+            return np.zeros(0, dtype=PostingChunkReader.PAIR_DTYPE)
+        with open(postings_path, "rb") as f:
+            # El mapeo sigue válido después de cerrar el archivo
+            postings_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return np.frombuffer(postings_map, dtype=PostingChunkReader.PAIR_DTYPE)
+
+    def _is_deleted(self, docid: int) -> bool:
+        tombstones = self.tombstones
+        return tombstones is not None and docid < len(tombstones) and tombstones[docid]
+
+    def delete_documents(
+        self, doc_ids: list[int], compact_threshold: Optional[float] = 0.2
+    ) -> int:
+        """
+        Borra documentos del índice (ver IndexadorBSBI.delete_documents).
+        """
+        # La compactación reemplaza los final_index.bin: soltar los mapeos antes
+        self._postings = None
+        deleted = self.analyzer.delete_documents(doc_ids, compact_threshold)
+        self._load_segments()
+        return deleted
+
+    def _segment_of(self, docid: int) -> IndexadorBSBI:
+        """
+        Devuelve el segmento que contiene docid (los segmentos cubren rangos de doc_id crecientes).
+        """
+        if self._segment_starts is None:
+            self._segment_starts = self._timed_load(
+                "segment_starts", self._load_segment_starts
+            )
+        i = bisect_right(self._segment_starts, docid) - 1
+        return self.segments[max(i, 0)]
+
+    def _load_segment_starts(self) -> list[int]:
+        """
+        Primer doc_id de cada segmento, del manifest (o de su doc_id_map en índices viejos).
+        """
+        starts: list[int] = []
+        for segment in self.segments:
+            first_doc_id = segment.get_manifest().get("first_doc_id")
+            if first_doc_id is None:
+                doc_id_map = segment.get_doc_id_map()
+                first_doc_id = min(doc_id_map) if doc_id_map else 0
+            starts.append(first_doc_id)
+        return starts
+
+    @property
+    def term_index(self) -> dict[str, int]:
+        """
+        Mapeo término -> índice de vector (solo lo usa el modelo vectorial).
+        """
+        if self._term_index is None:
+            self._timed_load("term_index", self._make_term_index)
+        return self._term_index
 
     def _make_term_index(self) -> None:
         """
         Mapear términos a índices de vector
         """
-        for i, term in enumerate(self.analyzer.get_vocabulary().keys()):
-            self.term_index[term] = (
-                i  # Guarda el índice numérico que ocupará ese término en los vectores
-            )
+        # Se asigna recién completo: otro hilo no puede ver un mapeo a medio armar
+        term_index: dict[str, int] = {}
+        for segment in self.segments:
+            for term in segment.get_vocabulary().keys():
+                if term not in term_index:
+                    term_index[term] = len(
+                        term_index
+                    )  # Guarda el índice numérico que ocupará ese término en los vectores
             # En el espacio vectorial, cada documento (y cada consulta) se representa con un vector de longitud V (tamaño del vocabulario). Para saber en qué posición del vector colocar el peso de un cada término, necesitamos un mapeo término→índice único.
+        self._term_index = term_index
 
     def _make_vector(self, tf_counter: Counter) -> np.ndarray:
         """
@@ -49,7 +273,7 @@ class IRSystemBSBI(IRSystem):
         V = len(self.term_index)
         vec = np.zeros(V, dtype=float)
         for term, freq in tf_counter.items():
-            if term in self.analyzer.vocabulary:
+            if term in self.term_index:
                 # No implementado el IDF
                 idx = self.term_index[term]
                 # tf_weight = 1 + math.log(freq)
@@ -59,17 +283,40 @@ class IRSystemBSBI(IRSystem):
         return vec
 
     def index_collection(self, path: str) -> None:
-        if os.path.exists(self.index_dir):
-            print("El índice ya existe. No se realizará la indexación.\n")
-            return
-        self.analyzer.index_collection(path)
-        if self.analyzer.get_vocabulary() is not None:
-            self._make_term_index()
+        """
+        Indexa la colección. Si el índice ya existe, indexa solo los documentos nuevos en un
+        segmento incremental (ver IndexadorBSBI.add_documents); si quedó un indexado
+        interrumpido, lo reanuda desde su checkpoint. Un directorio sin checkpoint al que le
+        faltan archivos del índice no se toma como índice terminado: se rechaza en vez de
+        agregarle segmentos sobre una base rota.
+        """
+        built = (
+            os.path.isdir(self.index_dir)
+            and bool(os.listdir(self.index_dir))
+            and not self.analyzer.has_checkpoint()
+        )
+        if built:
+            missing = self.analyzer.missing_files()
+            if missing:
+                raise ValueError(
+                    f"{self.index_dir} tiene un índice incompleto (faltan "
+                    f"{', '.join(missing)}) y no hay checkpoint para reanudarlo: "
+                    "borrar el directorio para reconstruirlo."
+                )
+            n_docs = self.analyzer.add_documents(path)
+            if n_docs == 0:
+                print("El índice ya existe y no hay documentos nuevos.\n")
+                return
+            print(f"\nDocumentos nuevos indexados: {n_docs}")
+        else:
+            self.analyzer.index_collection(path)
+        self._load_segments()
         print()
 
     def query(self, text: str, **kwargs: object):
         return super().query(text, **kwargs)
 
+    @_first_query
     def daat_query(
         self, text: str, top_k: int = 10, **kwargs
     ) -> list[tuple[str, int, float]]:
@@ -77,9 +324,20 @@ class IRSystemBSBI(IRSystem):
         Ejecuta una consulta vectorial DAAT sobre el índice BSBI usando solo TF crudo.
         Devuelve los top-k documentos con mayor score coseno.
         """
-        # 1) Construir vector de consulta y su norma
         tokens = self.analyzer.tokenizer.tokenizar(text)
-        tf_query = Counter(tokens)
+        return self._daat(Counter(tokens), top_k)
+
+    def _daat(
+        self,
+        tf_query: Counter,
+        top_k: int,
+        posting_arrays: Optional[dict[str, tuple[np.ndarray, np.ndarray]]] = None,
+    ) -> list[tuple[str, int, float]]:
+        """
+        Evalúa la consulta vectorial tf_query. posting_arrays tiene las posting lists ya
+        leídas (ver batch_query); los términos que no están se leen del índice.
+        """
+        # 1) Construir vector de consulta y su norma
         if not tf_query:
             return []
         q_vec = self._make_vector(tf_query)
@@ -88,26 +346,38 @@ class IRSystemBSBI(IRSystem):
             return []
 
         # 2) Recuperar posting‐lists de cada término de la query
-        posting_lists = {
-            term: self.get_term_from_posting_list(term) for term in tf_query
-        }
+        posting_lists = [
+            (
+                posting_arrays[term]
+                if posting_arrays is not None and term in posting_arrays
+                else self.get_posting_arrays(term)
+            )
+            for term in tf_query
+        ]
 
-        # 3) Construir el set de candidatos (docIDs)
-        candidate_docids = sorted(
-            {p.doc_id for plist in posting_lists.values() for p in plist}
-        )
+        # 3) Construir el set de candidatos (docIDs) y el producto escalar de cada uno con la
+        # consulta: la frecuencia del término en el documento está en su posting
+        all_doc_ids = [doc_ids for doc_ids, _ in posting_lists]
+        candidates = np.unique(np.concatenate(all_doc_ids))
+        dots = np.zeros(len(candidates), dtype=np.float64)
+        for (doc_ids, freqs), q_freq in zip(posting_lists, tf_query.values()):
+            positions = np.searchsorted(candidates, doc_ids)
+            dots[positions] += q_freq * freqs.astype(np.float64)
 
         # 4) Calcula el score para cada documento candidato
         heap: list[tuple[float, int, str]] = []
-        for docid in candidate_docids:
-            tf_doc = self.analyzer.get_doc_terms(docid)
-            d_vec = self._make_vector(tf_doc)
-            norm_d = np.linalg.norm(d_vec)
+        for docid, dot in zip(candidates.tolist(), dots.tolist()):
+            segment = self._segment_of(docid)
+            # La norma del documento está precalculada en la tabla de documentos (los índices
+            # viejos arman el vector del documento con el índice directo)
+            norm_d = segment.get_doc_norm(docid)
+            if norm_d is None:
+                norm_d = np.linalg.norm(self._make_vector(segment.get_doc_terms(docid)))
             if norm_d == 0:
                 continue
 
-            score = float(np.dot(q_vec, d_vec) / (norm_q * norm_d))
-            docname = self.analyzer.get_doc_id_map().get(docid, str(docid))
+            score = float(dot / (norm_q * norm_d))
+            docname = self.doc_id_map.get(docid, str(docid))
 
             # 5) Modificar Top-k
             if len(heap) < top_k:
@@ -121,66 +391,340 @@ class IRSystemBSBI(IRSystem):
         heap.sort(key=lambda x: -x[0])
         return [(docname, docid, score) for score, docid, docname in heap]
 
+    @_first_query
     def taat_query(self, query: str) -> list[tuple[int, str]]:
         """
         Evalúa una consulta booleana TAAT (Term At A Time) y devuelve los documentos que la satisfacen.
+        Los términos pueden tener comodines (comput*, *ción, a*ción; ver expand_term).
         """
-        algebra: boolean.BooleanAlgebra = boolean.BooleanAlgebra()
-        expr = algebra.parse(query.lower())
+        expr, wildcards = self._parse_boolean(query)
+        return self._eval_boolean(expr, wildcards)
 
-        def get_docid_set(term: str) -> set[int]:
-            postings = self.get_term_from_posting_list(term)
-            return set(p.doc_id for p in postings)
+    def _parse_boolean(self, query: str) -> tuple[boolean.Expression, dict[str, str]]:
+        """
+        Parsea una consulta booleana. Devuelve la expresión y los comodines que tiene
+        (símbolo que lo reemplaza en la expresión -> patrón).
+        """
+        algebra: boolean.BooleanAlgebra = boolean.BooleanAlgebra()
+        # boolean.py toma '*' como AND: los términos con comodín se reemplazan por símbolos
+        wildcards: dict[str, str] = {}
+
+        def replace_wildcard(match: re.Match) -> str:
+            token = match.group(0)
+            if "*" not in token or not token.strip("*"):
+                return token
+            symbol = f"_comodin{len(wildcards)}"
+            wildcards[symbol] = token
+            return symbol
+
+        expr = algebra.parse(self.WILDCARD_TOKEN.sub(replace_wildcard, query.lower()))
+        return expr, wildcards
+
+    def _eval_boolean(
+        self,
+        expr: boolean.Expression,
+        wildcards: dict[str, str],
+        docid_arrays: Optional[dict[str, np.ndarray]] = None,
+    ) -> list[tuple[int, str]]:
+        """
+        Evalúa una consulta parseada con _parse_boolean. Cada subexpresión es un array de
+        doc_ids creciente y sin repetir (las posting lists ya lo son), así AND, OR y NOT son
+        operaciones de numpy sobre arrays ordenados. docid_arrays tiene los doc_ids ya
+        leídos de términos y patrones con comodín (ver batch_query); no se modifican.
+        """
 
-        def eval_expr(e) -> set[int]:
-            if e.isliteral:
-                return get_docid_set(str(e))
+        def get_docids(term: str) -> np.ndarray:
+            key = wildcards.get(term, term)
+            if docid_arrays is not None and key in docid_arrays:
+                return docid_arrays[key]
+            if term in wildcards:
+                return self.get_wildcard_doc_ids(key)
+            return self.get_posting_arrays(term)[0]
+
+        def eval_expr(e) -> np.ndarray:
+            # isliteral también es True para NOT de un símbolo (~a): ese caso va por el NOT
+            if isinstance(e, boolean.Symbol):
+                return get_docids(str(e))
             op = getattr(e, "operator", None)
             if op in ("AND", "&"):
-                sets = [eval_expr(arg) for arg in e.args]
-                return set.intersection(*sets)
+                arrays = [eval_expr(arg) for arg in e.args]
+                return functools.reduce(
+                    functools.partial(np.intersect1d, assume_unique=True), arrays
+                )
             elif op in ("OR", "|"):
-                sets = [eval_expr(arg) for arg in e.args]
-                return set.union(*sets)
+                return _union_doc_ids([eval_expr(arg) for arg in e.args])
             elif op in ("NOT", "~"):
-                all_docids = set(self.analyzer.doc_id_map.keys())
-                return all_docids - eval_expr(e.args[0])
+                all_docids = np.array(
+                    [docid for docid in self.doc_id_map if not self._is_deleted(docid)],
+                    dtype=np.int64,
+                )
+                all_docids.sort()
+                return np.setdiff1d(
+                    all_docids, eval_expr(e.args[0]), assume_unique=True
+                )
             else:
                 raise ValueError(f"Operador no soportado: {op}")
 
         docids = eval_expr(expr)
-        doc_id_map = self.analyzer.get_doc_id_map()
-        return [(docid, doc_id_map[docid]) for docid in sorted(docids)]
+        return [(docid, self.doc_id_map[docid]) for docid in docids.tolist()]
+
+    @_first_query
+    def batch_query(
+        self, queries: list[str], mode: str = "boolean", top_k: int = 10
+    ) -> list[tuple[Optional[list], float]]:
+        """
+        Ejecuta un lote de consultas booleanas (mode "boolean", como taat_query) o rankeadas
+        ("ranked", como daat_query) leyendo cada posting list una sola vez: junta los
+        términos distintos de todo el lote (y las expansiones de sus comodines), los lee en
+        orden de offset en final_index.bin (acceso secuencial) y evalúa cada consulta con
+        las listas ya leídas, que quedan en memoria mientras dura el lote.
+        Devuelve, en el orden de queries, (resultados, segundos de parseo y evaluación de esa
+        consulta); los resultados son None si la consulta booleana no se pudo parsear. La
+        lectura compartida se informa en batch_stats().
+        """
+        if mode not in self.BATCH_MODES:
+            raise ValueError(f"Modo de lote no soportado: {mode}")
+        seconds = [0.0] * len(queries)
+        # 1) Parsear las consultas y juntar sus términos
+        parsed: list = []
+        terms: set[str] = set()
+        # Patrón con comodín -> términos en que se expande
+        patterns: dict[str, list[str]] = {}
+        for i, query in enumerate(queries):
+            t_start = time.perf_counter()
+            if mode == "ranked":
+                tf_query = Counter(self.analyzer.tokenizer.tokenizar(query))
+                terms.update(tf_query)
+                parsed.append(tf_query)
+            else:
+                try:
+                    expr, wildcards = self._parse_boolean(query)
+                except boolean.ParseError:
+                    parsed.append(None)
+                    continue
+                for symbol in expr.symbols:
+                    name = str(symbol)
+                    if name not in wildcards:
+                        terms.add(name)
+                    elif wildcards[name] not in patterns:
+                        patterns[wildcards[name]] = self.expand_term(wildcards[name])
+                        terms.update(patterns[wildcards[name]])
+                parsed.append((expr, wildcards))
+            seconds[i] += time.perf_counter() - t_start
+
+        # 2) Leer cada posting list una vez, en orden de offset
+        t_fetch = time.perf_counter()
+        fetched: dict = {}
+        for term in sorted(terms, key=self._posting_offset):
+            doc_ids, freqs = self.get_posting_arrays(term)
+            if mode == "ranked":
+                # Copias: la lectura del mmap ocurre ahora, en orden de offset
+                fetched[term] = (np.array(doc_ids), np.array(freqs))
+            else:
+                fetched[term] = np.array(doc_ids)
+        for pattern, expansions in patterns.items():
+            fetched[pattern] = _union_doc_ids([fetched[term] for term in expansions])
+        fetch_seconds = time.perf_counter() - t_fetch
+
+        # 3) Evaluar cada consulta
+        results: list[Optional[list]] = []
+        for i, query in enumerate(parsed):
+            t_start = time.perf_counter()
+            if query is None:
+                results.append(None)
+            elif mode == "ranked":
+                results.append(self._daat(query, top_k, fetched))
+            else:
+                results.append(self._eval_boolean(*query, fetched))
+            seconds[i] += time.perf_counter() - t_start
+        self._batch_stats = {
+            "queries": len(queries),
+            "terms": len(terms),
+            "fetch_seconds": fetch_seconds,
+            "query_seconds": sum(seconds),
+        }
+        return list(zip(results, seconds))
+
+    def _posting_offset(self, term: str) -> tuple[int, int]:
+        """
+        Posición de la posting list de term en el índice: (segmento, offset en su
+        final_index.bin) del primer segmento que la tiene.
+        """
+        for i, segment in enumerate(self.segments):
+            entry = segment.get_vocabulary().get(term)
+            if entry is not None:
+                return i, entry["puntero"]
+        return len(self.segments), 0
+
+    def batch_stats(self) -> dict:
+        """
+        Resumen del último batch_query: consultas, términos distintos leídos, segundos de la
+        lectura compartida de postings y suma de los segundos de cada consulta.
+        """
+        return dict(self._batch_stats)
+
+    def expand_term(self, pattern: str) -> list[str]:
+        """
+        Términos del índice (de todos los segmentos) que matchean pattern, donde '*' es
+        cualquier secuencia de caracteres (ver IndexadorBSBI.expand_wildcard), en orden. Si
+        son más de max_expansions se conservan los de mayor df.
+        """
+        dfs: Counter = Counter()
+        for segment in self.segments:
+            for term, df in segment.expand_wildcard(pattern):
+                dfs[term] += df
+        if len(dfs) > self.max_expansions:
+            return sorted(term for term, _ in dfs.most_common(self.max_expansions))
+        return sorted(dfs)
+
+    def get_wildcard_doc_ids(self, pattern: str) -> np.ndarray:
+        """
+        doc_ids (array creciente, sin repetir) de los documentos con algún término que
+        matchea pattern: la unión de las posting lists de la expansión, sin pasar por
+        objetos de Python.
+        """
+        return _union_doc_ids(
+            [self.get_posting_arrays(term)[0] for term in self.expand_term(pattern)]
+        )
+
+    def get_posting_arrays(self, termino: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Devuelve la posting list de un término como arrays (doc_ids, freqs) uint32 en orden de
+        doc_id. Con un solo segmento y sin documentos borrados son vistas sobre el
+        final_index.bin mapeado (sin copiar ni leer del archivo); si no, se concatenan los
+        segmentos y se filtran los borrados.
+        Con caché, los aciertos se devuelven sin tocar el índice y los fallos se guardan como
+        copias en memoria (así el presupuesto de bytes es memoria real del proceso).
+        """
+        if self.posting_cache is not None:
+            cached = self.posting_cache.get(termino)
+            if cached is not None:
+                return cached
+        parts: list[np.ndarray] = []
+        for segment, postings in zip(self.segments, self.postings):
+            entry = segment.get_vocabulary().get(termino)
+            if entry is not None:
+                start = entry["puntero"] // segment.POSTING_SIZE
+                parts.append(postings[start : start + entry["df"]])
+        if not parts:
+            pairs = np.zeros(0, dtype=PostingChunkReader.PAIR_DTYPE)
+        elif len(parts) == 1:
+            pairs = parts[0]
+        else:
+            pairs = np.concatenate(parts)
+        if self._deleted is not None:
+            pairs = pairs[~self._deleted[pairs["doc_id"]]]
+        if self.posting_cache is not None:
+            doc_ids, freqs = pairs["doc_id"].copy(), pairs["freq"].copy()
+            # Solo lectura, como las vistas sobre el mmap: el valor cacheado se comparte
+            doc_ids.flags.writeable = freqs.flags.writeable = False
+            self.posting_cache.put(
+                termino, (doc_ids, freqs), doc_ids.nbytes + freqs.nbytes
+            )
+            return doc_ids, freqs
+        return pairs["doc_id"], pairs["freq"]
+
+    def preload(self) -> None:
+        """
+        Carga de una vez todo lo que la apertura perezosa deja para su primer uso (segmentos,
+        doc_id_map, postings, tombstones, mapeo de términos, vocabularios, skips, índice
+        directo y k-gramas). Para procesos de larga vida como QueryServer, que prefieren
+        pagarlo al arrancar y no en la primera consulta de cada estructura.
+        """
+        for name in ("segments", "doc_id_map", "term_index", "tombstones", "postings"):
+            getattr(self, name)
+        for segment in self.segments:
+            segment.get_vocabulary()
+            segment.get_skips()
+            segment._load_forward_index()
+            segment.get_kgram_index()
+
+    def open_stats(self) -> dict:
+        """
+        Costo de abrir el índice: segundos de la apertura, hasta el fin de la primera consulta
+        (None si todavía no hubo) y de la carga de cada estructura que se usó.
+        """
+        return {
+            "open_seconds": self.open_seconds,
+            "time_to_first_query": self.time_to_first_query,
+            "loaded": dict(self.loaded),
+        }
+
+    def cache_stats(self) -> dict:
+        """
+        Estadísticas de la caché de posting lists (aciertos, fallos, desalojos, bytes servidos);
+        vacío si el sistema no tiene caché.
+        """
+        return self.posting_cache.stats() if self.posting_cache is not None else {}
+
+    @_first_query
+    def get_posting_list(self, termino: str) -> PostingList:
+        """
+        Devuelve la posting list de un término como PostingList (columnas de get_posting_arrays),
+        con el doc_id_map del sistema para resolver los nombres de documento.
+        """
+        doc_ids, freqs = self.get_posting_arrays(termino)
+        return PostingList(doc_ids, freqs, self.doc_id_map)
 
     def get_term_from_posting_list(self, termino: str) -> list[Posting]:
         """
-        Devuelve la posting list de un término como lista de objetos Posting.
+        Devuelve la posting list de un término como lista de objetos Posting, concatenando la
+        de cada segmento (en orden de doc_id). Envoltorio de get_posting_list.
+        """
+        return self.get_posting_list(termino).to_postings()
+
+    @_first_query
+    def phrase_query(self, text: str) -> list[tuple[int, str]]:
+        """
+        Consulta por frase: documentos donde los términos de text aparecen consecutivos y en
+        ese orden. Usa las posiciones del índice (requiere indexar con positional=True). En cada
+        segmento se conservan, término a término, los documentos y posiciones de inicio de
+        frase que siguen siendo posibles.
         """
-        vocabulary = self.analyzer.get_vocabulary()
-        postings_path = os.path.join(self.index_dir, self.analyzer.POSTINGS_FILENAME)
-        posting_size = self.analyzer.POSTING_SIZE
-        if termino not in vocabulary:
+        terms = self.analyzer.tokenizer.tokenizar(text)
+        if not terms:
             return []
-        puntero, df = vocabulary[termino]["puntero"], vocabulary[termino]["df"]
-        resultado: list[Posting] = []
-        with open(postings_path, "rb") as f:
-            f.seek(puntero)
-            for _ in range(df):
-                data = f.read(posting_size)
-                posting = Posting.from_bytes(data)
-                resultado.append(posting)
-        return resultado
+        result: list[int] = []
+        for segment in self.segments:
+            starts: dict[int, set[int]] = {}  # doc_id -> posiciones de inicio de la frase
+            for i, term in enumerate(terms):
+                term_positions = dict(segment.get_positions(term))
+                if i == 0:
+                    starts = {
+                        docid: set(positions)
+                        for docid, positions in term_positions.items()
+                    }
+                else:
+                    starts = {
+                        docid: doc_starts & {p - i for p in term_positions[docid]}
+                        for docid, doc_starts in starts.items()
+                        if docid in term_positions
+                    }
+                starts = {docid: s for docid, s in starts.items() if s}
+                if not starts:
+                    break
+            result.extend(
+                docid for docid in sorted(starts) if not self._is_deleted(docid)
+            )
+        return [(docid, self.doc_id_map[docid]) for docid in result]
 
     def get_skip_list_from_term(self, term: str) -> list[tuple[int, int]]:
+        """
+        Skips del término en el índice base (los offsets son relativos al final_index.bin de
+        cada segmento).
+        """
         skips_dict = self.analyzer.get_skips()
         return skips_dict.get(term, [])
 
+    @_first_query
     def taat_query_with_skips(self, query: str) -> list[tuple[int, str]]:
         """
         Evalúa una consulta TAAT AND entre múltiples términos usando skips (offsets en bytes).
         Utiliza la clase SkipList para saltar en disco.
         Devuelve los documentos que la satisfacen (docid, docname).
         Solo soporta queries AND de varios términos (no OR/NOT).
+        Con segmentos, la intersección se hace en cada segmento por separado: sus rangos de
+        doc_id son disjuntos y crecientes, así que alcanza con concatenar los resultados.
         """
         import re
 
@@ -192,11 +736,22 @@ class IRSystemBSBI(IRSystem):
         if len(terms) < 2:
             raise ValueError("La consulta debe tener al menos dos términos AND.")
 
-        vocabulary = self.analyzer.get_vocabulary()
-        skips_dict = self.analyzer.get_skips()
-        doc_id_map = self.analyzer.get_doc_id_map()
-        postings_path = os.path.join(self.index_dir, self.analyzer.POSTINGS_FILENAME)
-        posting_size = self.analyzer.POSTING_SIZE
+        result: list[int] = []
+        for segment in self.segments:
+            result.extend(self._intersect_with_skips(segment, terms))
+        return [(docid, self.doc_id_map[docid]) for docid in result]
+
+    def _intersect_with_skips(
+        self, segment: IndexadorBSBI, terms: list[str]
+    ) -> list[int]:
+        """
+        Intersección AND de las posting lists de terms dentro de un segmento, saltando en disco
+        con sus skips. Devuelve los doc_ids en orden.
+        """
+        vocabulary = segment.get_vocabulary()
+        skips_dict = segment.get_skips()
+        postings_path = os.path.join(segment.path_index, segment.POSTINGS_FILENAME)
+        posting_size = segment.POSTING_SIZE
 
         # Filtrar términos inexistentes
         term_infos = []
@@ -227,6 +782,9 @@ class IRSystemBSBI(IRSystem):
         result_docids = get_posting_docids(
             ordered_terms[0]
         )  # Lista de resultados parciales -> es inicializa con los doc_id del termino con menor df (posting list mas corta)
+        if self.tombstones is not None:
+            # Filtrar los borrados al inicio achica todas las intersecciones siguientes
+            result_docids = [d for d in result_docids if not self._is_deleted(d)]
 
         for idx in range(1, len(ordered_terms)):  # No incluye el primer término
             # Recuperar info para recuperar posting list de t
@@ -267,4 +825,47 @@ class IRSystemBSBI(IRSystem):
             if not result_docids:
                 break
 
-        return [(docid, doc_id_map[docid]) for docid in result_docids]
+        return result_docids
+
+
+def open_index(
+    path_index: str = "index", tokenizer: Optional[Tokenizador] = None, **kwargs
+) -> IRSystemBSBI:
+    """
+    Abre un índice ya construido para consultarlo sin cargar ninguna estructura: lee
+    manifest.json para configurar el indexador (BSBI o SPIMI, posiciones, k-gramas) y deja
+    vocabulario, postings, doc_id_map, skips y demás para su primer uso, así una ejecución
+    corta solo paga lo que consulta. kwargs se pasan a IRSystemBSBI (cache_bytes,
+    max_expansions). El costo de apertura y el tiempo hasta la primera consulta quedan en
+    open_stats().
+    """
+    t_start = time.perf_counter()
+    if not os.path.isdir(path_index):
+        raise FileNotFoundError(f"No existe el índice {path_index}.")
+    manifest_path = os.path.join(path_index, IndexadorBSBI.MANIFEST_FILENAME)
+    manifest: dict = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf8") as f:
+            manifest = json.load(f)
+        if manifest["version"] > IndexadorBSBI.MANIFEST_VERSION:
+            raise ValueError(
+                f"El manifest de {path_index} es de una versión más nueva "
+                f"({manifest['version']})."
+            )
+    tokenizer = tokenizer or Tokenizador()
+    if manifest.get("method") == IndexadorSPIMI.INDEXING_METHOD:
+        analyzer: IndexadorBSBI = IndexadorSPIMI(
+            tokenizer, path_index=path_index, kgrams=manifest["kgrams"]
+        )
+    else:
+        analyzer = IndexadorBSBI(
+            tokenizer,
+            path_index=path_index,
+            positional=manifest.get("positional", False),
+            kgrams=manifest.get("kgrams", False),
+        )
+    analyzer._manifest = manifest or None
+    irsys = IRSystemBSBI(analyzer, **kwargs)
+    irsys._opened_at = t_start
+    irsys.open_seconds = time.perf_counter() - t_start
+    return irsys
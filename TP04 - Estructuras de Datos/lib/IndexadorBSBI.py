@@ -1,146 +1,488 @@
-from collections import Counter
+from array import array
+from bisect import bisect_right
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from fnmatch import fnmatchcase
+from itertools import groupby, islice
+from operator import itemgetter
 import os
 import pickle
 import heapq
+import json
+import shutil
+import sys
 import time
-from bs4 import BeautifulSoup
-from typing import Dict
+import tracemalloc
+import warnings
+import numpy as np
+from bitarray import bitarray
+from typing import Dict, Iterator, Optional, Union
 
 from lib.CollectionAnalyzerBase import CollectionAnalyzerBase
+from lib.CorpusReader import CorpusReader, open_corpus
+from lib.DocTable import DocTable
+from lib.IndexingMetrics import IndexingMetrics
+from lib.KGramIndex import KGramIndex
+from lib.Lexicon import Lexicon
 from lib.Tokenizador import Tokenizador
 from lib.PartialPosting import PartialPosting
+from lib.PartialPostingBuffer import PartialPostingBuffer
 from lib.PostingChunk import PostingChunk
+from lib.PostingChunkReader import PostingChunkReader
+from lib.TextExtractor import TextExtractor, get_text_extractor
 from lib.Posting import Posting
+from lib.codecs_compresion import (
+    compute_dgaps,
+    restore_from_dgaps,
+    vbyte_decode_list,
+    vbyte_encode_list,
+)
 
 
 class IndexadorBSBI(CollectionAnalyzerBase):
     # Constantes de archivos y tamaños
-    VOCABULARY_FILENAME = "vocabulary.pkl"
+    VOCABULARY_FILENAME = "lexicon.bin"  # ver Lexicon
+    LEGACY_VOCABULARY_FILENAME = "vocabulary.pkl"  # formato viejo (dict pickleado)
     POSTINGS_FILENAME = "final_index.bin"
-    METADATA_FILENAME = "metadata.pkl"
+    METADATA_FILENAME = "doc_table.bin"  # ver DocTable
+    LEGACY_METADATA_FILENAME = "metadata.pkl"  # formato viejo (doc_id_map pickleado)
     SKIPS_FILENAME = "skips.pkl"
-    DOC_VECTORS_FILENAME = "doc_vectors.pkl"
+    POSITIONS_FILENAME = "positions.bin"  # solo índices posicionales (ver _merge_positions)
+    METRICS_FILENAME = "indexing_metrics.json"
+    # Checkpoint del indexado en curso (ver _write_checkpoint): manifest y log de documentos
+    # y términos nuevos de cada volcado
+    CHECKPOINT_FILENAME = "checkpoint.pkl"
+    CHECKPOINT_DOCS_FILENAME = "checkpoint_docs.pkl"
+    DOC_VECTORS_FILENAME = "doc_vectors.pkl"  # formato viejo, reemplazado por el forward index
+    FORWARD_INDEX_FILENAME = "forward_index.bin"
+    FORWARD_OFFSETS_FILENAME = "forward_offsets.bin"
+    FORWARD_TERMS_FILENAME = "forward_terms.pkl"
+    FORWARD_DTYPE = np.dtype([("term_id", "=u4"), ("freq", "=u4")])
+    SEGMENTS_DIRNAME = "segments"  # segmentos incrementales (ver add_documents)
+    SEGMENTS_FILENAME = "segments.pkl"
+    TOMBSTONES_FILENAME = "tombstones.bin"  # bitmap de documentos borrados
+    # Descripción del índice (archivos con versión y tamaño, resumen); ver _write_manifest
+    MANIFEST_FILENAME = "manifest.json"
+    MANIFEST_VERSION = 1
+    FILE_VERSIONS = {
+        VOCABULARY_FILENAME: 1,
+        POSTINGS_FILENAME: 1,
+        METADATA_FILENAME: 1,
+        LEGACY_METADATA_FILENAME: 1,
+        SKIPS_FILENAME: 1,
+        POSITIONS_FILENAME: 1,
+        METRICS_FILENAME: 1,
+        DOC_VECTORS_FILENAME: 1,
+        FORWARD_INDEX_FILENAME: 1,
+        FORWARD_OFFSETS_FILENAME: 1,
+        FORWARD_TERMS_FILENAME: 1,
+        SEGMENTS_FILENAME: 1,
+        TOMBSTONES_FILENAME: 1,
+        KGramIndex.LEXICON_FILENAME: 1,
+        KGramIndex.POSTINGS_FILENAME: 1,
+    }
     DOCID_SIZE = 4  # bytes
     FREQ_SIZE = 4  # bytes
     POSTING_STRUCT_FORMAT = "II"  # 2 unsigned ints
     POSTING_SIZE = DOCID_SIZE + FREQ_SIZE  # 8 bytes
+    INDEXING_METHOD = "BSBI"
+    # heap: merge original con PostingChunk; buffered: lectura por bloques con PostingChunkReader;
+    # runs: concatena la corrida de cada término por chunk (ver _merge_chunks_runs);
+    # partitioned: runs en paralelo por rangos de term_id (ver _merge_chunks_partitioned)
+    MERGE_MODES = ("heap", "buffered", "runs", "partitioned")
+    PARTITION_SAMPLES = 10000  # term_ids muestreados para balancear los rangos del merge
+    DISK_POLL_SECONDS = 0.05  # cada cuánto se mide el tamaño de los runs en escritura
+    # Costo estimado por término nuevo (además del str): entrada en term2id y en id2term + el int del id
+    TERM_ENTRY_BYTES = 2 * 48 + 28
+    # Fracción mínima de memory_limit_mb para los postings de un bloque, aunque el
+    # diccionario ocupe casi todo (o más que) el presupuesto
+    MIN_BLOCK_FRACTION = 0.5
 
     def __init__(
         self,
         tokenizer: Tokenizador,
         memory_limit: int = 1000,
         path_index: str = "index",
+        max_workers: int = 1,
+        memory_limit_mb: Optional[float] = None,
+        measure_memory: bool = False,
+        array_buffer: bool = False,
+        merge_mode: str = "heap",
+        merge_block_size: int = PostingChunkReader.DEFAULT_BLOCK_SIZE,
+        max_fan_in: Optional[int] = None,
+        delete_chunks: bool = True,
+        text_extractor: Optional[TextExtractor] = None,
+        progress_interval: float = 1.0,
+        positional: bool = False,
+        kgrams: bool = False,
     ):
         super().__init__(tokenizer)
+        # Extracción de texto de los .html (por defecto la más rápida disponible)
+        self.text_extractor: TextExtractor = text_extractor or get_text_extractor()
         self.memory_limit: int = memory_limit
         self.memory_usage: int = 0
+        # Presupuesto en MB: si se define, el volcado se decide por bytes estimados y no por documentos
+        self.memory_limit_mb: Optional[float] = memory_limit_mb
+        self.measure_memory: bool = (
+            measure_memory  # medir con tracemalloc la memoria real en cada volcado
+        )
+        self.chunk_bytes: int = 0  # bytes estimados de los postings del bloque actual
+        self.dictionary_bytes: int = 0  # bytes estimados de term2id + id2term
+        self._dictionary_warned: bool = False  # ya se avisó que supera memory_limit_mb
+        self.chunk_stats: list[dict[str, int]] = []  # memoria estimada/medida por chunk
+        # Bloques en PartialPostingBuffer (columnas array('I')) en vez de listas de PartialPosting
+        self.array_buffer: bool = array_buffer
+        if merge_mode not in self.MERGE_MODES:
+            raise ValueError(f"merge_mode no soportado: {merge_mode}")
+        self.merge_mode: str = merge_mode
+        self.merge_block_size: int = merge_block_size  # bytes por lectura en modo buffered
+        # Merge jerárquico: como máximo max_fan_in archivos abiertos por merge (None = todos)
+        if max_fan_in is not None and max_fan_in < 2:
+            raise ValueError("max_fan_in debe ser al menos 2.")
+        self.max_fan_in: Optional[int] = max_fan_in
+        self.delete_chunks: bool = delete_chunks  # borrar los chunk_N.bin ya mergeados
+        # Guardar también las posiciones de cada término en cada documento (positions.bin)
+        self.positional: bool = positional
+        # Construir el índice de k-gramas del vocabulario (comodines *ción, a*ción; ver KGramIndex)
+        self.kgrams: bool = kgrams
+        self._kgram_index: Optional[KGramIndex] = None
+        self.peak_disk_bytes: int = 0  # uso pico de disco (chunks + runs + índice) en el merge
         self.path_index: str = path_index
-        self.vocabulary: Dict[str, Dict[str, int]] = (
-            {}
-        )  # término -> {"df": ..., "puntero": ...}
+        self.max_workers: int = max_workers  # procesos para el parseo de bloques (1 = serie)
+        self.index_time: float = 0.0  # segundos de la pasada de documentos
+        self.merge_time: float = 0.0  # segundos del merge de chunks
+        # Métricas del último indexado (indexing_metrics.json) y segundos entre líneas de progreso
+        self.metrics: Optional[IndexingMetrics] = None
+        self.progress_interval: float = progress_interval
+        # término -> {"df": ..., "puntero": ...}: dict mientras se construye, Lexicon al cargar
+        self.vocabulary: Union[Dict[str, Dict[str, int]], Lexicon] = {}
         self.chunks: list[str] = []  # paths a los archivos de chunks
         self.term2id: Dict[str, int] = {}
         self.id2term: Dict[int, str] = {}
-        self.doc_id_map: Dict[int, str] = {}  # doc_id -> nombre del archivo
-        self._doc_vectors = None  # Siempre None al inicio, se carga si existe
+        # doc_id -> nombre del archivo: dict mientras se construye, DocTable al cargar
+        self.doc_id_map: Union[Dict[int, str], DocTable] = {}
+        # Tamaño en bytes de cada documento indexado, por doc_id desde first_doc_id + 1
+        # (columna bytes de la tabla de documentos)
+        self._doc_bytes: array = array("Q")
+        self._doc_vectors = None  # Solo índices viejos: se carga de doc_vectors.pkl si existe
+        self._forward: Optional[tuple] = None  # (offsets, registros, inicios de tabla, tablas)
+        # Indexado incremental: los doc_ids arrancan en first_doc_id + 1 y se saltean los
+        # documentos de known_docs (ya indexados en otro segmento)
+        self.first_doc_id: int = 0
+        self.known_docs: set[str] = set()
+        self._segments: Optional[list["IndexadorBSBI"]] = None
+        self._tombstones: Optional[bitarray] = None
+        self._checkpoint_doc_id: int = 0  # último doc_id guardado en checkpoint_docs.pkl
+        self._checkpoint_terms: int = 0  # términos guardados en checkpoint_docs.pkl
+        self._checkpoint_phase: str = "invert"  # fase del checkpoint cargado (o "merge")
+        self._manifest: Optional[dict] = None
 
-    def index_collection(self, docs_path: str) -> None:
+    def index_collection(
+        self, docs_path: Union[str, CorpusReader], resume: bool = True
+    ) -> None:
         """
         Indexa la colección usando BSBI. Procesa bloques de n documentos, vuelca a disco y mergea los chunks.
         Mide y reporta los tiempos de indexado y merge por separado.
+        docs_path puede ser un directorio, un .tar(.gz), una colección TREC o un CorpusReader
+        (ver open_corpus); los documentos se leen en streaming.
+        Si max_workers > 1, los bloques se parsean/tokenizan en paralelo (ver _invert_blocks_parallel).
+        Después de cada volcado se guarda un checkpoint; si un indexado anterior se interrumpió
+        y resume es True, se retoma desde el último checkpoint en vez de empezar de cero.
+        Terminada la inversión, el checkpoint pasa a la fase "merge" y sigue hasta que el
+        índice está completo (manifest.json escrito): si se interrumpe el merge o la escritura
+        de vocabulario y metadatos, se rehace el merge desde los chunks guardados.
         """
         os.makedirs(self.path_index, exist_ok=True)
-        doc_id: int = 0
-        current_chunk_postings: list[PartialPosting] = []
-
-        print("Iniciando indexado (BSBI)...")
-        t_index_start = time.time()
-
-        # Recorre recursivamente el directorio
-        for root, _, files in os.walk(docs_path):
-            for fname in files:
-                # Validar memoria. Si se supera el límite, procesar el chunk actual y reiniciar
-                if self.memory_usage > self.memory_limit:
-                    self._process_chunk(
-                        current_chunk_postings
-                    )  # BSBI-Invert(block) de la diapositiva
-                    current_chunk_postings = []
-                    self.memory_usage = 0
-
-                # ParseNextBlock() de la diapositiva
-                if fname.endswith((".html", ".txt")):
-                    self.memory_usage += 1
-                    doc_id += 1
-                    print(
-                        f"\rProcesando documento {doc_id}: {fname}", end="", flush=True
-                    )
-                    tokens, doc_name = self._process_doc(fname, root, docs_path)
-                    terms_freq = Counter(tokens)
-                    for token, freq in terms_freq.items():
-                        if token not in self.term2id:
-                            self.term2id[token] = len(self.term2id) + 1
-                            self.id2term[self.term2id[token]] = token
-                        term_id = self.term2id[token]
-                        current_chunk_postings.append(
-                            PartialPosting(term_id, doc_id, freq)
-                        )
-                    self.doc_id_map[doc_id] = doc_name
-                    # --- GUARDAR VECTOR DEL DOCUMENTO ---
-                    if self._doc_vectors is None:
-                        self._doc_vectors = {}
-                    self._doc_vectors[doc_id] = terms_freq.copy()
+        reader = open_corpus(docs_path)
 
-        # Procesar el último chunk
-        if len(current_chunk_postings) > 0:
-            self._process_chunk(current_chunk_postings)
-            current_chunk_postings = []
+        self.metrics = IndexingMetrics(self.progress_interval)
+        resumed = resume and self._load_checkpoint()
+        merging = resumed and self._checkpoint_phase == "merge"
+        if merging:
+            print(
+                f"Reanudando indexado ({self.INDEXING_METHOD}) desde el checkpoint del "
+                f"merge: {len(self.doc_id_map)} documentos, {len(self.chunks)} chunks..."
+            )
+        elif resumed:
+            print(
+                f"Reanudando indexado ({self.INDEXING_METHOD}) desde el checkpoint: "
+                f"{len(self.doc_id_map)} documentos y {len(self.chunks)} chunks ya procesados..."
+            )
+        else:
+            self._remove_checkpoint()
+            self._checkpoint_doc_id = self.first_doc_id
+            self._checkpoint_terms = 0
+            print(f"Iniciando indexado ({self.INDEXING_METHOD})...")
+        self.index_time = 0.0
+        if not merging:
+            if self.measure_memory:
+                tracemalloc.start()
+            t_index_start = time.time()
+            self._open_forward_index(resume=resumed)
+            if not resumed:
+                self._write_checkpoint()
+            if self.max_workers > 1:
+                self._invert_blocks_parallel(reader)
+            else:
+                self._invert_blocks(reader)
+            self._close_forward_index()
+            t_index_end = time.time()
+            if self.measure_memory:
+                tracemalloc.stop()
+            self.index_time = t_index_end - t_index_start
+            print(
+                f"\nTiempo de indexado (volcado parcial): {self.index_time:.2f} segundos"
+            )
+            self._write_checkpoint(phase="merge")
 
-        t_index_end = time.time()
-        print(
-            f"\nTiempo de indexado (volcado parcial): {t_index_end - t_index_start:.2f} segundos"
+        self.merge_chunks()
+        postings_bytes = os.path.getsize(
+            os.path.join(self.path_index, self.POSTINGS_FILENAME)
+        )
+        self.metrics.set_merge(
+            postings_bytes // self.POSTING_SIZE, postings_bytes, self.merge_time
         )
-
-        print("Iniciando merge de chunks...")
-        t_merge_start = time.time()
-        self._merge_chunks()
-        t_merge_end = time.time()
-        print(f"Tiempo de merge: {t_merge_end - t_merge_start:.2f} segundos")
 
         self._write_vocabulary()
         self._write_metadata()
-        if self._doc_vectors is not None:
-            self._write_doc_vectors()
-
-    def _process_doc(self, fname: str, root: str, path: str) -> tuple[list[str], str]:
-        with open(os.path.join(root, fname), encoding="utf8", errors="ignore") as f:
-            text = f.read()
-            if fname.endswith(".html"):
-                text: str = BeautifulSoup(text, "html.parser").get_text(separator=" ")
-                """
-                ACÁ SE PODRÍA HACER UN PARSEO MÁS COMPLEJO DEL HTML (usando BeautifulSoup)
-                """
-        tokens = self.tokenizer.tokenizar(text)
-        doc_name = os.path.relpath(os.path.join(root, fname), path)
-        return tokens, doc_name
-
-    def _process_chunk(self, chunk: list[PartialPosting]) -> None:
+        self.metrics.write_json(os.path.join(self.path_index, self.METRICS_FILENAME))
+        self._write_manifest()
+        # Recién con el índice completo se descartan el checkpoint y los chunks que lista
+        self._remove_checkpoint()
+        if self.delete_chunks:
+            self._remove_chunk_files()
+
+    def _invert_blocks(self, reader: CorpusReader) -> None:
+        """
+        Recorre la colección en un único proceso, armando los bloques y volcándolos a disco.
+        Los documentos de known_docs (ya indexados en otro segmento) se saltean.
+        """
+        # Al reanudar, doc_id_map ya tiene los documentos del checkpoint
+        doc_id: int = self.first_doc_id + len(self.doc_id_map)
+        current_chunk_postings = self._new_chunk_buffer()
+
+        # ParseNextBlock() de la diapositiva
+        for doc_name, text in reader.docs(exclude=self.known_docs):
+            # Validar memoria. Si se supera el límite, procesar el chunk actual y reiniciar
+            if self._memory_exceeded() and current_chunk_postings:
+                self._flush_chunk(
+                    current_chunk_postings
+                )  # BSBI-Invert(block) de la diapositiva
+                current_chunk_postings = self._new_chunk_buffer()
+
+            self.memory_usage += 1
+            doc_id += 1
+            tokens = self._process_doc(doc_name, text)
+            positions = _encode_positions(tokens) if self.positional else None
+            self._add_doc(
+                doc_id, doc_name, Counter(tokens), current_chunk_postings, positions
+            )
+            n_bytes = len(text.encode("utf8"))
+            self._doc_bytes.append(n_bytes)
+            self.metrics.add_doc(doc_id, len(tokens), n_bytes)
+        self.metrics.end_documents(doc_id)
+
+        # Procesar el último chunk
+        if len(current_chunk_postings) > 0:
+            self._flush_chunk(current_chunk_postings)
+
+    def _invert_blocks_parallel(self, reader: CorpusReader) -> None:
+        """
+        Variante paralela de _invert_blocks: el proceso principal lee la colección en bloques,
+        un pool de procesos parsea, tokeniza y cuenta cada bloque (la parte costosa en CPU) y el
+        proceso principal consume los resultados en orden para asignar doc_ids/term_ids y
+        escribir chunk_N.bin.
+        Al consumir los bloques en el orden de lectura, los doc_ids y term_ids son los mismos
+        que en el modo serie y _merge_chunks no necesita cambios.
+        Los bloques de trabajo tienen memory_limit + 1 documentos; el volcado se decide documento
+        a documento con el mismo criterio del modo serie (_memory_exceeded). Como mucho hay
+        2 * max_workers bloques leídos y sin consumir, para no cargar la colección en memoria.
+        """
+        # Mismo corte que el modo serie: se vuelca cuando memory_usage > memory_limit
+        block_size = self.memory_limit + 1
+        # Al reanudar, doc_id_map ya tiene los documentos del checkpoint
+        doc_id: int = self.first_doc_id + len(self.doc_id_map)
+        current_chunk_postings = self._new_chunk_buffer()
+
+        def consume(
+            block: list[tuple[str, Counter, int, Optional[dict[str, bytes]]]],
+        ) -> None:
+            nonlocal doc_id, current_chunk_postings
+            for doc_name, terms_freq, n_bytes, positions in block:
+                if self._memory_exceeded() and current_chunk_postings:
+                    self._flush_chunk(current_chunk_postings)
+                    current_chunk_postings = self._new_chunk_buffer()
+                self.memory_usage += 1
+                doc_id += 1
+                self._add_doc(
+                    doc_id, doc_name, terms_freq, current_chunk_postings, positions
+                )
+                self._doc_bytes.append(n_bytes)
+                self.metrics.add_doc(doc_id, sum(terms_freq.values()), n_bytes)
+
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_block_worker,
+            initargs=(self.tokenizer, self.text_extractor, self.positional),
+        ) as pool:
+            pending: deque = deque()
+            docs = reader.docs(exclude=self.known_docs)
+            while True:
+                block = list(islice(docs, block_size))
+                if not block:
+                    break
+                pending.append(pool.submit(_invert_block, block))
+                if len(pending) >= 2 * self.max_workers:
+                    consume(pending.popleft().result())
+            while pending:
+                consume(pending.popleft().result())
+        self.metrics.end_documents(doc_id)
+
+        if len(current_chunk_postings) > 0:
+            self._flush_chunk(current_chunk_postings)
+
+    def _new_chunk_buffer(self) -> Union[list[PartialPosting], PartialPostingBuffer]:
+        """
+        Crea el contenedor de postings parciales de un bloque nuevo.
+        """
+        if self.array_buffer:
+            return PartialPostingBuffer()
+        return []
+
+    def _memory_exceeded(self) -> bool:
+        """
+        Indica si el bloque actual debe volcarse a disco: por bytes estimados si hay
+        memory_limit_mb, o por cantidad de documentos si no. El diccionario de términos
+        no se libera al volcar, así que los postings del bloque tienen lo que queda del
+        presupuesto después del diccionario, y como mínimo MIN_BLOCK_FRACTION de él (si
+        no, con un diccionario que llena el presupuesto se volcaría un chunk por
+        documento).
+        """
+        if self.memory_limit_mb is not None:
+            budget = self.memory_limit_mb * 1024 * 1024
+            if self.dictionary_bytes > budget and not self._dictionary_warned:
+                warnings.warn(
+                    f"El diccionario de términos ({self.dictionary_bytes / 2**20:.2f}"
+                    f" MB) supera memory_limit_mb ({self.memory_limit_mb} MB): los"
+                    f" bloques usan el mínimo de {self.MIN_BLOCK_FRACTION:.0%} del"
+                    " presupuesto."
+                )
+                self._dictionary_warned = True
+            block_budget = max(
+                budget - self.dictionary_bytes, budget * self.MIN_BLOCK_FRACTION
+            )
+            return self.chunk_bytes > block_budget
+        return self.memory_usage > self.memory_limit
+
+    def _add_doc(
+        self,
+        doc_id: int,
+        doc_name: str,
+        terms_freq: Counter,
+        current_chunk_postings: Union[list[PartialPosting], PartialPostingBuffer],
+        positions: Optional[dict[str, bytes]] = None,
+    ) -> None:
+        """
+        Agrega los postings parciales de un documento al bloque actual, asignando term_ids nuevos
+        en orden de aparición. positions (índice posicional) tiene las posiciones codificadas
+        de cada término (ver _encode_positions).
+        """
+        term_ids: list[int] = []
+        for token in terms_freq:
+            if token not in self.term2id:
+                self.term2id[token] = len(self.term2id) + 1
+                self.id2term[self.term2id[token]] = token
+                self.dictionary_bytes += sys.getsizeof(token) + self.TERM_ENTRY_BYTES
+            term_ids.append(self.term2id[token])
+        doc_positions = None
+        if positions is not None:
+            doc_positions = [positions[token] for token in terms_freq]
+            self.chunk_bytes += sum(map(sys.getsizeof, doc_positions))
+        if isinstance(current_chunk_postings, PartialPostingBuffer):
+            current_chunk_postings.extend_doc(
+                doc_id, term_ids, terms_freq.values(), doc_positions
+            )
+            self.chunk_bytes += len(terms_freq) * PartialPostingBuffer.ESTIMATED_SIZE
+        else:
+            for i, (term_id, freq) in enumerate(zip(term_ids, terms_freq.values())):
+                term_positions = doc_positions[i] if doc_positions is not None else None
+                current_chunk_postings.append(
+                    PartialPosting(term_id, doc_id, freq, term_positions)
+                )
+            self.chunk_bytes += len(terms_freq) * PartialPosting.estimated_size()
+        self.doc_id_map[doc_id] = doc_name
+        # --- GUARDAR VECTOR DEL DOCUMENTO (en el índice directo en disco) ---
+        self._write_forward_doc(term_ids, terms_freq.values())
+
+    def _process_doc(self, doc_name: str, text: str) -> list[str]:
+        """
+        Extrae el texto (si el documento es .html) y lo tokeniza.
+        """
+        if doc_name.endswith(".html"):
+            text = self.text_extractor.extract(text)
+        return self.tokenizer.tokenizar(text)
+
+    def _flush_chunk(self, chunk) -> None:
+        """
+        Vuelca el bloque con _process_chunk, registra en las métricas su duración y tamaño y
+        guarda el checkpoint.
+        """
+        t_start = time.time()
+        self._process_chunk(chunk)
+        stats = self.chunk_stats[-1]
+        self.metrics.add_chunk(
+            stats["docs"],
+            stats["postings"],
+            os.path.getsize(self.chunks[-1]),
+            time.time() - t_start,
+        )
+        self._write_checkpoint()
+
+    def _process_chunk(
+        self, chunk: Union[list[PartialPosting], PartialPostingBuffer]
+    ) -> None:
         """
         Procesa un bloque (chunk) de documentos, construye el índice parcial y lo vuelca a disco.
         Devuelve el path al archivo de chunk generado.
         """
         # Ordenar postings por término y doc_id
-        chunk.sort(
-            key=lambda partial_posting: (
-                partial_posting.term_id,
-                partial_posting.doc_id,
+        if isinstance(chunk, PartialPostingBuffer):
+            chunk.sort()  # np.lexsort sobre las columnas
+        else:
+            chunk.sort(
+                key=lambda partial_posting: (
+                    partial_posting.term_id,
+                    partial_posting.doc_id,
+                )
             )
-        )
 
         # Crear PostingChunk y escribir en disco
         chunk_file_path = os.path.join(self.path_index, f"chunk_{len(self.chunks)}.bin")
         chunk_obj = PostingChunk(chunk, chunk_file_path)
         chunk_obj.write_to_disk()  # WriteBlockToDisk(block) de la diapositiva
         self.chunks.append(chunk_file_path)
+        self._record_chunk_stats(len(chunk))
+
+    def _record_chunk_stats(self, n_postings: int) -> None:
+        """
+        Registra la memoria estimada (y medida, si measure_memory) del bloque recién volcado
+        y reinicia los contadores del bloque.
+        """
+        stats = {
+            "docs": self.memory_usage,
+            "postings": n_postings,
+            "estimated_bytes": self.chunk_bytes + self.dictionary_bytes,
+        }
+        if self.measure_memory:
+            stats["measured_bytes"] = tracemalloc.get_traced_memory()[0]
+            print(
+                f"\nChunk {len(self.chunks) - 1}: {stats['docs']} docs, {stats['postings']} postings, "
+                f"estimado {stats['estimated_bytes'] / 2**20:.2f} MB, "
+                f"medido {stats['measured_bytes'] / 2**20:.2f} MB"
+            )
+        self.chunk_stats.append(stats)
+        self.memory_usage = 0
+        self.chunk_bytes = 0
 
     def _process_skip_list(self, posting_list, posting_offsets):
         """
@@ -159,6 +501,145 @@ class IndexadorBSBI(CollectionAnalyzerBase):
             skips.append((docid, byte_offset))
         return skips
 
+    def merge_chunks(self) -> None:
+        """
+        Mergea los chunks de self.chunks en el índice final según merge_mode y registra merge_time.
+        """
+        print("Iniciando merge de chunks...")
+        self.vocabulary = {}
+        t_merge_start = time.time()
+        chunk_paths = list(self.chunks)
+        original_chunks = set(chunk_paths)
+        self._disk_bytes = sum(os.path.getsize(path) for path in self.chunks)
+        self.peak_disk_bytes = self._disk_bytes
+        if self.max_fan_in is not None:
+            self._merge_levels(original_chunks)
+        if self.merge_mode == "buffered":
+            self._merge_chunks_buffered()
+        elif self.merge_mode == "runs":
+            self._merge_chunks_runs()
+        elif self.merge_mode == "partitioned":
+            self._merge_chunks_partitioned()
+        else:
+            self._merge_chunks()
+        postings_path = os.path.join(self.path_index, self.POSTINGS_FILENAME)
+        self._track_disk(os.path.getsize(postings_path))
+        if self.positional:
+            self._merge_positions(chunk_paths)
+        self._delete_consumed(self.chunks, original_chunks)
+        # Los chunks originales quedan en disco (ver index_collection y _remove_chunk_files)
+        self.chunks = chunk_paths
+        t_merge_end = time.time()
+        self.merge_time = t_merge_end - t_merge_start
+        print(f"Tiempo de merge: {self.merge_time:.2f} segundos")
+        print(f"Uso pico de disco en el merge: {self.peak_disk_bytes / 2**20:.2f} MB")
+
+    def _merge_positions(self, chunk_paths: list[str]) -> None:
+        """
+        Arma positions.bin concatenando, por término, las posiciones del .pos de cada chunk
+        original en orden de chunk (los chunks cubren rangos de doc_id crecientes, como en
+        _merge_chunks_runs), y agrega al vocabulario su puntero ("puntero_pos") y largo
+        ("bytes_pos"). Es una pasada aparte del merge de postings, así que sirve para cualquier
+        merge_mode y final_index.bin queda igual que sin posiciones.
+        """
+        positions_paths = [PostingChunk.positions_path(path) for path in chunk_paths]
+        # heapq.merge es estable: ante igual term_id respeta el orden de los chunks
+        entries = heapq.merge(
+            *[PostingChunk.iter_positions(path) for path in positions_paths],
+            key=itemgetter(0),
+        )
+        with open(
+            os.path.join(self.path_index, self.POSITIONS_FILENAME), "wb"
+        ) as positions_file:
+            for term_id, group in groupby(entries, key=itemgetter(0)):
+                self._write_term_positions(
+                    positions_file,
+                    self.id2term[term_id],
+                    b"".join(positions for _, positions in group),
+                )
+
+    def _merge_levels(self, original_chunks: set[str]) -> None:
+        """
+        Merge jerárquico con fan-in acotado: mientras haya más de max_fan_in archivos, los
+        agrupa de a max_fan_in consecutivos (así cada run sigue cubriendo un rango de doc_id
+        contiguo) y mergea cada grupo en un run intermedio con el mismo formato de chunk.
+        Los grupos de un nivel se mergean en paralelo (max_workers procesos) y los runs
+        intermedios que consume cada grupo se borran apenas termina. Mientras tanto se mide
+        cada DISK_POLL_SECONDS lo que ya ocupan los runs en escritura, así peak_disk_bytes
+        cuenta los que crecen a la vez.
+        """
+        level = 0
+        while len(self.chunks) > self.max_fan_in:
+            groups = [
+                self.chunks[i : i + self.max_fan_in]
+                for i in range(0, len(self.chunks), self.max_fan_in)
+            ]
+            outputs = [
+                os.path.join(self.path_index, f"run_{level}_{i}.bin")
+                for i in range(len(groups))
+            ]
+            print(f"Merge nivel {level}: {len(self.chunks)} -> {len(groups)} archivos")
+            for i, group in enumerate(groups):
+                if len(group) == 1:  # un grupo de un solo archivo pasa al nivel siguiente sin copiarse
+                    outputs[i] = group[0]
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {
+                    pool.submit(
+                        _merge_chunk_group, group, output, self.merge_block_size
+                    ): (group, output)
+                    for group, output in zip(groups, outputs)
+                    if len(group) > 1
+                }
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(
+                        pending,
+                        timeout=self.DISK_POLL_SECONDS,
+                        return_when=FIRST_COMPLETED,
+                    )
+                    # Antes de borrar entradas: los runs terminados y los que se
+                    # siguen escribiendo ya ocupan disco
+                    written = sum(_file_size(output) for _, output in futures.values())
+                    self.peak_disk_bytes = max(
+                        self.peak_disk_bytes, self._disk_bytes + written
+                    )
+                    for future in done:
+                        future.result()
+                        group, output = futures.pop(future)
+                        self._track_disk(os.path.getsize(output))
+                        self._delete_consumed(group, original_chunks)
+            self.chunks = outputs
+            level += 1
+
+    def _track_disk(self, added_bytes: int) -> None:
+        """
+        Suma bytes recién escritos al uso de disco actual y actualiza el pico.
+        """
+        self._disk_bytes += added_bytes
+        self.peak_disk_bytes = max(self.peak_disk_bytes, self._disk_bytes)
+
+    def _delete_consumed(self, paths: list[str], original_chunks: set[str]) -> None:
+        """
+        Borra los runs intermedios ya mergeados. Los chunk_N.bin originales no se tocan: el
+        checkpoint del merge los necesita para rehacerlo hasta que el índice está completo
+        (ver _remove_chunk_files).
+        """
+        for path in paths:
+            if path in original_chunks:
+                continue
+            self._disk_bytes -= os.path.getsize(path)
+            os.remove(path)
+
+    def _remove_chunk_files(self) -> None:
+        """
+        Borra los chunks originales y sus .pos (delete_chunks), una vez escrito el índice.
+        """
+        for path in self.chunks:
+            for chunk_path in (path, PostingChunk.positions_path(path)):
+                if os.path.exists(chunk_path):
+                    os.remove(chunk_path)
+        self.chunks = []
+
     def _merge_chunks(self) -> None:
         """
         Hace el merge de los chunks parciales para crear el índice final en disco, siguiendo el algoritmo multi-way merge según MAN08.
@@ -219,6 +700,179 @@ class IndexadorBSBI(CollectionAnalyzerBase):
         for chunk in chunk_objs:
             chunk.close()
 
+    def _merge_chunks_buffered(self) -> None:
+        """
+        Multi-way merge sobre PostingChunkReader: cada chunk se lee en bloques grandes y sus
+        postings (tuplas) se mezclan con heapq.merge, agrupando por term_id.
+        Genera el mismo final_index.bin y skips que _merge_chunks.
+        """
+        readers = [
+            PostingChunkReader(chunk_path, self.merge_block_size)
+            for chunk_path in self.chunks
+        ]
+        skips_dict: dict[str, list[tuple[int, int]]] = {}
+        with open(
+            os.path.join(self.path_index, self.POSTINGS_FILENAME), "wb"
+        ) as final_index_file:
+            offset = 0
+            for term_id, group in groupby(heapq.merge(*readers), key=itemgetter(0)):
+                doc_ids: list[int] = []
+                pairs = array("I")
+                for _, doc_id, freq in group:
+                    doc_ids.append(doc_id)
+                    pairs.append(doc_id)
+                    pairs.append(freq)
+                offset += self._write_term_postings(
+                    final_index_file,
+                    self.id2term[term_id],
+                    pairs.tobytes(),
+                    doc_ids,
+                    offset,
+                    skips_dict,
+                )
+        self._write_skip_lists(skips_dict)
+        for reader in readers:
+            reader.close()
+
+    def _merge_chunks_runs(self) -> None:
+        """
+        Merge por concatenación de corridas. Los chunks de BSBI cubren rangos de doc_id disjuntos
+        y crecientes (chunk 0, chunk 1, ...), así que la posting list final de un término es la
+        concatenación de su corrida en cada chunk, en orden de chunk. El heap solo ordena los
+        cursores por (term_id, chunk_id) y cada corrida se copia en bloque (bytes ya empaquetados).
+        Genera el mismo final_index.bin y skips que _merge_chunks.
+        """
+        readers = [
+            PostingChunkReader(chunk_path, self.merge_block_size)
+            for chunk_path in self.chunks
+        ]
+        skips_dict: dict[str, list[tuple[int, int]]] = {}
+        with open(
+            os.path.join(self.path_index, self.POSTINGS_FILENAME), "wb"
+        ) as final_index_file:
+            offset = 0
+            for term_id, term_readers in _iter_term_runs(readers):
+                data_parts: list[bytes] = []
+                doc_ids: list[int] = []
+                for reader in term_readers:
+                    data, run_doc_ids = reader.read_run()
+                    data_parts.append(data)
+                    doc_ids.extend(run_doc_ids)
+                offset += self._write_term_postings(
+                    final_index_file,
+                    self.id2term[term_id],
+                    b"".join(data_parts),
+                    doc_ids,
+                    offset,
+                    skips_dict,
+                )
+        self._write_skip_lists(skips_dict)
+        for reader in readers:
+            reader.close()
+
+    def _merge_chunks_partitioned(self) -> None:
+        """
+        Merge paralelo particionado por rangos de term_id. Cada proceso del pool mergea (por
+        concatenación de corridas) un rango [lo, hi) de todos los chunks en un segmento propio y
+        devuelve su porción de vocabulario y skips con offsets locales. Luego los segmentos se
+        concatenan en final_index.bin rebasando los punteros. Los rangos se eligen con una muestra
+        de term_ids para que cada proceso reciba una cantidad similar de postings.
+        Genera el mismo final_index.bin y skips que _merge_chunks.
+        """
+        bounds = self._partition_bounds(self.max_workers)
+        ranges = list(zip(bounds[:-1], bounds[1:]))
+        segment_paths = [
+            os.path.join(self.path_index, f"segment_{i}.bin") for i in range(len(ranges))
+        ]
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(
+                pool.map(
+                    _merge_term_range,
+                    [self.chunks] * len(ranges),
+                    ranges,
+                    segment_paths,
+                    [self.merge_block_size] * len(ranges),
+                )
+            )
+
+        segments_bytes = sum(os.path.getsize(path) for path in segment_paths)
+        self._track_disk(segments_bytes)
+
+        skips_dict: dict[str, list[tuple[int, int]]] = {}
+        with open(
+            os.path.join(self.path_index, self.POSTINGS_FILENAME), "wb"
+        ) as final_index_file:
+            base = 0
+            for segment_path, entries in zip(segment_paths, results):
+                for term_id, local_offset, df, skips in entries:
+                    term = self.id2term[term_id]
+                    self.vocabulary[term] = {"puntero": base + local_offset, "df": df}
+                    if skips:
+                        skips_dict[term] = [(doc_id, base + off) for doc_id, off in skips]
+                with open(segment_path, "rb") as segment:
+                    shutil.copyfileobj(segment, final_index_file)
+                base += os.path.getsize(segment_path)
+                os.remove(segment_path)
+        self._disk_bytes -= segments_bytes  # merge_chunks suma luego el final_index.bin
+        self._write_skip_lists(skips_dict)
+
+    def _partition_bounds(self, n_parts: int) -> list[int]:
+        """
+        Calcula los límites [b0, b1, ..., bn] de los rangos de term_id del merge particionado.
+        Muestrea term_ids de todos los chunks con el mismo paso (la muestra es proporcional a la
+        cantidad de postings) y corta en sus cuantiles.
+        """
+        paths = [path for path in self.chunks if os.path.getsize(path) > 0]
+        total = sum(os.path.getsize(path) for path in paths) // PartialPosting.SIZE
+        step = max(1, total // self.PARTITION_SAMPLES)
+        samples = []
+        for path in paths:
+            records = np.memmap(path, dtype=PartialPostingBuffer.DTYPE, mode="r")
+            samples.append(np.array(records["term_id"][::step]))
+        last = len(self.id2term) + 1  # los term_ids van de 1 a len(id2term)
+        if not samples:
+            return [0, last]
+        sample = np.sort(np.concatenate(samples))
+        cuts = [int(sample[(len(sample) * i) // n_parts]) for i in range(1, n_parts)]
+        bounds = [0]
+        for cut in cuts:
+            if cut > bounds[-1]:
+                bounds.append(cut)
+        bounds.append(last)
+        return bounds
+
+    def _write_term_postings(
+        self,
+        final_index_file,
+        term: str,
+        data: bytes,
+        doc_ids: list[int],
+        offset: int,
+        skips_dict: dict[str, list[tuple[int, int]]],
+    ) -> int:
+        """
+        Escribe la posting list completa de un término (pares doc_id/freq ya empaquetados en
+        POSTING_STRUCT_FORMAT) en una sola llamada, actualiza el vocabulario y skips_dict.
+        Devuelve la cantidad de bytes escritos.
+        """
+        final_index_file.write(data)
+        df = len(doc_ids)
+        self.vocabulary[term] = {"puntero": offset, "df": df}
+        skips = _skip_entries(doc_ids, offset)
+        if skips:
+            skips_dict[term] = skips
+        return df * self.POSTING_SIZE
+
+    def _write_term_positions(self, positions_file, term: str, data: bytes) -> None:
+        """
+        Agrega al final de positions_file las posiciones de un término (ya codificadas) y
+        guarda su puntero y largo en el vocabulario.
+        """
+        self.vocabulary[term].update(
+            {"puntero_pos": positions_file.tell(), "bytes_pos": len(data)}
+        )
+        positions_file.write(data)
+
     def _write_posting_and_skips(
         self,
         final_index_file,
@@ -253,30 +907,80 @@ class IndexadorBSBI(CollectionAnalyzerBase):
 
     def _write_vocabulary(self) -> None:
         """
-        Persiste el vocabulario en disco (por ejemplo, usando pickle).
+        Persiste el vocabulario en disco como lexicon binario (ver Lexicon).
         """
         vocab_path = os.path.join(self.path_index, self.VOCABULARY_FILENAME)
-        with open(vocab_path, "wb") as f:
-            print(f"Escribiendo vocabulario en {vocab_path}")
-            pickle.dump(self.vocabulary, f)
+        print(f"Escribiendo vocabulario en {vocab_path}")
+        Lexicon.write(vocab_path, self.vocabulary)
+        self._kgram_index = None
+        if self.kgrams:
+            KGramIndex.write(self.path_index, sorted(self.vocabulary))
+        legacy_path = os.path.join(self.path_index, self.LEGACY_VOCABULARY_FILENAME)
+        if os.path.exists(legacy_path):
+            os.remove(legacy_path)
 
     def _load_vocabulary(self) -> None:
         """
-        Carga el vocabulario desde disco a memoria.
+        Abre el lexicon mapeado en memoria (no se carga nada hasta buscar un término). Los
+        índices construidos antes del lexicon se leen del vocabulary.pkl.
         """
         vocab_path = os.path.join(self.path_index, self.VOCABULARY_FILENAME)
+        legacy_path = os.path.join(self.path_index, self.LEGACY_VOCABULARY_FILENAME)
         if os.path.exists(vocab_path):
-            with open(vocab_path, "rb") as f:
+            self.vocabulary = Lexicon(vocab_path)
+        elif os.path.exists(legacy_path):
+            with open(legacy_path, "rb") as f:
                 self.vocabulary = pickle.load(f)
 
-    def get_vocabulary(self) -> Dict[str, Dict[str, int]]:
+    def get_vocabulary(self) -> Union[Dict[str, Dict[str, int]], Lexicon]:
         """
-        Devuelve el vocabulario cargado en memoria.
+        Devuelve el vocabulario: un Lexicon (se usa como dict término -> entrada) o, durante la
+        construcción, el dict en memoria.
         """
         if not self.vocabulary:
             self._load_vocabulary()
         return self.vocabulary
 
+    def get_kgram_index(self) -> Optional[KGramIndex]:
+        """
+        Devuelve el índice de k-gramas del vocabulario, o None si el índice no lo tiene.
+        """
+        if self._kgram_index is None and KGramIndex.exists(self.path_index):
+            self._kgram_index = KGramIndex(self.path_index)
+        return self._kgram_index
+
+    def expand_wildcard(self, pattern: str) -> list[tuple[str, int]]:
+        """
+        Devuelve [(término, df), ...] de los términos del vocabulario que matchean pattern,
+        donde '*' es cualquier secuencia de caracteres, en orden de término. La parte fija
+        inicial del patrón se resuelve como un rango contiguo del Lexicon (comput* no recorre
+        nada más); los comodines al principio o en el medio se restringen con el índice de
+        k-gramas si existe (si no, se recorre el rango). Los candidatos se verifican contra el
+        patrón, porque los k-gramas dan falsos positivos.
+        """
+        vocabulary = self.get_vocabulary()
+        if not isinstance(vocabulary, Lexicon):  # vocabulary.pkl viejo: recorrerlo entero
+            return sorted(
+                (term, entry["df"])
+                for term, entry in vocabulary.items()
+                if fnmatchcase(term, pattern)
+            )
+        start, end = vocabulary.prefix_range(pattern.split("*", 1)[0])
+        ordinals = None
+        if "*" in pattern.rstrip("*"):
+            kgram_index = self.get_kgram_index()
+            if kgram_index is not None:
+                ordinals = kgram_index.candidates(pattern)
+        if ordinals is None:
+            ordinals = np.arange(start, end)
+        else:
+            ordinals = ordinals[(ordinals >= start) & (ordinals < end)]
+        terms = vocabulary.terms_at(ordinals)
+        dfs = vocabulary.entries["df"][ordinals].tolist()
+        return [
+            (term, df) for term, df in zip(terms, dfs) if fnmatchcase(term, pattern)
+        ]
+
     def _load_skips(self) -> None:
         skips_path = os.path.join(self.path_index, self.SKIPS_FILENAME)
         if os.path.exists(skips_path):
@@ -288,6 +992,35 @@ class IndexadorBSBI(CollectionAnalyzerBase):
             self._load_skips()
         return self.skips if hasattr(self, "skips") else {}
 
+    def get_positions(self, term: str) -> list[tuple[int, list[int]]]:
+        """
+        Devuelve [(doc_id, [posiciones]), ...] del término en orden de doc_id. Lee su posting
+        list (para las frecuencias) y su bloque de positions.bin; las consultas no posicionales
+        nunca abren positions.bin. Requiere un índice construido con positional=True.
+        """
+        entry = self.get_vocabulary().get(term)
+        if entry is None:
+            return []
+        if "puntero_pos" not in entry:
+            raise ValueError(
+                f"El índice de {self.path_index} no tiene posiciones (indexar con positional=True)."
+            )
+        with open(os.path.join(self.path_index, self.POSTINGS_FILENAME), "rb") as f:
+            f.seek(entry["puntero"])
+            pairs = np.frombuffer(
+                f.read(entry["df"] * self.POSTING_SIZE),
+                dtype=PostingChunkReader.PAIR_DTYPE,
+            )
+        with open(os.path.join(self.path_index, self.POSITIONS_FILENAME), "rb") as f:
+            f.seek(entry["puntero_pos"])
+            values = vbyte_decode_list(f.read(entry["bytes_pos"]))
+        result: list[tuple[int, list[int]]] = []
+        start = 0
+        for doc_id, freq in pairs.tolist():
+            result.append((doc_id, restore_from_dgaps(values[start : start + freq])))
+            start += freq
+        return result
+
     def index_size_on_disk(self) -> Dict[str, int]:
         """
         Devuelve el tamaño en bytes del índice en disco (postings y vocabulario).
@@ -311,35 +1044,162 @@ class IndexadorBSBI(CollectionAnalyzerBase):
             self._load_vocabulary()
         return [v["df"] for v in self.vocabulary.values()]
 
-    def _write_metadata(self) -> None:
+    def _write_metadata(self, sources: Optional[list] = None) -> None:
         """
-        Persiste el doc_id_map en disco.
+        Persiste el doc_id_map como tabla de documentos (ver DocTable), que después reemplaza
+        al dict en memoria. Las columnas tokens y norm se calculan del índice directo; bytes
+        sale de los documentos indexados o, si se pasan, de las tablas de documentos sources
+        de las que proviene el doc_id_map (merge de segmentos y compactación).
         """
         metadata_path = os.path.join(self.path_index, self.METADATA_FILENAME)
-        with open(metadata_path, "wb") as f:
-            print(f"Escribiendo metadata en {metadata_path}")
-            pickle.dump(self.doc_id_map, f)
+        print(f"Escribiendo tabla de documentos en {metadata_path}")
+        first_doc_id, n_slots = DocTable.slot_range(self.doc_id_map)
+        columns = self._doc_columns(first_doc_id, n_slots)
+        if sources is not None:
+            doc_bytes = _gather_column(sources, "bytes", first_doc_id, n_slots)
+        elif first_doc_id == self.first_doc_id + 1 and len(self._doc_bytes) == n_slots:
+            doc_bytes = np.frombuffer(self._doc_bytes, dtype=np.uint64)
+        else:
+            doc_bytes = None
+        if doc_bytes is not None:
+            columns["bytes"] = doc_bytes
+        DocTable.write(metadata_path, self.doc_id_map, columns)
+        self.doc_id_map = DocTable(metadata_path)
+        self._doc_bytes = array("Q")
+        legacy_path = os.path.join(self.path_index, self.LEGACY_METADATA_FILENAME)
+        if os.path.exists(legacy_path):
+            os.remove(legacy_path)
+
+    def _doc_columns(self, first_doc_id: int, n_slots: int) -> dict[str, np.ndarray]:
+        """
+        Columnas tokens (suma de las frecuencias) y norm (norma del vector de frecuencias, la
+        que usa el modelo vectorial) de los doc_ids first_doc_id .. first_doc_id + n_slots - 1,
+        calculadas del índice directo. Vacío en índices viejos sin índice directo.
+        """
+        if n_slots == 0 or not self._load_forward_index():
+            return {}
+        offsets, records, _, _ = self._forward
+        freqs = records["freq"].astype(np.uint64)
+        # Sumas acumuladas: la suma de un documento es la resta entre sus dos extremos
+        sums = np.zeros(len(freqs) + 1, dtype=np.uint64)
+        np.cumsum(freqs, out=sums[1:])
+        squares = np.zeros(len(freqs) + 1, dtype=np.uint64)
+        np.cumsum(freqs * freqs, out=squares[1:])
+        # Los registros del doc_id offsets[0] + i van de bounds[i] a bounds[i + 1]
+        bounds = offsets[1:].astype(np.int64)
+        docs = np.arange(n_slots) + (first_doc_id - int(offsets[0]))
+        valid = (docs >= 0) & (docs + 1 < len(bounds))
+        starts, ends = bounds[docs[valid]], bounds[docs[valid] + 1]
+        tokens = np.zeros(n_slots, dtype=np.uint64)
+        tokens[valid] = sums[ends] - sums[starts]
+        norms = np.zeros(n_slots, dtype=np.float64)
+        norms[valid] = np.sqrt((squares[ends] - squares[starts]).astype(np.float64))
+        return {"tokens": tokens, "norm": norms}
 
     def _load_metadata(self) -> None:
         """
-        Carga el doc_id_map desde disco a memoria.
+        Abre la tabla de documentos mapeada en memoria. Los índices construidos antes de la
+        tabla se leen del metadata.pkl.
         """
         metadata_path = os.path.join(self.path_index, self.METADATA_FILENAME)
+        legacy_path = os.path.join(self.path_index, self.LEGACY_METADATA_FILENAME)
         if os.path.exists(metadata_path):
-            with open(metadata_path, "rb") as f:
+            self.doc_id_map = DocTable(metadata_path)
+        elif os.path.exists(legacy_path):
+            with open(legacy_path, "rb") as f:
                 self.doc_id_map = pickle.load(f)
 
-    def get_doc_id_map(self) -> dict[int, str]:
+    def _write_manifest(self) -> None:
+        """
+        Escribe manifest.json: la versión de formato y el tamaño de cada archivo del índice y un
+        resumen (método, documentos, términos, rango de doc_ids, si tiene posiciones y
+        k-gramas), para abrir el índice sin cargar ninguna estructura (ver open_index). Se
+        reescribe cada vez que cambia un archivo del índice.
+        """
+        first_doc_id, n_slots = DocTable.slot_range(self.get_doc_id_map())
+        files = {
+            filename: {
+                "version": version,
+                "bytes": os.path.getsize(os.path.join(self.path_index, filename)),
+            }
+            for filename, version in self.FILE_VERSIONS.items()
+            if os.path.exists(os.path.join(self.path_index, filename))
+        }
+        manifest = {
+            "version": self.MANIFEST_VERSION,
+            "method": self.INDEXING_METHOD,
+            "docs": len(self.get_doc_id_map()),
+            "terms": len(self.get_vocabulary()),
+            "first_doc_id": first_doc_id if n_slots else None,
+            "last_doc_id": first_doc_id + n_slots - 1 if n_slots else None,
+            "positional": self.POSITIONS_FILENAME in files,
+            "kgrams": KGramIndex.LEXICON_FILENAME in files,
+            "files": files,
+        }
+        manifest_path = os.path.join(self.path_index, self.MANIFEST_FILENAME)
+        with open(manifest_path + ".tmp", "w", encoding="utf8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(manifest_path + ".tmp", manifest_path)
+        self._manifest = manifest
+
+    def missing_files(self) -> list[str]:
         """
-        Devuelve el doc_id_map cargado en memoria.
+        Archivos de un índice terminado que faltan en path_index ([] si está completo): el
+        manifest, el vocabulario, la tabla de documentos y las postings. Los índices
+        anteriores al manifest se reconocen por vocabulary.pkl y metadata.pkl.
+        """
+
+        def exists(filename: str) -> bool:
+            return os.path.exists(os.path.join(self.path_index, filename))
+
+        if exists(self.LEGACY_VOCABULARY_FILENAME) and exists(
+            self.LEGACY_METADATA_FILENAME
+        ):
+            required = [self.POSTINGS_FILENAME]
+        else:
+            required = [
+                self.MANIFEST_FILENAME,
+                self.VOCABULARY_FILENAME,
+                self.METADATA_FILENAME,
+                self.POSTINGS_FILENAME,
+            ]
+        return [filename for filename in required if not exists(filename)]
+
+    def get_manifest(self) -> dict:
+        """
+        Devuelve manifest.json ({} en índices construidos antes del manifest).
+        """
+        if self._manifest is None:
+            manifest_path = os.path.join(self.path_index, self.MANIFEST_FILENAME)
+            self._manifest = {}
+            if os.path.exists(manifest_path):
+                with open(manifest_path, encoding="utf8") as f:
+                    self._manifest = json.load(f)
+        return self._manifest
+
+    def get_doc_id_map(self) -> Union[Dict[int, str], DocTable]:
+        """
+        Devuelve el doc_id_map: una DocTable (se usa como dict doc_id -> nombre) o, durante la
+        construcción, el dict en memoria.
         """
         if not self.doc_id_map:
             self._load_metadata()
         return self.doc_id_map
 
+    def get_doc_norm(self, doc_id: int) -> Optional[float]:
+        """
+        Norma del vector de frecuencias del documento (columna norm de la tabla de
+        documentos), o None si el índice no la tiene.
+        """
+        doc_id_map = self.get_doc_id_map()
+        if isinstance(doc_id_map, DocTable):
+            return doc_id_map.get_value("norm", doc_id)
+        return None
+
     def _write_doc_vectors(self):
         """
-        Guarda los vectores de documentos en un archivo pickle.
+        Guarda los vectores de documentos en un archivo pickle (formato viejo, solo lo usa la
+        compactación de índices que todavía tienen doc_vectors.pkl).
         """
         vectors_path = os.path.join(self.path_index, self.DOC_VECTORS_FILENAME)
         with open(vectors_path, "wb") as f:
@@ -358,14 +1218,646 @@ class IndexadorBSBI(CollectionAnalyzerBase):
     def get_doc_terms(self, docid: int) -> Counter:
         """
         Devuelve un Counter con los términos y frecuencias de un documento dado.
-        Usa los vectores precalculados si están disponibles y activados.
+        Lee solo los registros del documento en el forward index mapeado en memoria; los
+        índices viejos usan los vectores de doc_vectors.pkl.
         """
+        if self._load_forward_index():
+            offsets, records, table_starts, tables = self._forward
+            i = docid - int(offsets[0])
+            if i < 0 or i + 2 >= len(offsets):
+                return Counter()
+            doc_records = records[int(offsets[i + 1]) : int(offsets[i + 2])]
+            terms = tables[bisect_right(table_starts, docid) - 1]
+            return Counter(
+                {
+                    terms[term_id]: freq
+                    for term_id, freq in zip(
+                        doc_records["term_id"].tolist(), doc_records["freq"].tolist()
+                    )
+                }
+            )
         self._load_doc_vectors()
         if self._doc_vectors is not None:
             return self._doc_vectors.get(docid, Counter())
         else:
             return Counter()
 
+    # --- Índice directo (forward index) en disco ---
+
+    def _open_forward_index(self, resume: bool = False) -> None:
+        """
+        Abre los archivos del índice directo, que se escribe documento a documento durante el
+        indexado (en vez de acumular un Counter por documento en memoria):
+        - forward_index.bin: pares (term_id, freq) uint32 de cada documento, consecutivos.
+        - forward_offsets.bin: uint64 [primer doc_id, 0, fin_doc_1, fin_doc_2, ...] en pares.
+        - forward_terms.pkl: tablas (primer doc_id, [término por term_id]) en secuencia; BSBI
+          escribe una sola tabla global y SPIMI una por bloque (sus term_ids son locales).
+        Con resume se continúan los archivos (ya truncados al checkpoint por _load_checkpoint).
+        """
+        mode = "ab" if resume else "wb"
+        self._forward_file = open(
+            os.path.join(self.path_index, self.FORWARD_INDEX_FILENAME), mode
+        )
+        self._forward_terms_file = open(
+            os.path.join(self.path_index, self.FORWARD_TERMS_FILENAME), mode
+        )
+        offsets_path = os.path.join(self.path_index, self.FORWARD_OFFSETS_FILENAME)
+        self._forward_offsets = array("Q")
+        if resume:
+            with open(offsets_path, "rb") as f:
+                self._forward_offsets.frombytes(f.read())
+        else:
+            self._forward_offsets.extend((self.first_doc_id + 1, 0))
+            open(offsets_path, "wb").close()
+        # Offsets ya escritos en forward_offsets.bin (el resto se agrega en _save_forward_offsets)
+        self._forward_offsets_saved: int = len(self._forward_offsets) if resume else 0
+
+    def _save_forward_offsets(self) -> None:
+        offsets_path = os.path.join(self.path_index, self.FORWARD_OFFSETS_FILENAME)
+        with open(offsets_path, "ab") as f:
+            self._forward_offsets[self._forward_offsets_saved :].tofile(f)
+        self._forward_offsets_saved = len(self._forward_offsets)
+
+    def _write_forward_doc(self, term_ids: list[int], freqs) -> None:
+        """
+        Agrega al índice directo los pares (term_id, freq) del siguiente documento.
+        """
+        record = array("I", bytes(self.POSTING_SIZE * len(term_ids)))
+        record[0::2] = array("I", term_ids)
+        record[1::2] = array("I", freqs)
+        record.tofile(self._forward_file)
+        self._forward_offsets.append(self._forward_offsets[-1] + len(term_ids))
+
+    def _write_forward_term_table(self, first_doc_id: int, terms: list) -> None:
+        pickle.dump((first_doc_id, terms), self._forward_terms_file)
+
+    def _close_forward_index(self) -> None:
+        if self.id2term:
+            terms = [None] + [self.id2term[i] for i in range(1, len(self.id2term) + 1)]
+            self._write_forward_term_table(self.first_doc_id + 1, terms)
+        self._forward_file.close()
+        self._forward_terms_file.close()
+        self._save_forward_offsets()
+
+    def _load_forward_index(self) -> bool:
+        """
+        Mapea en memoria el índice directo (solo se leen las páginas de los documentos pedidos).
+        Devuelve False si el índice no tiene forward index (índices viejos con doc_vectors.pkl).
+        """
+        if self._forward is None:
+            offsets_path = os.path.join(self.path_index, self.FORWARD_OFFSETS_FILENAME)
+            if not os.path.exists(offsets_path):
+                return False
+            offsets = np.memmap(offsets_path, dtype=np.uint64, mode="r")
+            forward_path = os.path.join(self.path_index, self.FORWARD_INDEX_FILENAME)
+            if os.path.getsize(forward_path) > 0:
+                records = np.memmap(forward_path, dtype=self.FORWARD_DTYPE, mode="r")
+            else:
+                records = np.zeros(0, dtype=self.FORWARD_DTYPE)
+            table_starts: list[int] = []
+            tables: list[list] = []
+            terms_path = os.path.join(self.path_index, self.FORWARD_TERMS_FILENAME)
+            with open(terms_path, "rb") as f:
+                while True:
+                    try:
+                        first_doc_id, terms = pickle.load(f)
+                    except EOFError:
+                        break
+                    table_starts.append(first_doc_id)
+                    tables.append(terms)
+            self._forward = (offsets, records, table_starts, tables)
+        return True
+
+    def _merge_forward_indexes(self, sources: list["IndexadorBSBI"]) -> None:
+        """
+        Concatena los índices directos de segmentos con rangos de doc_id consecutivos. Los
+        term_ids quedan relativos a su tabla, así que las tablas se copian sin remapear. Un
+        segmento solo aporta los doc_ids anteriores al primero del segmento siguiente (los
+        posteriores, si los hay, son documentos compactados).
+        """
+        source_offsets = [
+            np.fromfile(
+                os.path.join(source.path_index, self.FORWARD_OFFSETS_FILENAME),
+                dtype=np.uint64,
+            )
+            for source in sources
+        ]
+        firsts = [int(offsets[0]) for offsets in source_offsets]
+        self._forward_offsets = array("Q", [firsts[0], 0])
+        forward_path = os.path.join(self.path_index, self.FORWARD_INDEX_FILENAME)
+        terms_path = os.path.join(self.path_index, self.FORWARD_TERMS_FILENAME)
+        with open(forward_path, "wb") as forward_file, open(
+            terms_path, "wb"
+        ) as terms_file:
+            for i, source in enumerate(sources):
+                offsets = source_offsets[i][1:]
+                if i + 1 < len(sources):
+                    offsets = offsets[: firsts[i + 1] - firsts[i] + 1]
+                base = self._forward_offsets[-1]
+                self._forward_offsets.extend((offsets[1:] + base).tolist())
+                with open(
+                    os.path.join(source.path_index, self.FORWARD_INDEX_FILENAME), "rb"
+                ) as src:
+                    forward_file.write(src.read(int(offsets[-1]) * self.POSTING_SIZE))
+                with open(
+                    os.path.join(source.path_index, self.FORWARD_TERMS_FILENAME), "rb"
+                ) as src:
+                    shutil.copyfileobj(src, terms_file)
+        offsets_path = os.path.join(self.path_index, self.FORWARD_OFFSETS_FILENAME)
+        with open(offsets_path, "wb") as f:
+            self._forward_offsets.tofile(f)
+
+    # --- Checkpoint y reanudación del indexado ---
+
+    def has_checkpoint(self) -> bool:
+        """
+        Indica si path_index tiene un indexado interrumpido que se puede reanudar.
+        """
+        return os.path.exists(os.path.join(self.path_index, self.CHECKPOINT_FILENAME))
+
+    def _write_checkpoint(self, phase: str = "invert") -> None:
+        """
+        Guarda el estado del indexado después de un volcado, cuando todos los documentos
+        procesados están en chunks en disco. El manifest (checkpoint.pkl) registra el doc_id
+        más alto, la cantidad de términos, los chunks completos y el largo de cada archivo
+        que se escribe en modo append (log de documentos e índice directo); se escribe en un
+        temporal y se reemplaza con os.replace, así que siempre queda el anterior o el nuevo.
+        Los nombres y tamaños de los documentos y los términos nuevos (en orden de term_id) se
+        agregan a checkpoint_docs.pkl (una entrada por volcado) para no reescribir todo
+        term2id ni todos los documentos en cada checkpoint.
+        phase es "invert" mientras se recorre la colección y "merge" una vez cerrado el índice
+        directo, cuando ya solo falta mergear los chunks (ver index_collection).
+        """
+        if not self._forward_file.closed:
+            self._forward_file.flush()
+            self._forward_terms_file.flush()
+            self._save_forward_offsets()
+        docs_path = os.path.join(self.path_index, self.CHECKPOINT_DOCS_FILENAME)
+        last_doc_id = self.first_doc_id + len(self.doc_id_map)
+        doc_names = [
+            self.doc_id_map[doc_id]
+            for doc_id in range(self._checkpoint_doc_id + 1, last_doc_id + 1)
+        ]
+        # _doc_bytes[i] es el tamaño del doc_id first_doc_id + 1 + i
+        start = self._checkpoint_doc_id - self.first_doc_id
+        doc_bytes = self._doc_bytes[start : last_doc_id - self.first_doc_id]
+        # Los term_ids se asignan en orden (ver _add_doc): los nuevos son los siguientes
+        n_terms = len(self.term2id)
+        new_terms = [
+            self.id2term[term_id]
+            for term_id in range(self._checkpoint_terms + 1, n_terms + 1)
+        ]
+        with open(docs_path, "ab") as f:
+            pickle.dump((doc_names, doc_bytes, new_terms), f)
+            docs_bytes = f.tell()
+        self._checkpoint_doc_id = last_doc_id
+        self._checkpoint_terms = n_terms
+        manifest = {
+            "method": self.INDEXING_METHOD,
+            "phase": phase,
+            "first_doc_id": self.first_doc_id,
+            "last_doc_id": last_doc_id,
+            "docs_bytes": docs_bytes,
+            "n_terms": n_terms,
+            "dictionary_bytes": self.dictionary_bytes,
+            "chunks": [os.path.basename(path) for path in self.chunks],
+            "chunk_stats": self.chunk_stats,
+            "metrics": self.metrics.state(),
+            "forward_bytes": os.path.getsize(self._forward_file.name),
+            "forward_terms_bytes": os.path.getsize(self._forward_terms_file.name),
+        }
+        checkpoint_path = os.path.join(self.path_index, self.CHECKPOINT_FILENAME)
+        with open(checkpoint_path + ".tmp", "wb") as f:
+            pickle.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(checkpoint_path + ".tmp", checkpoint_path)
+
+    def _load_checkpoint(self) -> bool:
+        """
+        Restaura el estado del último checkpoint (documentos procesados, term2id, chunks y
+        métricas) y trunca los archivos append a su largo en el checkpoint, descartando lo
+        escrito después. Los documentos procesados se agregan a known_docs para no volver a
+        leerlos.
+        Devuelve False si no hay checkpoint o si falta alguno de sus chunks (un merge con
+        delete_chunks interrumpido); en ese caso el indexado empieza de cero.
+        """
+        checkpoint_path = os.path.join(self.path_index, self.CHECKPOINT_FILENAME)
+        if not os.path.exists(checkpoint_path):
+            return False
+        with open(checkpoint_path, "rb") as f:
+            manifest = pickle.load(f)
+        if (
+            manifest["method"] != self.INDEXING_METHOD
+            or manifest["first_doc_id"] != self.first_doc_id
+        ):
+            raise ValueError(
+                f"El checkpoint de {self.path_index} no corresponde a este indexador "
+                f"({manifest['method']}, primer doc_id {manifest['first_doc_id'] + 1})."
+            )
+        chunks = [os.path.join(self.path_index, name) for name in manifest["chunks"]]
+        if self.positional:
+            chunks += [PostingChunk.positions_path(path) for path in chunks]
+        missing = [path for path in chunks if not os.path.exists(path)]
+        if missing:
+            print(
+                f"El checkpoint de {self.path_index} no se puede reanudar: faltan "
+                f"{len(missing)} de sus chunks ({os.path.basename(missing[0])}, ...)."
+            )
+            return False
+
+        doc_names: list[str] = []
+        terms: list[str] = []
+        self._doc_bytes = array("Q")
+        docs_path = os.path.join(self.path_index, self.CHECKPOINT_DOCS_FILENAME)
+        with open(docs_path, "r+b") as f:
+            while f.tell() < manifest["docs_bytes"]:
+                names, doc_bytes, new_terms = pickle.load(f)
+                doc_names.extend(names)
+                self._doc_bytes.extend(doc_bytes)
+                terms.extend(new_terms)
+            f.truncate(manifest["docs_bytes"])
+        self.doc_id_map = dict(enumerate(doc_names, start=self.first_doc_id + 1))
+        self.known_docs = self.known_docs | set(doc_names)
+        self._checkpoint_doc_id = manifest["last_doc_id"]
+
+        self.id2term = dict(enumerate(terms[: manifest["n_terms"]], start=1))
+        self.term2id = {term: term_id for term_id, term in self.id2term.items()}
+        self._checkpoint_terms = len(self.term2id)
+        self._checkpoint_phase = manifest["phase"]
+        self.dictionary_bytes = manifest["dictionary_bytes"]
+        self.chunks = [os.path.join(self.path_index, name) for name in manifest["chunks"]]
+        self.chunk_stats = manifest["chunk_stats"]
+        self.metrics.restore(manifest["metrics"])
+
+        for filename, size in (
+            (self.FORWARD_INDEX_FILENAME, manifest["forward_bytes"]),
+            (self.FORWARD_TERMS_FILENAME, manifest["forward_terms_bytes"]),
+            # [primer doc_id, 0] + un fin por documento
+            (self.FORWARD_OFFSETS_FILENAME, (len(doc_names) + 2) * 8),
+        ):
+            os.truncate(os.path.join(self.path_index, filename), size)
+        return True
+
+    def _remove_checkpoint(self) -> None:
+        for filename in (self.CHECKPOINT_FILENAME, self.CHECKPOINT_DOCS_FILENAME):
+            path = os.path.join(self.path_index, filename)
+            if os.path.exists(path):
+                os.remove(path)
+
+    # --- Indexado incremental por segmentos ---
+
+    def _new_segment(self, path_index: str) -> "IndexadorBSBI":
+        """
+        Crea un indexador con la misma configuración para el segmento en path_index.
+        Los segmentos son inmutables, así que sus chunks se borran al terminar el merge.
+        """
+        return IndexadorBSBI(
+            self.tokenizer,
+            memory_limit=self.memory_limit,
+            path_index=path_index,
+            max_workers=self.max_workers,
+            memory_limit_mb=self.memory_limit_mb,
+            array_buffer=self.array_buffer,
+            merge_mode=self.merge_mode,
+            merge_block_size=self.merge_block_size,
+            max_fan_in=self.max_fan_in,
+            delete_chunks=True,
+            text_extractor=self.text_extractor,
+            progress_interval=self.progress_interval,
+            positional=self.positional,
+            kgrams=self.kgrams,
+        )
+
+    def _load_segment_registry(self) -> dict:
+        """
+        Carga segments.pkl: {"next_id": int, "segments": [{"name", "level", "docs"}, ...]}
+        con los segmentos en orden de doc_id (el índice base de path_index no figura).
+        """
+        registry_path = os.path.join(self.path_index, self.SEGMENTS_FILENAME)
+        if os.path.exists(registry_path):
+            with open(registry_path, "rb") as f:
+                return pickle.load(f)
+        return {"next_id": 0, "segments": []}
+
+    def _write_segment_registry(self, registry: dict) -> None:
+        registry_path = os.path.join(self.path_index, self.SEGMENTS_FILENAME)
+        with open(registry_path, "wb") as f:
+            pickle.dump(registry, f)
+        self._write_manifest()
+
+    def _segment_path(self, name: str) -> str:
+        return os.path.join(self.path_index, self.SEGMENTS_DIRNAME, name)
+
+    def get_segments(self) -> list["IndexadorBSBI"]:
+        """
+        Devuelve los indexadores de los segmentos incrementales, en orden de doc_id.
+        """
+        if self._segments is None:
+            registry = self._load_segment_registry()
+            self._segments = [
+                self._new_segment(self._segment_path(segment["name"]))
+                for segment in registry["segments"]
+            ]
+        return self._segments
+
+    def add_documents(self, docs_path: Union[str, CorpusReader]) -> int:
+        """
+        Indexado incremental: indexa en un segmento nuevo (segments/seg_N) solo los documentos
+        de docs_path que todavía no están en el índice, con doc_ids a continuación de los
+        existentes, y aplica la política de merge logarítmico (_merge_segments_log).
+        El costo es proporcional a los documentos nuevos y no a la colección.
+        Devuelve la cantidad de documentos agregados.
+        """
+        registry = self._load_segment_registry()
+        known_docs: set[str] = set()
+        last_doc_id = 0
+        tombstones = self.get_tombstones()
+        for indexer in [self] + self.get_segments():
+            doc_id_map = indexer.get_doc_id_map()
+            # Un documento borrado que sigue en la colección se vuelve a indexar (actualización)
+            known_docs.update(
+                doc_name
+                for doc_id, doc_name in doc_id_map.items()
+                if doc_id >= len(tombstones) or not tombstones[doc_id]
+            )
+            if doc_id_map:
+                last_doc_id = max(last_doc_id, max(doc_id_map))
+
+        name = f"seg_{registry['next_id']}"
+        segment = self._new_segment(self._segment_path(name))
+        segment.first_doc_id = last_doc_id
+        segment.known_docs = known_docs
+        reader = open_corpus(docs_path)
+        if next(reader.docs(exclude=known_docs), None) is None:
+            return 0
+        segment.index_collection(reader)
+        n_docs = len(segment.doc_id_map)
+
+        registry["next_id"] += 1
+        registry["segments"].append({"name": name, "level": 0, "docs": n_docs})
+        stale = self._merge_segments_log(registry)
+        self._write_segment_registry(registry)
+        # Los segmentos mergeados se borran recién cuando el registro ya no los referencia
+        for stale_name in stale:
+            shutil.rmtree(self._segment_path(stale_name))
+        self._segments = None
+        return n_docs
+
+    def _merge_segments_log(self, registry: dict) -> list[str]:
+        """
+        Merge logarítmico (MAN08 4.5): cada segmento tiene un nivel (0 al crearse) y, como en un
+        contador binario, mientras los dos últimos segmentos tengan el mismo nivel se mergean en
+        uno de nivel + 1. Así hay a lo sumo un segmento por nivel (O(log n) segmentos) y cada
+        posting se reescribe O(log n) veces. Los segmentos mergeados son siempre los dos más
+        nuevos, por lo que el resultado sigue cubriendo un rango de doc_id contiguo.
+        Devuelve los nombres de los segmentos reemplazados.
+        """
+        segments = registry["segments"]
+        stale: list[str] = []
+        while len(segments) >= 2 and segments[-1]["level"] == segments[-2]["level"]:
+            older, newer = segments[-2], segments[-1]
+            name = f"seg_{registry['next_id']}"
+            registry["next_id"] += 1
+            print(f"Mergeando segmentos {older['name']} + {newer['name']} -> {name}")
+            self._merge_segments([older["name"], newer["name"]], name)
+            segments[-2:] = [
+                {
+                    "name": name,
+                    "level": older["level"] + 1,
+                    "docs": older["docs"] + newer["docs"],
+                }
+            ]
+            stale.extend([older["name"], newer["name"]])
+        return stale
+
+    def _merge_segments(self, names: list[str], output_name: str) -> None:
+        """
+        Mergea segmentos con rangos de doc_id consecutivos (en orden) en un segmento nuevo: la
+        posting list de cada término es la concatenación de las de cada segmento.
+        """
+        sources = [self._new_segment(self._segment_path(name)) for name in names]
+        output = self._new_segment(self._segment_path(output_name))
+        os.makedirs(output.path_index, exist_ok=True)
+        vocabularies = [source.get_vocabulary() for source in sources]
+        postings_files = [
+            open(os.path.join(source.path_index, self.POSTINGS_FILENAME), "rb")
+            for source in sources
+        ]
+        if self.positional:
+            positions_files = [
+                open(os.path.join(source.path_index, self.POSITIONS_FILENAME), "rb")
+                for source in sources
+            ]
+            output_positions = open(
+                os.path.join(output.path_index, self.POSITIONS_FILENAME), "wb"
+            )
+        skips_dict: dict[str, list[tuple[int, int]]] = {}
+        postings_path = os.path.join(output.path_index, self.POSTINGS_FILENAME)
+        with open(postings_path, "wb") as final_index_file:
+            offset = 0
+            for term in sorted(set().union(*vocabularies)):
+                data_parts: list[bytes] = []
+                positions_parts: list[bytes] = []
+                for i, vocabulary in enumerate(vocabularies):
+                    entry = vocabulary.get(term)
+                    if entry is not None:
+                        postings_files[i].seek(entry["puntero"])
+                        data_parts.append(
+                            postings_files[i].read(entry["df"] * self.POSTING_SIZE)
+                        )
+                        if self.positional:
+                            positions_files[i].seek(entry["puntero_pos"])
+                            positions_parts.append(
+                                positions_files[i].read(entry["bytes_pos"])
+                            )
+                data = b"".join(data_parts)
+                doc_ids = array("I", data)[0::2].tolist()
+                offset += output._write_term_postings(
+                    final_index_file, term, data, doc_ids, offset, skips_dict
+                )
+                if self.positional:
+                    output._write_term_positions(
+                        output_positions, term, b"".join(positions_parts)
+                    )
+        for postings_file in postings_files:
+            postings_file.close()
+        if self.positional:
+            for positions_file in positions_files:
+                positions_file.close()
+            output_positions.close()
+        output._write_skip_lists(skips_dict)
+        source_tables = [source.get_doc_id_map() for source in sources]
+        for doc_id_map in source_tables:
+            output.doc_id_map.update(doc_id_map.items())
+        output._merge_forward_indexes(sources)
+        output._write_vocabulary()
+        output._write_metadata(source_tables)
+        output._write_manifest()
+
+    # --- Borrado de documentos (tombstones) y compactación ---
+
+    def get_tombstones(self) -> bitarray:
+        """
+        Devuelve el bitmap de documentos borrados (bit doc_id en 1 = borrado), compartido por el
+        índice base y sus segmentos.
+        """
+        if self._tombstones is None:
+            self._tombstones = bitarray()
+            tombstones_path = os.path.join(self.path_index, self.TOMBSTONES_FILENAME)
+            if os.path.exists(tombstones_path):
+                with open(tombstones_path, "rb") as f:
+                    self._tombstones.fromfile(f)
+        return self._tombstones
+
+    def _write_tombstones(self) -> None:
+        tombstones_path = os.path.join(self.path_index, self.TOMBSTONES_FILENAME)
+        with open(tombstones_path, "wb") as f:
+            self.get_tombstones().tofile(f)
+        self._write_manifest()
+
+    def delete_documents(
+        self, doc_ids: list[int], compact_threshold: Optional[float] = 0.2
+    ) -> int:
+        """
+        Marca los documentos como borrados en tombstones.bin (las consultas los filtran) y, si
+        compact_threshold no es None, compacta las partes del índice cuya fracción de documentos
+        borrados lo supera (ver compact). Devuelve la cantidad de documentos marcados.
+        """
+        tombstones = self.get_tombstones()
+        doc_id_maps = [part.get_doc_id_map() for part in [self] + self.get_segments()]
+        deleted = 0
+        for doc_id in doc_ids:
+            if not any(doc_id in doc_id_map for doc_id_map in doc_id_maps):
+                continue
+            if doc_id >= len(tombstones):
+                tombstones.extend([False] * (doc_id + 1 - len(tombstones)))
+            if not tombstones[doc_id]:
+                tombstones[doc_id] = True
+                deleted += 1
+        self._write_tombstones()
+        if compact_threshold is not None:
+            self.compact(compact_threshold)
+        return deleted
+
+    def _deleted_mask(self, max_doc_id: int) -> np.ndarray:
+        """
+        Tombstones como array booleano indexable por doc_id (hasta max_doc_id inclusive).
+        """
+        tombstones = self.get_tombstones()
+        mask = np.zeros(max_doc_id + 1, dtype=bool)
+        bits = np.unpackbits(np.frombuffer(tombstones.tobytes(), dtype=np.uint8))
+        n = min(len(tombstones), len(mask))
+        mask[:n] = bits[:n]
+        return mask
+
+    def compact(self, threshold: float = 0.2) -> int:
+        """
+        Reescribe las partes del índice (base y segmentos) con más de threshold de sus documentos
+        borrados: quita sus postings, términos y vectores, y limpia sus tombstones. Las demás
+        partes no se tocan. Devuelve los bytes de postings recuperados.
+        """
+        tombstones = self.get_tombstones()
+        if not tombstones.any():
+            return 0
+        reclaimed = 0
+        for part in [self] + self.get_segments():
+            doc_id_map = part.get_doc_id_map()
+            if not doc_id_map:
+                continue
+            deleted_docs = [
+                doc_id
+                for doc_id in doc_id_map
+                if doc_id < len(tombstones) and tombstones[doc_id]
+            ]
+            if len(deleted_docs) / len(doc_id_map) <= threshold:
+                continue
+            print(
+                f"Compactando {part.path_index}: {len(deleted_docs)} de {len(doc_id_map)} documentos borrados"
+            )
+            reclaimed += self._compact_part(part, self._deleted_mask(max(doc_id_map)))
+            # Los doc_ids compactados ya no existen en el índice
+            for doc_id in deleted_docs:
+                tombstones[doc_id] = False
+        self._write_tombstones()
+        if reclaimed:
+            print(f"Espacio recuperado en postings: {reclaimed / 2**20:.2f} MB")
+        return reclaimed
+
+    def _compact_part(self, part: "IndexadorBSBI", deleted: np.ndarray) -> int:
+        """
+        Reescribe final_index.bin, skips, vocabulario, metadata y vectores de una parte sin los
+        documentos marcados en deleted. Las posting lists sin documentos borrados se copian tal
+        cual. Devuelve los bytes de postings recuperados.
+        """
+        vocabulary = part.get_vocabulary()
+        postings_path = os.path.join(part.path_index, self.POSTINGS_FILENAME)
+        size_before = os.path.getsize(postings_path)
+        positions_path = os.path.join(part.path_index, self.POSITIONS_FILENAME)
+        positional = os.path.exists(positions_path)
+        if positional:
+            positions_src = open(positions_path, "rb")
+            positions_dst = open(positions_path + ".tmp", "wb")
+        part.vocabulary = {}
+        skips_dict: dict[str, list[tuple[int, int]]] = {}
+        with open(postings_path, "rb") as src, open(postings_path + ".tmp", "wb") as dst:
+            offset = 0
+            for term, entry in vocabulary.items():
+                src.seek(entry["puntero"])
+                pairs = np.frombuffer(
+                    src.read(entry["df"] * self.POSTING_SIZE),
+                    dtype=PostingChunkReader.PAIR_DTYPE,
+                )
+                keep = ~deleted[pairs["doc_id"]]
+                if not keep.any():
+                    continue
+                offset += part._write_term_postings(
+                    dst,
+                    term,
+                    pairs[keep].tobytes(),
+                    pairs["doc_id"][keep].tolist(),
+                    offset,
+                    skips_dict,
+                )
+                if positional:
+                    positions_src.seek(entry["puntero_pos"])
+                    data = positions_src.read(entry["bytes_pos"])
+                    if not keep.all():
+                        doc_positions = _split_positions(data, pairs["freq"])
+                        data = b"".join(
+                            positions
+                            for positions, kept in zip(doc_positions, keep.tolist())
+                            if kept
+                        )
+                    part._write_term_positions(positions_dst, term, data)
+        os.replace(postings_path + ".tmp", postings_path)
+        if positional:
+            positions_src.close()
+            positions_dst.close()
+            os.replace(positions_path + ".tmp", positions_path)
+        part._write_skip_lists(skips_dict)
+        part.skips = skips_dict
+        part._write_vocabulary()
+
+        doc_id_map = part.get_doc_id_map()
+        part.doc_id_map = {
+            doc_id: doc_name
+            for doc_id, doc_name in doc_id_map.items()
+            if not deleted[doc_id]
+        }
+        part._write_metadata([doc_id_map])
+        # El forward index no se reescribe: los documentos borrados ya no son alcanzables
+        if os.path.exists(os.path.join(part.path_index, self.DOC_VECTORS_FILENAME)):
+            part._load_doc_vectors()
+            part._doc_vectors = {
+                doc_id: terms
+                for doc_id, terms in part._doc_vectors.items()
+                if not deleted[doc_id]
+            }
+            part._write_doc_vectors()
+        part._write_manifest()
+        return size_before - os.path.getsize(postings_path)
+
     # ESTO LO PUSE POR LA ABSTRACT CLASS
 
     def total_tokens(self) -> int:
@@ -374,3 +1866,188 @@ class IndexadorBSBI(CollectionAnalyzerBase):
 
     def total_terminos(self) -> int:
         return len(self.term2id)
+
+
+# Indexador usado por cada proceso del pool en el modo paralelo (ver _init_block_worker)
+_worker_indexer: "IndexadorBSBI | None" = None
+
+
+def _gather_column(
+    doc_id_maps: list, name: str, first_doc_id: int, n_slots: int
+) -> Optional[np.ndarray]:
+    """
+    Arma la columna name para los doc_ids first_doc_id .. first_doc_id + n_slots - 1 con los
+    valores de las tablas de documentos doc_id_maps. None si alguna no la tiene (p. ej. un
+    metadata.pkl de un índice viejo).
+    """
+    values = np.zeros(n_slots, dtype=DocTable.COLUMNS[name])
+    for doc_id_map in doc_id_maps:
+        column = doc_id_map.column(name) if isinstance(doc_id_map, DocTable) else None
+        if column is None:
+            return None
+        lo = max(doc_id_map.first_doc_id, first_doc_id)
+        hi = min(doc_id_map.first_doc_id + doc_id_map.n_slots, first_doc_id + n_slots)
+        if lo < hi:
+            values[lo - first_doc_id : hi - first_doc_id] = column[
+                lo - doc_id_map.first_doc_id : hi - doc_id_map.first_doc_id
+            ]
+    return values
+
+
+def _init_block_worker(
+    tokenizer: Tokenizador, text_extractor: TextExtractor, positional: bool = False
+) -> None:
+    """
+    Inicializa el proceso worker con un indexador propio (solo se usa su _process_doc).
+    """
+    global _worker_indexer
+    _worker_indexer = IndexadorBSBI(
+        tokenizer, text_extractor=text_extractor, positional=positional
+    )
+
+
+def _invert_block(
+    block: list[tuple[str, str]],
+) -> list[tuple[str, Counter, int, Optional[dict[str, bytes]]]]:
+    """
+    Procesa un bloque de documentos [(doc_name, texto), ...] en un worker: parsea, tokeniza y
+    cuenta términos. Devuelve [(doc_name, Counter(tokens), bytes de entrada, posiciones), ...]
+    en el mismo orden del bloque (posiciones es None si el índice no es posicional).
+    """
+    result = []
+    for doc_name, text in block:
+        tokens = _worker_indexer._process_doc(doc_name, text)
+        positions = _encode_positions(tokens) if _worker_indexer.positional else None
+        result.append((doc_name, Counter(tokens), len(text.encode("utf8")), positions))
+    return result
+
+
+def _encode_positions(tokens: list[str]) -> dict[str, bytes]:
+    """
+    Posiciones de cada término en la lista de tokens de un documento, como dgaps codificados
+    en VByte. Los términos quedan en orden de primera aparición (el mismo de Counter(tokens)).
+    """
+    positions: dict[str, list[int]] = {}
+    for position, token in enumerate(tokens):
+        positions.setdefault(token, []).append(position)
+    return {
+        term: vbyte_encode_list(compute_dgaps(term_positions))
+        for term, term_positions in positions.items()
+    }
+
+
+def _split_positions(data: bytes, freqs: np.ndarray) -> list[bytes]:
+    """
+    Separa las posiciones codificadas de una posting list (concatenadas) en las de cada posting.
+    Cada posting tiene freq números y en VByte cada número termina en un byte con el MSB en 1.
+    """
+    value_ends = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) & 0x80) + 1
+    ends = value_ends[np.cumsum(freqs) - 1].tolist()
+    return [data[start:end] for start, end in zip([0] + ends[:-1], ends)]
+
+
+def _file_size(path: str) -> int:
+    """
+    Tamaño de path en bytes, 0 si todavía no existe (un run que no empezó a escribirse).
+    """
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+def _merge_chunk_group(paths: list[str], output_path: str, block_size: int) -> None:
+    """
+    Mergea un grupo de chunks consecutivos en un run intermedio (mismo formato de 12 bytes),
+    concatenando por término las corridas de cada chunk en orden (ver _merge_chunks_runs).
+    Se ejecuta en un proceso del pool del merge jerárquico.
+    """
+    readers = [PostingChunkReader(path, block_size) for path in paths]
+    with open(output_path, "wb") as output:
+        for _, term_readers in _iter_term_runs(readers):
+            for reader in term_readers:
+                output.write(reader.read_run_records())
+    for reader in readers:
+        reader.close()
+
+
+def _iter_term_runs(
+    readers: list[PostingChunkReader],
+) -> Iterator[tuple[int, list[PostingChunkReader]]]:
+    """
+    Recorre los cursores por término de varios chunks en orden de term_id. Para cada término
+    devuelve los readers posicionados en su corrida, en orden de chunk (doc_ids crecientes).
+    Quien consume debe leer la corrida (read_run / read_run_records) de cada reader antes de
+    pedir el término siguiente.
+    """
+    heap: list[tuple[int, int]] = []  # (term_id, chunk_id)
+    for chunk_id, reader in enumerate(readers):
+        term_id = reader.current_term()
+        if term_id is not None:
+            heap.append((term_id, chunk_id))
+    heapq.heapify(heap)
+    while heap:
+        term_id = heap[0][0]
+        chunk_ids = []
+        # Ante igual term_id el heap devuelve los chunks en orden
+        while heap and heap[0][0] == term_id:
+            chunk_ids.append(heapq.heappop(heap)[1])
+        yield term_id, [readers[chunk_id] for chunk_id in chunk_ids]
+        for chunk_id in chunk_ids:
+            next_term_id = readers[chunk_id].current_term()
+            if next_term_id is not None:
+                heapq.heappush(heap, (next_term_id, chunk_id))
+
+
+def _skip_entries(doc_ids: list[int], offset: int) -> list[tuple[int, int]]:
+    """
+    Skips [(docid, offset_byte), ...] cada sqrt(df) postings de una posting list que empieza en
+    offset (mismo criterio que IndexadorBSBI._process_skip_list).
+    """
+    df = len(doc_ids)
+    k = int(df**0.5)
+    if k == 0:
+        return []
+    return [
+        (doc_ids[i], offset + i * IndexadorBSBI.POSTING_SIZE) for i in range(0, df, k)
+    ]
+
+
+def _merge_term_range(
+    paths: list[str], term_range: tuple[int, int], segment_path: str, block_size: int
+) -> list[tuple[int, int, int, list[tuple[int, int]]]]:
+    """
+    Mergea los postings con term_id en [lo, hi) de todos los chunks en un segmento de postings
+    (mismo formato que final_index.bin). El inicio/fin del rango en cada chunk se ubica con
+    búsqueda binaria sobre el archivo mapeado en memoria.
+    Devuelve [(term_id, offset_local, df, skips_locales), ...] en orden de term_id.
+    Se ejecuta en un proceso del pool del merge particionado.
+    """
+    lo, hi = term_range
+    readers = []
+    for path in paths:
+        if os.path.getsize(path) == 0:
+            continue
+        term_col = np.memmap(path, dtype=PartialPostingBuffer.DTYPE, mode="r")["term_id"]
+        start = int(np.searchsorted(term_col, lo, side="left"))
+        end = int(np.searchsorted(term_col, hi, side="left"))
+        del term_col
+        if start < end:
+            readers.append(PostingChunkReader(path, block_size, start, end))
+
+    entries = []
+    with open(segment_path, "wb") as segment:
+        offset = 0
+        for term_id, term_readers in _iter_term_runs(readers):
+            data_parts: list[bytes] = []
+            doc_ids: list[int] = []
+            for reader in term_readers:
+                data, run_doc_ids = reader.read_run()
+                data_parts.append(data)
+                doc_ids.extend(run_doc_ids)
+            segment.write(b"".join(data_parts))
+            entries.append((term_id, offset, len(doc_ids), _skip_entries(doc_ids, offset)))
+            offset += len(doc_ids) * IndexadorBSBI.POSTING_SIZE
+    for reader in readers:
+        reader.close()
+    return entries
@@ -0,0 +1,213 @@
+from array import array
+from collections import Counter
+import heapq
+import os
+import struct
+import sys
+import time
+from typing import Dict, Optional
+
+from lib.IndexadorBSBI import IndexadorBSBI
+from lib.TextExtractor import TextExtractor
+from lib.Tokenizador import Tokenizador
+
+
+class SPIMIBlockReader:
+    """
+    Lectura secuencial de un bloque SPIMI en disco, término a término.
+    Formato de cada entrada: header HEADER_FORMAT (largo del término en bytes utf8, df),
+    el término en utf8 y df pares (doc_id, freq) en POSTING_STRUCT_FORMAT.
+    """
+
+    HEADER_FORMAT = "II"
+    HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+    def __init__(self, file_path: str):
+        self.file_path: str = file_path
+        self.file = open(file_path, "rb")
+        self.term: Optional[str] = None  # término actual (None al llegar al final)
+        self.data: bytes = b""  # pares (doc_id, freq) del término actual
+        self.next()
+
+    def next(self) -> None:
+        """
+        Avanza a la siguiente entrada del bloque.
+        """
+        header = self.file.read(self.HEADER_SIZE)
+        if len(header) < self.HEADER_SIZE:
+            self.term = None
+            self.data = b""
+            return
+        term_len, df = struct.unpack(self.HEADER_FORMAT, header)
+        self.term = self.file.read(term_len).decode("utf8")
+        self.data = self.file.read(df * IndexadorBSBI.POSTING_SIZE)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class IndexadorSPIMI(IndexadorBSBI):
+    """
+    Indexador SPIMI (Single-Pass In-Memory Indexing, MAN08 4.3).
+    A diferencia de BSBI no hay term2id/id2term globales: cada bloque es un diccionario
+    término -> postings que se descarta al volcarlo, ordenado por término, a block_N.bin.
+    El merge es por término (string) y produce el mismo final_index.bin, vocabulario y skips
+    que IndexadorBSBI, así que IRSystemBSBI lo consulta sin cambios.
+    """
+
+    INDEXING_METHOD = "SPIMI"
+    # Costo estimado por término nuevo en el bloque (además del str): entrada en el dict, el int
+    # del term_id local, el slot en _block_postings y el array vacío
+    TERM_ENTRY_BYTES = 48 + 28 + 8 + sys.getsizeof(array("I"))
+
+    def __init__(
+        self,
+        tokenizer: Tokenizador,
+        memory_limit: int = 1000,
+        path_index: str = "index",
+        max_workers: int = 1,
+        memory_limit_mb: Optional[float] = None,
+        measure_memory: bool = False,
+        delete_chunks: bool = True,
+        text_extractor: Optional[TextExtractor] = None,
+        progress_interval: float = 1.0,
+        kgrams: bool = False,
+    ):
+        """
+        Mismos parámetros que IndexadorBSBI salvo los del merge por term_id (array_buffer,
+        merge_mode, merge_block_size, max_fan_in), que no aplican a SPIMI.
+        """
+        super().__init__(
+            tokenizer,
+            memory_limit=memory_limit,
+            path_index=path_index,
+            max_workers=max_workers,
+            memory_limit_mb=memory_limit_mb,
+            measure_memory=measure_memory,
+            delete_chunks=delete_chunks,
+            text_extractor=text_extractor,
+            progress_interval=progress_interval,
+            kgrams=kgrams,
+        )
+
+    def _new_chunk_buffer(self) -> Dict[str, int]:
+        """
+        Diccionario del bloque: término -> term_id local al bloque. Los postings de cada término
+        son un array('I') con pares doc_id, freq intercalados, en _block_postings[term_id].
+        """
+        self._block_postings: list[array] = []
+        return {}
+
+    def _add_doc(
+        self,
+        doc_id: int,
+        doc_name: str,
+        terms_freq: Counter,
+        current_chunk_postings: Dict[str, int],
+        positions: Optional[dict[str, bytes]] = None,
+    ) -> None:
+        """
+        Agrega los postings de un documento al diccionario del bloque (AddToPostingsList).
+        SPIMI no guarda posiciones (positional es siempre False), así que positions no se usa.
+        """
+        if not current_chunk_postings:
+            self._block_first_doc_id = doc_id
+        term_ids: list[int] = []
+        for token, freq in terms_freq.items():
+            term_id = current_chunk_postings.get(token)
+            if term_id is None:
+                term_id = current_chunk_postings[token] = len(self._block_postings)
+                self._block_postings.append(array("I"))
+                self.chunk_bytes += sys.getsizeof(token) + self.TERM_ENTRY_BYTES
+            postings = self._block_postings[term_id]
+            postings.append(doc_id)
+            postings.append(freq)
+            term_ids.append(term_id)
+        self.chunk_bytes += len(terms_freq) * self.POSTING_SIZE
+        self.doc_id_map[doc_id] = doc_name
+        self._write_forward_doc(term_ids, terms_freq.values())
+
+    def _process_chunk(self, chunk: Dict[str, int]) -> None:
+        """
+        Ordena los términos del bloque y lo vuelca a disco (WriteBlockToDisk). Los term_ids
+        locales del bloque se guardan como tabla del índice directo.
+        """
+        self._write_forward_term_table(self._block_first_doc_id, list(chunk))
+        block_file_path = os.path.join(self.path_index, f"block_{len(self.chunks)}.bin")
+        n_postings = 0
+        with open(block_file_path, "wb") as f:
+            for term in sorted(chunk):
+                postings = self._block_postings[chunk[term]]
+                encoded = term.encode("utf8")
+                df = len(postings) // 2
+                f.write(struct.pack(SPIMIBlockReader.HEADER_FORMAT, len(encoded), df))
+                f.write(encoded)
+                postings.tofile(f)
+                n_postings += df
+        self.chunks.append(block_file_path)
+        self._record_chunk_stats(n_postings)
+
+    def merge_chunks(self) -> None:
+        """
+        Multi-way merge de los bloques por término. Como los bloques cubren rangos de doc_id
+        crecientes, la posting list de un término es la concatenación de sus entradas en orden
+        de bloque.
+        """
+        print("Iniciando merge de bloques...")
+        self.vocabulary = {}
+        t_merge_start = time.time()
+        self._disk_bytes = sum(os.path.getsize(path) for path in self.chunks)
+        self.peak_disk_bytes = self._disk_bytes
+
+        readers = [SPIMIBlockReader(path) for path in self.chunks]
+        heap: list[tuple[str, int]] = [
+            (reader.term, block_id)
+            for block_id, reader in enumerate(readers)
+            if reader.term is not None
+        ]
+        heapq.heapify(heap)
+        skips_dict: dict[str, list[tuple[int, int]]] = {}
+        postings_path = os.path.join(self.path_index, self.POSTINGS_FILENAME)
+        with open(postings_path, "wb") as final_index_file:
+            offset = 0
+            while heap:
+                term = heap[0][0]
+                block_ids = []
+                # Ante igual término el heap devuelve los bloques en orden
+                while heap and heap[0][0] == term:
+                    block_ids.append(heapq.heappop(heap)[1])
+                data = b"".join(readers[block_id].data for block_id in block_ids)
+                doc_ids = array("I", data)[0::2].tolist()
+                offset += self._write_term_postings(
+                    final_index_file, term, data, doc_ids, offset, skips_dict
+                )
+                for block_id in block_ids:
+                    reader = readers[block_id]
+                    reader.next()
+                    if reader.term is not None:
+                        heapq.heappush(heap, (reader.term, block_id))
+        self._write_skip_lists(skips_dict)
+        for reader in readers:
+            reader.close()
+
+        # Los bloques se borran al terminar el índice (ver IndexadorBSBI.index_collection)
+        self._track_disk(os.path.getsize(postings_path))
+        self.merge_time = time.time() - t_merge_start
+        print(f"Tiempo de merge: {self.merge_time:.2f} segundos")
+        print(f"Uso pico de disco en el merge: {self.peak_disk_bytes / 2**20:.2f} MB")
+
+    def _new_segment(self, path_index: str) -> "IndexadorSPIMI":
+        return IndexadorSPIMI(
+            self.tokenizer,
+            memory_limit=self.memory_limit,
+            path_index=path_index,
+            max_workers=self.max_workers,
+            memory_limit_mb=self.memory_limit_mb,
+            delete_chunks=True,
+            text_extractor=self.text_extractor,
+            progress_interval=self.progress_interval,
+            kgrams=self.kgrams,
+        )
+
+    def total_terminos(self) -> int:
+        return len(self.get_vocabulary())
@@ -0,0 +1,137 @@
+import json
+import sys
+import time
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # resource no existe en Windows: el pico de RSS queda en None
+    resource = None
+
+
+class IndexingMetrics:
+    """
+    Métricas de throughput de un indexado: documentos, tokens y bytes de entrada por segundo,
+    duración y tamaño de cada volcado de chunk, throughput del merge y picos de memoria
+    (RSS) del proceso y de sus procesos hijos (los workers del indexado y del merge en
+    paralelo).
+    Reemplaza el print por documento con un progreso limitado a uno cada progress_interval
+    segundos, y se exporta como JSON junto al índice.
+    """
+
+    def __init__(self, progress_interval: float = 1.0):
+        self.progress_interval: float = progress_interval
+        self.docs: int = 0
+        self.tokens: int = 0
+        self.input_bytes: int = 0
+        self.chunks: list[dict] = []  # por chunk: docs, postings, bytes, segundos
+        self.merge: dict = {}
+        self.start_time: float = time.time()
+        self.index_seconds: float = 0.0
+        self._last_progress: float = 0.0
+
+    def state(self) -> dict:
+        """
+        Contadores de la pasada de documentos hasta ahora, para guardarlos en un checkpoint y
+        seguir sumando al reanudar (ver restore).
+        """
+        return {
+            "docs": self.docs,
+            "tokens": self.tokens,
+            "input_bytes": self.input_bytes,
+            "chunks": list(self.chunks),
+            "seconds": time.time() - self.start_time,
+            "index_seconds": self.index_seconds,
+        }
+
+    def restore(self, state: dict) -> None:
+        """
+        Retoma los contadores de state (ver state). start_time se corre hacia atrás lo que
+        ya se había indexado, así el throughput cuenta el trabajo de antes y después del
+        checkpoint pero no el tiempo en que el indexado estuvo detenido.
+        """
+        self.docs = state["docs"]
+        self.tokens = state["tokens"]
+        self.input_bytes = state["input_bytes"]
+        self.chunks = list(state["chunks"])
+        self.start_time = time.time() - state["seconds"]
+        self.index_seconds = state["index_seconds"]
+
+    def add_doc(self, doc_id: int, n_tokens: int, n_bytes: int) -> None:
+        """
+        Registra un documento procesado y, si pasó progress_interval desde el último, imprime
+        el progreso.
+        """
+        self.docs += 1
+        self.tokens += n_tokens
+        self.input_bytes += n_bytes
+        now = time.time()
+        if now - self._last_progress >= self.progress_interval:
+            self._last_progress = now
+            self._print_progress(doc_id, now)
+
+    def _print_progress(self, doc_id: int, now: float) -> None:
+        elapsed = max(now - self.start_time, 1e-9)
+        print(
+            f"\rProcesando documento {doc_id} ({self.docs / elapsed:.0f} docs/s, "
+            f"{self.input_bytes / elapsed / 2**20:.2f} MB/s)",
+            end="",
+            flush=True,
+        )
+
+    def end_documents(self, last_doc_id: int) -> None:
+        """
+        Cierra la pasada de documentos (imprime el progreso final).
+        """
+        self.index_seconds = time.time() - self.start_time
+        self._print_progress(last_doc_id, time.time())
+
+    def add_chunk(self, docs: int, postings: int, n_bytes: int, seconds: float) -> None:
+        self.chunks.append(
+            {"docs": docs, "postings": postings, "bytes": n_bytes, "seconds": seconds}
+        )
+
+    def set_merge(self, postings: int, n_bytes: int, seconds: float) -> None:
+        self.merge = {
+            "postings": postings,
+            "bytes": n_bytes,
+            "seconds": seconds,
+            "postings_per_sec": postings / seconds if seconds else 0.0,
+            "bytes_per_sec": n_bytes / seconds if seconds else 0.0,
+        }
+
+    @staticmethod
+    def peak_rss_bytes(children: bool = False) -> Optional[int]:
+        """
+        Pico de memoria residente del proceso (ru_maxrss está en KB en Linux y en bytes en macOS).
+        Con children, el del mayor de los procesos hijos ya terminados (RUSAGE_CHILDREN):
+        es el pico de un solo worker, no la suma de los que corrieron a la vez.
+        """
+        if resource is None:
+            return None
+        who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+        peak = resource.getrusage(who).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+    def to_dict(self) -> dict:
+        seconds = self.index_seconds or time.time() - self.start_time
+        return {
+            "docs": self.docs,
+            "tokens": self.tokens,
+            "input_bytes": self.input_bytes,
+            "index_seconds": seconds,
+            "docs_per_sec": self.docs / seconds if seconds else 0.0,
+            "tokens_per_sec": self.tokens / seconds if seconds else 0.0,
+            "input_bytes_per_sec": self.input_bytes / seconds if seconds else 0.0,
+            "chunks": self.chunks,
+            "flush_seconds": sum(chunk["seconds"] for chunk in self.chunks),
+            "merge": self.merge,
+            # Proceso principal y mayor worker por separado: con max_workers > 1 la
+            # inversión corre en los workers y el pico del principal no la incluye
+            "peak_rss_bytes": self.peak_rss_bytes(),
+            "peak_rss_children_bytes": self.peak_rss_bytes(children=True),
+        }
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf8") as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -0,0 +1,96 @@
+import mmap
+import os
+from array import array
+from collections import defaultdict
+from typing import Optional
+
+import numpy as np
+
+from lib.Lexicon import Lexicon
+
+
+class KGramIndex:
+    """
+    Índice de k-gramas de caracteres del vocabulario (MAN08 3.2.2), para resolver comodines
+    al principio o en el medio de un término (*ción, a*ción). Cada término se extiende con el
+    marcador de borde ($término$) y se indexa por sus k-gramas; la posting list de un k-grama
+    son las posiciones (en el Lexicon del índice) de los términos que lo contienen.
+    Archivos:
+        kgrams.bin: Lexicon de k-gramas -> {"puntero": offset en kgram_postings.bin, "df": ...}
+        kgram_postings.bin: posiciones de términos (uint32 crecientes) de cada k-grama
+    """
+
+    LEXICON_FILENAME = "kgrams.bin"
+    POSTINGS_FILENAME = "kgram_postings.bin"
+    K = 3
+    BOUNDARY = "$"
+    ORDINAL_DTYPE = np.dtype("=u4")
+
+    def __init__(self, path_index: str):
+        self.grams: Lexicon = Lexicon(os.path.join(path_index, self.LEXICON_FILENAME))
+        postings_path = os.path.join(path_index, self.POSTINGS_FILENAME)
+        if os.path.getsize(postings_path) == 0:
+            self.postings: np.ndarray = np.zeros(0, dtype=self.ORDINAL_DTYPE)
+        else:
+            with open(postings_path, "rb") as f:
+                postings_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.postings = np.frombuffer(postings_map, dtype=self.ORDINAL_DTYPE)
+
+    @staticmethod
+    def exists(path_index: str) -> bool:
+        return os.path.exists(os.path.join(path_index, KGramIndex.LEXICON_FILENAME))
+
+    @classmethod
+    def kgrams(cls, text: str) -> set[str]:
+        """
+        k-gramas de text (sin agregar marcadores); un texto más corto que K no tiene ninguno.
+        """
+        return {text[i : i + cls.K] for i in range(len(text) - cls.K + 1)}
+
+    @classmethod
+    def write(cls, path_index: str, terms: list[str]) -> None:
+        """
+        Construye el índice de k-gramas de terms (en el orden del Lexicon: la posición de cada
+        término es su índice en la lista).
+        """
+        ordinals: dict[str, array] = defaultdict(lambda: array("I"))
+        for ordinal, term in enumerate(terms):
+            for gram in cls.kgrams(cls.BOUNDARY + term + cls.BOUNDARY):
+                ordinals[gram].append(ordinal)
+        vocabulary: dict[str, dict[str, int]] = {}
+        postings_path = os.path.join(path_index, cls.POSTINGS_FILENAME)
+        with open(postings_path + ".tmp", "wb") as f:
+            offset = 0
+            for gram in sorted(ordinals):
+                data = ordinals[gram].tobytes()
+                f.write(data)
+                vocabulary[gram] = {"puntero": offset, "df": len(ordinals[gram])}
+                offset += len(data)
+        os.replace(postings_path + ".tmp", postings_path)
+        Lexicon.write(os.path.join(path_index, cls.LEXICON_FILENAME), vocabulary)
+
+    def get_ordinals(self, gram: str) -> np.ndarray:
+        entry = self.grams.get(gram)
+        if entry is None:
+            return np.zeros(0, dtype=self.ORDINAL_DTYPE)
+        start = entry["puntero"] // self.ORDINAL_DTYPE.itemsize
+        return self.postings[start : start + entry["df"]]
+
+    def candidates(self, pattern: str) -> Optional[np.ndarray]:
+        """
+        Posiciones de los términos que contienen todos los k-gramas de las partes fijas de
+        pattern ('*' = cualquier secuencia). Es un superconjunto de los que matchean (hay que
+        verificarlos); None si el patrón no tiene ningún k-grama (no restringe nada).
+        """
+        pieces = (self.BOUNDARY + pattern + self.BOUNDARY).split("*")
+        grams = set().union(*(self.kgrams(piece) for piece in pieces))
+        if not grams:
+            return None
+        # Intersectar de la lista más corta a la más larga
+        lists = sorted((self.get_ordinals(gram) for gram in grams), key=len)
+        result = lists[0]
+        for ordinals in lists[1:]:
+            if len(result) == 0:
+                break
+            result = np.intersect1d(result, ordinals, assume_unique=True)
+        return result
@@ -0,0 +1,271 @@
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from typing import Iterator, Optional
+
+import numpy as np
+
+from lib.codecs_compresion import vbyte_encode_number
+
+
+class Lexicon(Mapping):
+    """
+    Vocabulario binario de solo lectura: los términos ordenados y codificados con front coding
+    en bloques, más un arreglo paralelo de entradas (puntero, df y, en índices posicionales,
+    puntero_pos y bytes_pos). El archivo se mapea en memoria y los términos se buscan con
+    búsqueda binaria sobre el primer término de cada bloque, así que abrirlo no deserializa
+    nada. Se usa como el dict término -> {"puntero": ..., "df": ...} que reemplaza.
+    Formato de lexicon.bin:
+        header: magic, cantidad de términos, términos por bloque, flags (HEADER_FORMAT)
+        block_offsets: uint64[n_blocks + 1] - inicio de cada bloque en la sección de términos
+        entries: n_terms registros ENTRY_DTYPE (o ENTRY_POS_DTYPE), en orden de término
+        términos: por bloque, el primero completo (largo VByte + bytes UTF-8) y el resto como
+        (largo del prefijo común con el anterior, largo del sufijo, sufijo)
+    """
+
+    MAGIC = b"LEX1"
+    HEADER_FORMAT = "=4sIII"  # magic, n_terms, block_size, flags
+    HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+    FLAG_POSITIONS = 1
+    DEFAULT_BLOCK_SIZE = 16  # términos por bloque
+    ENTRY_DTYPE = np.dtype([("puntero", "=u8"), ("df", "=u4")])
+    ENTRY_POS_DTYPE = np.dtype(
+        [
+            ("puntero", "=u8"),
+            ("df", "=u4"),
+            ("puntero_pos", "=u8"),
+            ("bytes_pos", "=u4"),
+        ]
+    )
+
+    def __init__(self, path: str):
+        self.path: str = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.n_terms, self.block_size, flags = struct.unpack_from(
+            self.HEADER_FORMAT, self._mm, 0
+        )
+        if magic != self.MAGIC:
+            raise ValueError(f"{path} no es un lexicon válido.")
+        self.positional: bool = bool(flags & self.FLAG_POSITIONS)
+        self.n_blocks: int = -(-self.n_terms // self.block_size)
+        offset = self.HEADER_SIZE
+        self.block_offsets: np.ndarray = np.frombuffer(
+            self._mm, dtype="=u8", count=self.n_blocks + 1, offset=offset
+        )
+        offset += self.block_offsets.nbytes
+        entry_dtype = self.ENTRY_POS_DTYPE if self.positional else self.ENTRY_DTYPE
+        self.entries: np.ndarray = np.frombuffer(
+            self._mm, dtype=entry_dtype, count=self.n_terms, offset=offset
+        )
+        self._terms_start: int = offset + self.entries.nbytes
+
+    @classmethod
+    def write(
+        cls,
+        path: str,
+        vocabulary: dict[str, dict[str, int]],
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> None:
+        """
+        Escribe el vocabulario (dict término -> entrada) como lexicon. Se escribe a un temporal
+        y se reemplaza, así un Lexicon abierto sobre el archivo anterior sigue siendo válido.
+        """
+        terms = sorted(vocabulary)
+        positional = bool(terms) and "puntero_pos" in vocabulary[terms[0]]
+        entry_dtype = cls.ENTRY_POS_DTYPE if positional else cls.ENTRY_DTYPE
+        entries = np.array(
+            [
+                tuple(vocabulary[term][name] for name in entry_dtype.names)
+                for term in terms
+            ],
+            dtype=entry_dtype,
+        )
+        parts: list[bytes] = []
+        block_offsets = [0]
+        size = 0
+        previous = b""
+        for i, term in enumerate(terms):
+            encoded = term.encode("utf8")
+            if i % block_size == 0:
+                if i:
+                    block_offsets.append(size)
+                part = vbyte_encode_number(len(encoded)) + encoded
+            else:
+                prefix = _common_prefix_len(previous, encoded)
+                part = (
+                    vbyte_encode_number(prefix)
+                    + vbyte_encode_number(len(encoded) - prefix)
+                    + encoded[prefix:]
+                )
+            parts.append(part)
+            size += len(part)
+            previous = encoded
+        if terms:
+            block_offsets.append(size)
+        flags = cls.FLAG_POSITIONS if positional else 0
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(
+                struct.pack(
+                    cls.HEADER_FORMAT, cls.MAGIC, len(terms), block_size, flags
+                )
+            )
+            f.write(np.array(block_offsets, dtype="=u8").tobytes())
+            f.write(entries.tobytes())
+            f.write(b"".join(parts))
+        os.replace(tmp_path, path)
+
+    def close(self) -> None:
+        self.block_offsets = self.entries = None
+        self._mm.close()
+
+    # --- Decodificación de bloques ---
+
+    def _first_term(self, block: int) -> bytes:
+        pos = self._terms_start + int(self.block_offsets[block])
+        length, pos = _decode_vbyte(self._mm, pos)
+        return self._mm[pos : pos + length]
+
+    def _iter_block(self, block: int) -> Iterator[bytes]:
+        """
+        Decodifica de a uno los términos (en bytes UTF-8) de un bloque.
+        """
+        start = self._terms_start + int(self.block_offsets[block])
+        data = self._mm[start : self._terms_start + int(self.block_offsets[block + 1])]
+        length, pos = _decode_vbyte(data, 0)
+        term = data[pos : pos + length]
+        pos += length
+        yield term
+        end = len(data)
+        while pos < end:
+            prefix, pos = _decode_vbyte(data, pos)
+            length, pos = _decode_vbyte(data, pos)
+            term = term[:prefix] + data[pos : pos + length]
+            pos += length
+            yield term
+
+    def _lower_bound(self, key: bytes) -> tuple[int, Optional[bytes]]:
+        """
+        Índice del primer término >= key (n_terms si no hay) y ese término.
+        """
+        if self.n_blocks == 0:
+            return 0, None
+        # Último bloque cuyo primer término es <= key
+        lo, hi = 0, self.n_blocks
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._first_term(mid) <= key:
+                lo = mid + 1
+            else:
+                hi = mid
+        block = max(lo - 1, 0)
+        for i, term in enumerate(self._iter_block(block)):
+            if term >= key:
+                return block * self.block_size + i, term
+        next_index = (block + 1) * self.block_size
+        if next_index >= self.n_terms:
+            return self.n_terms, None
+        return next_index, self._first_term(block + 1)
+
+    # --- Acceso ---
+
+    def find(self, term: str) -> int:
+        """
+        Posición del término en el orden del lexicon, o -1 si no está.
+        """
+        key = term.encode("utf8")
+        index, found = self._lower_bound(key)
+        return index if found == key else -1
+
+    def term_at(self, index: int) -> str:
+        block, i = divmod(index, self.block_size)
+        return list(self._iter_block(block))[i].decode("utf8")
+
+    def terms_at(self, indices) -> list[str]:
+        """
+        Términos en las posiciones indices (crecientes), decodificando cada bloque una vez.
+        """
+        terms: list[str] = []
+        block_terms: list[bytes] = []
+        current_block = -1
+        for index in indices:
+            block, i = divmod(int(index), self.block_size)
+            if block != current_block:
+                block_terms = list(self._iter_block(block))
+                current_block = block
+            terms.append(block_terms[i].decode("utf8"))
+        return terms
+
+    def prefix_range(self, prefix: str) -> tuple[int, int]:
+        """
+        Rango [start, end) de posiciones de los términos que empiezan con prefix. Como el
+        lexicon está ordenado por bytes UTF-8, son contiguos: los términos t con
+        prefix <= t < prefix + 0xFF (un byte que no aparece en UTF-8).
+        """
+        key = prefix.encode("utf8")
+        start, _ = self._lower_bound(key)
+        end, _ = self._lower_bound(key + b"\xff")
+        return start, end
+
+    def entry_at(self, index: int) -> dict[str, int]:
+        return dict(zip(self.entries.dtype.names, self.entries[index].tolist()))
+
+    def get(self, term: str, default=None):
+        index = self.find(term)
+        return self.entry_at(index) if index >= 0 else default
+
+    def __getitem__(self, term: str) -> dict[str, int]:
+        index = self.find(term)
+        if index < 0:
+            raise KeyError(term)
+        return self.entry_at(index)
+
+    def __contains__(self, term) -> bool:
+        return isinstance(term, str) and self.find(term) >= 0
+
+    def __len__(self) -> int:
+        return self.n_terms
+
+    def __iter__(self) -> Iterator[str]:
+        for block in range(self.n_blocks):
+            for term in self._iter_block(block):
+                yield term.decode("utf8")
+
+    def items(self) -> Iterator[tuple[str, dict[str, int]]]:
+        """
+        Recorre (término, entrada) en orden de término con una sola pasada por los bloques.
+        """
+        names = self.entries.dtype.names
+        for term, record in zip(self, self.entries.tolist()):
+            yield term, dict(zip(names, record))
+
+    def values(self) -> Iterator[dict[str, int]]:
+        for _, entry in self.items():
+            yield entry
+
+
+def _decode_vbyte(data, pos: int) -> tuple[int, int]:
+    """
+    Lee un entero VByte de data (bytes o mmap) desde pos. Devuelve (valor, posición siguiente).
+    """
+    b = data[pos]
+    if b & 0b10000000:  # caso común: largos < 128 entran en un byte
+        return b & 0b01111111, pos + 1
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0b01111111) << shift
+        if b & 0b10000000:
+            return n, pos
+        shift += 7
+
+
+def _common_prefix_len(a: bytes, b: bytes) -> int:
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
@@ -1,4 +1,6 @@
 import struct
+import tracemalloc
+from typing import Optional
 
 
 class PartialPosting:
@@ -8,15 +10,21 @@ class PartialPosting:
         term_id: int - ID del término
         doc_id: int - ID del documento
         freq: int - frecuencia del término en el documento
+        positions: bytes | None - posiciones del término en el documento (dgaps en VByte), solo
+            en índices posicionales; no forman parte del registro de 12 bytes del chunk
     """
 
     STRUCT_FORMAT = "III"  # 3 unsigned ints
     SIZE = 4 * 3  # 3 enteros de 4 bytes
+    _estimated_size: Optional[int] = None  # bytes por instancia (ver estimated_size)
 
-    def __init__(self, term_id: int, doc_id: int, freq: int):
+    def __init__(
+        self, term_id: int, doc_id: int, freq: int, positions: Optional[bytes] = None
+    ):
         self.term_id: int = term_id
         self.doc_id: int = doc_id
         self.freq: int = freq
+        self.positions: Optional[bytes] = positions
 
     def to_bytes(self) -> bytes:
         """
@@ -31,7 +39,34 @@ class PartialPosting:
         )
         return PartialPosting(term_id, doc_id, freq)
 
+    @classmethod
+    def estimated_size(cls) -> int:
+        """
+        Bytes que ocupa en memoria cada instancia dentro de una lista. Se mide la
+        primera vez que se pide (solo lo usan los índices con memory_limit_mb) y queda
+        guardado en la clase, así importar el módulo no corre tracemalloc en cada
+        proceso.
+        """
+        if cls._estimated_size is None:
+            cls._estimated_size = _estimate_size()
+        return cls._estimated_size
+
+
+def _estimate_size(n: int = 1000) -> int:
+    """
+    Bytes que ocupa en memoria cada PartialPosting dentro de una lista (objeto +
+    atributos + puntero de la lista), medidos con tracemalloc sobre n instancias. Los
+    ids y frecuencias de la muestra son mayores a 256: Python cachea los enteros chicos
+    y con ellos la medición no contaría los objetos int de cada posting real.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sample = [PartialPosting(2**16 + i, 2**20 + i, 2**8 + 1 + i) for i in range(n)]
+    size = (tracemalloc.get_traced_memory()[0] - before) // n
+    del sample
+    if not was_tracing:
+        tracemalloc.stop()
+    return size
 
-# Alternativa con tuplas (más eficiente que una clase):
-# from collections import namedtuple
-# PartialPosting = namedtuple('PartialPosting', ['term_id', 'doc_id', 'freq'])
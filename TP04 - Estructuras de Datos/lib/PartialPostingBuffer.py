@@ -0,0 +1,83 @@
+from array import array
+from typing import BinaryIO, Iterable, Optional
+
+import numpy as np
+
+
+class PartialPostingBuffer:
+    """
+    Buffer de postings parciales de un bloque respaldado por tres columnas array('I'),
+    alternativa compacta a una lista de PartialPosting (12 bytes por posting en vez de ~100).
+    Atributos:
+        term_ids: array('I') - IDs de término
+        doc_ids: array('I') - IDs de documento
+        freqs: array('I') - frecuencias del término en el documento
+        positions: list[bytes] | None - posiciones de cada posting (dgaps en VByte), solo en
+            índices posicionales
+    Métodos:
+        extend_doc(), sort() (np.lexsort), write_to(): escritura en una sola llamada
+    """
+
+    # Mismo layout en disco que PartialPosting ("III": 3 enteros de 4 bytes, orden nativo)
+    DTYPE = np.dtype([("term_id", "=u4"), ("doc_id", "=u4"), ("freq", "=u4")])
+    ESTIMATED_SIZE = DTYPE.itemsize  # bytes en memoria por posting
+
+    def __init__(self):
+        self.term_ids: array = array("I")
+        self.doc_ids: array = array("I")
+        self.freqs: array = array("I")
+        self.positions: Optional[list[bytes]] = None
+
+    def __len__(self) -> int:
+        return len(self.term_ids)
+
+    def extend_doc(
+        self,
+        doc_id: int,
+        term_ids: Iterable[int],
+        freqs: Iterable[int],
+        positions: Optional[Iterable[bytes]] = None,
+    ) -> None:
+        """
+        Agrega los postings parciales (term_id, doc_id, freq) de un documento y, si se pasan,
+        sus posiciones.
+        """
+        start = len(self.term_ids)
+        self.term_ids.extend(term_ids)
+        self.freqs.extend(freqs)
+        self.doc_ids.extend([doc_id] * (len(self.term_ids) - start))
+        if positions is not None:
+            if self.positions is None:
+                self.positions = []
+            self.positions.extend(positions)
+
+    def sort(self) -> None:
+        """
+        Ordena los postings por (term_id, doc_id) con np.lexsort sobre las columnas, sin copiar
+        los arrays a objetos Python.
+        """
+        term_ids = np.frombuffer(self.term_ids, dtype=np.uint32)
+        doc_ids = np.frombuffer(self.doc_ids, dtype=np.uint32)
+        freqs = np.frombuffer(self.freqs, dtype=np.uint32)
+        order = np.lexsort((doc_ids, term_ids))  # la última clave es la principal
+        self.term_ids = array("I", term_ids[order].tobytes())
+        self.doc_ids = array("I", doc_ids[order].tobytes())
+        self.freqs = array("I", freqs[order].tobytes())
+        if self.positions is not None:
+            self.positions = [self.positions[i] for i in order.tolist()]
+
+    def to_records(self) -> np.ndarray:
+        """
+        Devuelve los postings como array estructurado (term_id, doc_id, freq), en el orden actual.
+        """
+        records = np.empty(len(self), dtype=self.DTYPE)
+        records["term_id"] = np.frombuffer(self.term_ids, dtype=np.uint32)
+        records["doc_id"] = np.frombuffer(self.doc_ids, dtype=np.uint32)
+        records["freq"] = np.frombuffer(self.freqs, dtype=np.uint32)
+        return records
+
+    def write_to(self, file: BinaryIO) -> None:
+        """
+        Escribe todos los postings en el archivo con una única llamada, 12 bytes por posting.
+        """
+        file.write(self.to_records().tobytes())
@@ -13,6 +13,7 @@ class Posting:
         to_bytes() / from_bytes(): serialización/deserialización binaria
     """
 
+    __slots__ = ("doc_id", "freq")  # sin __dict__ por instancia
     STRUCT_FORMAT = "II"  # 2 unsigned ints
     SIZE = 8  # 2 * 4 bytes
     doc_id_map: Optional[Dict[int, str]] = (
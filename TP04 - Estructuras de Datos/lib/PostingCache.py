@@ -0,0 +1,85 @@
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class PostingCache:
+    """
+    Caché LRU de posting lists acotada por bytes (no por cantidad de entradas): una posting
+    list de un término frecuente puede ocupar lo mismo que miles de listas cortas.
+    Al agregar una entrada se desalojan las menos usadas recientemente hasta que entre; una
+    entrada más grande que max_bytes no se guarda. Se puede usar desde varios hilos (ver
+    QueryServer).
+    Atributos:
+        max_bytes: int - presupuesto de la caché
+        current_bytes: int - bytes de las entradas guardadas
+        hits / misses / evictions: int - aciertos, fallos y desalojos
+        bytes_served: int - bytes devueltos desde la caché (suma de los aciertos)
+    """
+
+    def __init__(self, max_bytes: int):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes debe ser positivo.")
+        self.max_bytes: int = max_bytes
+        self.current_bytes: int = 0
+        self._entries: OrderedDict[Hashable, tuple[object, int]] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.bytes_served: int = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[object]:
+        """
+        Devuelve el valor guardado (y lo marca como el más reciente) o None si no está.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.bytes_served += entry[1]
+            return entry[0]
+
+    def put(self, key: Hashable, value: object, n_bytes: int) -> None:
+        """
+        Guarda value (que ocupa n_bytes) desalojando las entradas menos recientes necesarias.
+        """
+        if n_bytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+            while self.current_bytes + n_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_bytes
+                self.evictions += 1
+            self._entries[key] = (value, n_bytes)
+            self.current_bytes += n_bytes
+
+    def clear(self) -> None:
+        """
+        Vacía la caché (las estadísticas se conservan).
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "bytes_served": self.bytes_served,
+            "entries": len(self._entries),
+            "current_bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+        }
@@ -1,6 +1,11 @@
-from typing import Optional
+from itertools import groupby
+from operator import itemgetter
+import os
+import struct
+from typing import Iterator, Optional, Union
 
 from .PartialPosting import PartialPosting
+from .PartialPostingBuffer import PartialPostingBuffer
 
 
 class PostingChunk:
@@ -12,19 +17,31 @@ class PostingChunk:
         file_path: str - ruta al archivo en disco
     Métodos:
         next(), reset(), merge_with(), read/write en binario
+    Si los postings traen posiciones (índice posicional), write_to_disk escribe además un
+    archivo .pos al lado del chunk (ver positions_path / iter_positions).
     """
 
+    # Entrada del .pos: (term_id, bytes de posiciones) + las posiciones de los postings del
+    # término en el orden del chunk (doc_id creciente)
+    POSITIONS_HEADER_FORMAT = "II"
+    POSITIONS_HEADER_SIZE = struct.calcsize(POSITIONS_HEADER_FORMAT)
+
     def __init__(
         self,
-        partial_postings: Optional[list[PartialPosting]] = None,
+        partial_postings: Optional[
+            Union[list[PartialPosting], PartialPostingBuffer]
+        ] = None,
         file_path: Optional[str] = None,
     ):
         """
         Si partial_postings es provisto, se usa para escritura (guardar el chunk en disco).
+        Puede ser una lista de PartialPosting o un PartialPostingBuffer.
         Si solo se provee file_path, se usa para lectura secuencial (merge multi-way).
         """
         self.file_path: Optional[str] = file_path
-        self.partial_postings: Optional[list[PartialPosting]] = partial_postings
+        self.partial_postings: Optional[
+            Union[list[PartialPosting], PartialPostingBuffer]
+        ] = partial_postings
         self.current: Optional[PartialPosting] = None
         self.eof: bool = False
         if partial_postings is None and file_path is not None:
@@ -81,5 +98,57 @@ class PostingChunk:
         if self.partial_postings is None:
             raise ValueError("No hay postings en memoria para escribir.")
         with open(self.file_path, "wb") as f:
-            for posting in self.partial_postings:
-                f.write(posting.to_bytes())
+            if isinstance(self.partial_postings, PartialPostingBuffer):
+                self.partial_postings.write_to(f)  # una sola escritura
+            else:
+                for posting in self.partial_postings:
+                    f.write(posting.to_bytes())
+        self._write_positions()
+
+    def _write_positions(self) -> None:
+        """
+        Escribe el .pos del chunk agrupando por término las posiciones de sus postings (ya
+        ordenados por term_id, doc_id). No hace nada si los postings no tienen posiciones.
+        """
+        if isinstance(self.partial_postings, PartialPostingBuffer):
+            if self.partial_postings.positions is None:
+                return
+            entries = zip(
+                self.partial_postings.term_ids, self.partial_postings.positions
+            )
+        else:
+            if not self.partial_postings or self.partial_postings[0].positions is None:
+                return
+            entries = (
+                (posting.term_id, posting.positions)
+                for posting in self.partial_postings
+            )
+        with open(self.positions_path(self.file_path), "wb") as f:
+            for term_id, group in groupby(entries, key=itemgetter(0)):
+                data = b"".join(positions for _, positions in group)
+                f.write(struct.pack(self.POSITIONS_HEADER_FORMAT, term_id, len(data)))
+                f.write(data)
+
+    @staticmethod
+    def positions_path(file_path: str) -> str:
+        """
+        Path del archivo de posiciones de un chunk (chunk_N.bin -> chunk_N.pos).
+        """
+        return os.path.splitext(file_path)[0] + ".pos"
+
+    @staticmethod
+    def iter_positions(positions_path: str) -> Iterator[tuple[int, bytes]]:
+        """
+        Recorre secuencialmente el .pos de un chunk devolviendo (term_id, posiciones del término
+        en el chunk), en orden de term_id.
+        """
+        header_size = PostingChunk.POSITIONS_HEADER_SIZE
+        with open(positions_path, "rb") as f:
+            while True:
+                header = f.read(header_size)
+                if len(header) < header_size:
+                    return
+                term_id, n_bytes = struct.unpack(
+                    PostingChunk.POSITIONS_HEADER_FORMAT, header
+                )
+                yield term_id, f.read(n_bytes)
@@ -0,0 +1,152 @@
+from typing import Iterator, Optional
+
+import numpy as np
+
+from .PartialPosting import PartialPosting
+from .PartialPostingBuffer import PartialPostingBuffer
+
+
+class PostingChunkReader:
+    """
+    Cursor de lectura secuencial sobre un chunk en disco que lee bloques grandes (por defecto 2 MB)
+    y los decodifica de una vez con np.frombuffer, en lugar de un file.read de 12 bytes y un
+    PartialPosting por posting como PostingChunk.
+    Atributos:
+        file_path: str - ruta al archivo del chunk
+        block_size: int - bytes por lectura (múltiplo de PartialPosting.SIZE)
+        start / end: int - rango de postings [start, end) a recorrer (por defecto todo el chunk)
+    Métodos:
+        read_block(): siguiente bloque como array estructurado (term_id, doc_id, freq)
+        __iter__(): postings como tuplas (term_id, doc_id, freq)
+        current_term() / read_run() / read_run_records(): cursor por término (corrida contigua
+        de un term_id)
+    Iterar y usar el cursor por término son formas alternativas de recorrer el chunk; no mezclar.
+    """
+
+    DEFAULT_BLOCK_SIZE = 2 * 1024 * 1024  # bytes
+    # Par (doc_id, freq) con el layout de Posting / final_index.bin
+    PAIR_DTYPE = np.dtype([("doc_id", "=u4"), ("freq", "=u4")])
+
+    def __init__(
+        self,
+        file_path: str,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        start: int = 0,
+        end: Optional[int] = None,
+    ):
+        self.file_path: str = file_path
+        # Redondear a un múltiplo del tamaño del posting para no cortar registros entre bloques
+        self.block_size: int = max(
+            PartialPosting.SIZE, block_size - block_size % PartialPosting.SIZE
+        )
+        self.file = open(file_path, "rb")
+        self.file.seek(start * PartialPosting.SIZE)
+        # Bytes que quedan por leer del rango (None = hasta el final del archivo)
+        self.remaining: Optional[int] = (
+            None if end is None else (end - start) * PartialPosting.SIZE
+        )
+        # Estado del cursor por término (ver _load_runs)
+        self.run_terms: list[int] = []  # term_id de cada corrida del bloque actual
+        self.run_bounds: list[int] = []  # inicio de cada corrida (+ fin del bloque)
+        self.run_idx: int = 0  # corrida actual
+        self.record_bytes: bytes = b""  # registros (term_id, doc_id, freq) del bloque, 12 bytes c/u
+        self.pair_bytes: bytes = b""  # pares (doc_id, freq) del bloque, 8 bytes c/u
+        self.doc_ids: list[int] = []  # doc_ids del bloque
+
+    def read_block(self) -> Optional[np.ndarray]:
+        """
+        Lee el siguiente bloque del chunk. Devuelve None al llegar al final del archivo.
+        """
+        data = self._read()
+        if not data:
+            return None
+        return np.frombuffer(data, dtype=PartialPostingBuffer.DTYPE)
+
+    def _read(self) -> bytes:
+        """
+        Lee hasta block_size bytes sin pasarse del final del rango.
+        """
+        if self.remaining is None:
+            return self.file.read(self.block_size)
+        data = self.file.read(min(self.block_size, self.remaining))
+        self.remaining -= len(data)
+        return data
+
+    def __iter__(self) -> Iterator[tuple[int, int, int]]:
+        """
+        Recorre el chunk devolviendo tuplas (term_id, doc_id, freq) de ints de Python.
+        """
+        while True:
+            block = self.read_block()
+            if block is None:
+                return
+            yield from block.tolist()
+
+    def _load_runs(self) -> bool:
+        """
+        Carga el siguiente bloque para el cursor por término y precalcula, vectorizado, los límites
+        de cada corrida (postings consecutivos con el mismo term_id), los pares (doc_id, freq) ya
+        empaquetados en el formato del índice final (8 bytes) y los doc_ids como lista.
+        Devuelve False al llegar al final del chunk.
+        """
+        data = self._read()
+        if not data:
+            self.run_terms = []
+            self.run_idx = 0
+            return False
+        block = np.frombuffer(data, dtype=PartialPostingBuffer.DTYPE)
+        self.record_bytes = data
+        term_col = block["term_id"]
+        starts = np.flatnonzero(term_col[1:] != term_col[:-1]) + 1
+        self.run_terms = term_col[np.concatenate(([0], starts))].tolist()
+        self.run_bounds = [0] + starts.tolist() + [len(block)]
+        pairs = np.empty(len(block), dtype=self.PAIR_DTYPE)
+        pairs["doc_id"] = block["doc_id"]
+        pairs["freq"] = block["freq"]
+        self.pair_bytes = pairs.tobytes()
+        self.doc_ids = block["doc_id"].tolist()
+        self.run_idx = 0
+        return True
+
+    def current_term(self) -> Optional[int]:
+        """
+        Devuelve el term_id de la corrida actual del cursor (o None si terminó el chunk).
+        """
+        if self.run_idx >= len(self.run_terms) and not self._load_runs():
+            return None
+        return self.run_terms[self.run_idx]
+
+    def read_run(self) -> tuple[bytes, list[int]]:
+        """
+        Devuelve la corrida contigua del término actual como (bytes de los pares doc_id/freq,
+        lista de doc_ids) y avanza el cursor al término siguiente. Si la corrida continúa en el
+        bloque siguiente, se concatena.
+        """
+        term_id = self.current_term()
+        data_parts: list[bytes] = []
+        doc_ids: list[int] = []
+        while self.current_term() == term_id:
+            start = self.run_bounds[self.run_idx]
+            end = self.run_bounds[self.run_idx + 1]
+            data_parts.append(self.pair_bytes[start * 8 : end * 8])
+            doc_ids.extend(self.doc_ids[start:end])
+            self.run_idx += 1
+        return b"".join(data_parts), doc_ids
+
+    def read_run_records(self) -> bytes:
+        """
+        Como read_run, pero devuelve la corrida en el formato del chunk (registros de 12 bytes),
+        para escribir chunks intermedios en el merge jerárquico.
+        """
+        term_id = self.current_term()
+        data_parts: list[bytes] = []
+        while self.current_term() == term_id:
+            start = self.run_bounds[self.run_idx] * PartialPosting.SIZE
+            end = self.run_bounds[self.run_idx + 1] * PartialPosting.SIZE
+            data_parts.append(self.record_bytes[start:end])
+            self.run_idx += 1
+        return b"".join(data_parts)
+
+    def close(self) -> None:
+        if self.file:
+            self.file.close()
@@ -0,0 +1,65 @@
+from typing import Iterator, Optional, Union
+
+import numpy as np
+
+from lib.Posting import Posting
+
+
+class PostingList:
+    """
+    Posting list de un término con sus columnas en arrays contiguos, en vez de una lista de
+    objetos Posting.
+    Atributos:
+        doc_ids: np.ndarray - IDs de documento (uint32, crecientes)
+        freqs: np.ndarray - frecuencia del término en cada documento (uint32)
+        doc_id_map: dict[int, str] | None - doc_id -> nombre, para resolver nombres en lote
+    Métodos:
+        len, slicing (devuelve otra PostingList sobre vistas de los arrays), iteración
+        (Posting), advance_to(), doc_names(), to_postings()
+    """
+
+    __slots__ = ("doc_ids", "freqs", "doc_id_map")
+
+    def __init__(
+        self,
+        doc_ids: np.ndarray,
+        freqs: np.ndarray,
+        doc_id_map: Optional[dict[int, str]] = None,
+    ):
+        self.doc_ids: np.ndarray = doc_ids
+        self.freqs: np.ndarray = freqs
+        self.doc_id_map: Optional[dict[int, str]] = doc_id_map
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Posting, "PostingList"]:
+        if isinstance(index, slice):
+            return PostingList(
+                self.doc_ids[index], self.freqs[index], self.doc_id_map
+            )
+        return Posting(int(self.doc_ids[index]), int(self.freqs[index]))
+
+    def __iter__(self) -> Iterator[Posting]:
+        for doc_id, freq in zip(self.doc_ids.tolist(), self.freqs.tolist()):
+            yield Posting(doc_id, freq)
+
+    def advance_to(self, doc_id: int, start: int = 0) -> int:
+        """
+        Devuelve el índice del primer posting desde start con doc_id >= doc_id (len(self) si no
+        hay). Es una búsqueda binaria sobre la columna de doc_ids, así que no necesita skips.
+        """
+        return start + int(np.searchsorted(self.doc_ids[start:], doc_id, side="left"))
+
+    def doc_names(self) -> list[str]:
+        """
+        Nombres de los documentos de la lista, en orden, resueltos en una sola pasada.
+        """
+        doc_id_map = self.doc_id_map or {}
+        return [doc_id_map.get(doc_id, str(doc_id)) for doc_id in self.doc_ids.tolist()]
+
+    def to_postings(self) -> list[Posting]:
+        """
+        Convierte la lista a list[Posting] (API anterior).
+        """
+        return list(self)
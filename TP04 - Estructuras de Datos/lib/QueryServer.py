@@ -0,0 +1,144 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, TextIO
+
+import numpy as np
+
+from lib.IRSystemBSBI import IRSystemBSBI
+
+
+class QueryServer:
+    """
+    Servicio de consultas de larga vida sobre un IRSystemBSBI: el índice se abre y se carga una
+    sola vez y las consultas se atienden en paralelo con un pool de hilos (las posting lists
+    son vistas sobre los mmap del índice, compartidas por todos los hilos).
+    Protocolo JSON lines (ver serve): cada línea de entrada es un pedido y cada línea de
+    salida su respuesta, en orden de terminación; el id del pedido las relaciona.
+        pedido: {"id": ..., "mode": "taat" | "skips" | "daat" | "stats", "query": "...",
+        "top_k": 10}
+        respuesta: {"id": ..., "results": [...], "latency_ms": ...} o {"id": ..., "error": ...}
+    La latencia de cada pedido va desde que se lee hasta que termina (incluye la espera en el
+    pool); stats() resume latencias y consultas por segundo de todos los atendidos.
+    """
+
+    # Modo del pedido -> método de IRSystemBSBI que lo resuelve
+    MODES = {
+        "taat": "taat_query",
+        "skips": "taat_query_with_skips",
+        "daat": "daat_query",
+    }
+    DEFAULT_TOP_K = 10
+
+    def __init__(self, irsys: IRSystemBSBI, max_workers: int = 4):
+        if max_workers < 1:
+            raise ValueError("max_workers debe ser al menos 1.")
+        self.irsys: IRSystemBSBI = irsys
+        self.max_workers: int = max_workers
+        self.latencies: list[float] = []  # segundos de cada pedido atendido
+        self.errors: int = 0
+        self._first_received: Optional[float] = None
+        self._last_finished: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def execute(self, request: dict, received: Optional[float] = None) -> dict:
+        """
+        Resuelve un pedido y arma su respuesta. received es el instante (perf_counter) en que
+        se leyó el pedido; por defecto, ahora.
+        """
+        if received is None:
+            received = time.perf_counter()
+        response: dict = {"id": request.get("id")}
+        mode = request.get("mode", "taat")
+        if mode == "stats":
+            response["stats"] = self.stats()
+            return response
+        try:
+            if mode not in self.MODES:
+                raise ValueError(f"Modo no soportado: {mode}")
+            method = getattr(self.irsys, self.MODES[mode])
+            if mode == "daat":
+                top_k = int(request.get("top_k", self.DEFAULT_TOP_K))
+                response["results"] = method(request["query"], top_k=top_k)
+            else:
+                response["results"] = method(request["query"])
+        except Exception as e:
+            response["error"] = f"{type(e).__name__}: {e}"
+        finished = time.perf_counter()
+        response["latency_ms"] = (finished - received) * 1000
+        self._record(received, finished, "error" in response)
+        return response
+
+    def _record(self, received: float, finished: float, error: bool) -> None:
+        with self._lock:
+            self.latencies.append(finished - received)
+            self.errors += error
+            if self._first_received is None or received < self._first_received:
+                self._first_received = received
+            if self._last_finished is None or finished > self._last_finished:
+                self._last_finished = finished
+
+    def serve(self, input_stream: TextIO, output_stream: TextIO) -> None:
+        """
+        Atiende los pedidos de input_stream (uno JSON por línea) hasta que se termina, con
+        max_workers hilos, y escribe cada respuesta en output_stream apenas está lista. Como
+        mucho hay 2 * max_workers pedidos leídos y sin responder, para no leer toda la entrada
+        si llega más rápido de lo que se atiende.
+        """
+        write_lock = threading.Lock()
+        pending = threading.BoundedSemaphore(2 * self.max_workers)
+
+        def respond(response: dict) -> None:
+            line = json.dumps(response, ensure_ascii=False)
+            with write_lock:
+                output_stream.write(line + "\n")
+                output_stream.flush()
+
+        def run(request: dict, received: float) -> None:
+            try:
+                respond(self.execute(request, received))
+            finally:
+                pending.release()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for line in input_stream:
+                if not line.strip():
+                    continue
+                received = time.perf_counter()
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("el pedido debe ser un objeto JSON")
+                except ValueError as e:
+                    respond({"id": None, "error": f"Pedido inválido: {e}"})
+                    continue
+                pending.acquire()
+                pool.submit(run, request, received)
+
+    def stats(self) -> dict:
+        """
+        Pedidos atendidos, errores, consultas por segundo (desde que se leyó el primero hasta
+        que terminó el último) y latencias en ms (media, percentiles 50/95/99 y máxima).
+        """
+        with self._lock:
+            latencies = np.array(self.latencies) * 1000
+            errors = self.errors
+            first, last = self._first_received, self._last_finished
+        seconds = last - first if latencies.size else 0.0
+        stats = {
+            "requests": int(latencies.size),
+            "errors": errors,
+            "seconds": seconds,
+            "qps": latencies.size / seconds if seconds > 0 else 0.0,
+        }
+        if latencies.size:
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99]).tolist()
+            stats["latency_ms"] = {
+                "mean": float(latencies.mean()),
+                "p50": p50,
+                "p95": p95,
+                "p99": p99,
+                "max": float(latencies.max()),
+            }
+        return stats
@@ -0,0 +1,129 @@
+from abc import ABC, abstractmethod
+from html.parser import HTMLParser
+from typing import Optional
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # lxml es opcional: sin él queda el extractor de html.parser
+    lxml = None
+
+
+class TextExtractor(ABC):
+    """
+    Extrae el texto visible de un documento HTML para tokenizarlo.
+    Todas las implementaciones descartan el contenido de <script> y <style> y separan con
+    un espacio el texto de nodos distintos (como get_text(separator=" ") de BeautifulSoup).
+    Difieren en casos borde: bs4 conserva el texto de las secciones CDATA y los extractores
+    de html.parser y lxml lo descartan. Un documento sin texto (vacío, solo un comentario o
+    solo el doctype) da "" en todos.
+    """
+
+    name: str
+
+    @abstractmethod
+    def extract(self, html: str) -> str:
+        pass
+
+
+class BeautifulSoupExtractor(TextExtractor):
+    """
+    Extractor original: arma el árbol completo con BeautifulSoup y html.parser.
+    """
+
+    name = "bs4"
+
+    def extract(self, html: str) -> str:
+        return BeautifulSoup(html, "html.parser").get_text(separator=" ")
+
+
+class _TextCollector(HTMLParser):
+    """
+    HTMLParser que acumula los fragmentos de texto fuera de <script>/<style>, sin armar árbol.
+    """
+
+    SKIP_TAGS = ("script", "style")
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip_depth: int = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skip_depth > 0:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+class HTMLParserExtractor(TextExtractor):
+    """
+    Extractor en streaming sobre html.parser de la biblioteca estándar: no construye el árbol
+    del documento, solo junta el texto a medida que lo parsea.
+    """
+
+    name = "htmlparser"
+
+    def extract(self, html: str) -> str:
+        collector = _TextCollector()
+        collector.feed(html)
+        collector.close()
+        return " ".join(collector.parts)
+
+
+class LxmlExtractor(TextExtractor):
+    """
+    Extractor sobre el parser HTML de lxml (libxml2, en C). Requiere lxml instalado.
+    """
+
+    name = "lxml"
+
+    def __init__(self):
+        if lxml is None:
+            raise ImportError("LxmlExtractor requiere el paquete lxml.")
+
+    def extract(self, html: str) -> str:
+        if not html.strip():
+            return ""
+        try:
+            tree = lxml.html.fromstring(html)
+        except (etree.ParserError, ValueError):
+            # Documentos con declaración de encoding en un str, o sin ningún elemento
+            try:
+                tree = lxml.html.fromstring(html.encode("utf8"))
+            except (etree.ParserError, ValueError):
+                # Solo un comentario, el doctype o <?xml ...?>: no hay texto
+                return ""
+        for element in tree.iter("script", "style", etree.Comment):
+            # Al quitar el elemento su tail se une al texto previo: separarlo con un espacio
+            if element.tail:
+                element.tail = " " + element.tail
+        etree.strip_elements(tree, "script", "style", etree.Comment, with_tail=False)
+        return " ".join(tree.itertext())
+
+
+EXTRACTORS: dict[str, type[TextExtractor]] = {
+    BeautifulSoupExtractor.name: BeautifulSoupExtractor,
+    HTMLParserExtractor.name: HTMLParserExtractor,
+    LxmlExtractor.name: LxmlExtractor,
+}
+
+
+def get_text_extractor(name: Optional[str] = None) -> TextExtractor:
+    """
+    Devuelve el extractor de nombre name ("bs4", "htmlparser" o "lxml"). Por defecto usa lxml
+    si está instalado y si no el de html.parser.
+    """
+    if name is None:
+        name = LxmlExtractor.name if lxml is not None else HTMLParserExtractor.name
+    if name not in EXTRACTORS:
+        raise ValueError(f"Extractor de texto no soportado: {name}")
+    return EXTRACTORS[name]()
@@ -0,0 +1,78 @@
+import argparse
+import sys
+import time
+from lib.Tokenizador import Tokenizador
+from lib.IRSystemBSBI import open_index
+from lib.QueryServer import QueryServer
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Servidor de consultas: abre el índice una vez y atiende pedidos JSON lines por stdin/stdout con un pool de hilos."
+    )
+    parser.add_argument(
+        "--index-dir", default="index", help="Directorio del índice ya construido."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Hilos que atienden consultas en paralelo.",
+    )
+    parser.add_argument(
+        "--stopwords",
+        default=None,
+        help="Archivo de stopwords (el mismo que se usó al indexar, si se usó alguno).",
+    )
+    parser.add_argument(
+        "--cache-mb",
+        type=float,
+        default=None,
+        help="Tamaño en MB de la caché LRU de posting lists (por defecto sin caché).",
+    )
+    args = parser.parse_args()
+
+    # stdout es el canal de respuestas: los mensajes van a stderr
+    t_start = time.perf_counter()
+    cache_bytes = int(args.cache_mb * 2**20) if args.cache_mb else None
+    irsys = open_index(
+        args.index_dir,
+        Tokenizador(stopwords_path=args.stopwords),
+        cache_bytes=cache_bytes,
+    )
+    irsys.preload()
+    print(
+        f"Índice {args.index_dir} cargado en {(time.perf_counter() - t_start) * 1000:.1f} ms; "
+        f"atendiendo consultas con {args.workers} hilos (un pedido JSON por línea)",
+        file=sys.stderr,
+    )
+    server = QueryServer(irsys, max_workers=args.workers)
+    try:
+        server.serve(sys.stdin, sys.stdout)
+    except KeyboardInterrupt:
+        pass
+
+    stats = server.stats()
+    print(
+        f"\n{stats['requests']} consultas ({stats['errors']} con error) en "
+        f"{stats['seconds']:.2f} s: {stats['qps']:.1f} consultas/s",
+        file=sys.stderr,
+    )
+    if "latency_ms" in stats:
+        latency = stats["latency_ms"]
+        print(
+            f"Latencia (ms): media {latency['mean']:.2f}, p50 {latency['p50']:.2f}, "
+            f"p95 {latency['p95']:.2f}, p99 {latency['p99']:.2f}, máx {latency['max']:.2f}",
+            file=sys.stderr,
+        )
+    if irsys.posting_cache is not None:
+        cache = irsys.cache_stats()
+        print(
+            f"Caché de postings: {cache['hits']} aciertos, {cache['misses']} fallos "
+            f"({cache['hit_rate']:.1%})",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()